@@ -2,6 +2,21 @@
 import subprocess
 import os
 import shutil
+import tempfile
+
+
+def _needs_copy(src, dst):
+    """True unless dst has src's size and is not older (copyfile sets a fresh mtime)."""
+    src_stat = os.stat(src)
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        return True
+    return (
+        src_stat.st_size != dst_stat.st_size
+        or int(dst_stat.st_mtime) < int(src_stat.st_mtime)
+    )
+
 
 BASE_DIR = r"C:\Users\ghilp\OneDrive\바탕 화면\배성무일반\0_디플런트 D!FFERENT\Decisionwise\decisionwise_api_platform"
 os.chdir(BASE_DIR)
@@ -14,9 +29,14 @@ docs_files = ["quickstart.md", "auth.md"]
 for doc in docs_files:
     src = os.path.join(BASE_DIR, "dpp", "docs", doc)
     dst = os.path.join(BASE_DIR, "dpp", "public", "docs", doc)
-    if os.path.exists(src):
-        shutil.copy2(src, dst)
+    if not os.path.exists(src):
+        continue
+    if _needs_copy(src, dst):
+        # copyfile: data only (sendfile/CopyFileEx), no extra metadata syscalls
+        shutil.copyfile(src, dst)
         print(f"   [OK] Copied {doc}")
+    else:
+        print(f"   [SKIP] {doc} unchanged")
 
 # 2. Git status
 print("\n2. Checking git status...")
@@ -28,7 +48,7 @@ print("\n3. Staging all changes...")
 subprocess.run(["git", "add", "-A"], check=True)
 print("   [OK] All changes staged")
 
-# 4. Commit
+# 4. Commit (message via a temp file and -F, passed as a plain argv path)
 print("\n4. Committing changes...")
 commit_message = """fix: P0 Hotfix Sprint - Auth, Error Format, Metering Safety
 
@@ -88,11 +108,17 @@ None - All changes are backward compatible or fix bugs.
 Co-Authored-By: Claude Sonnet 4.5 <noreply@anthropic.com>
 """
 
-result = subprocess.run(
-    ["git", "commit", "-m", commit_message],
-    capture_output=True,
-    text=True
-)
+with tempfile.NamedTemporaryFile(
+    "w", suffix=".txt", delete=False, encoding="utf-8"
+) as msg_file:
+    msg_file.write(commit_message)
+
+try:
+    result = subprocess.run(
+        ["git", "commit", "-F", msg_file.name], capture_output=True, text=True
+    )
+finally:
+    os.unlink(msg_file.name)
 
 if result.returncode == 0:
     print("   [OK] Committed successfully")
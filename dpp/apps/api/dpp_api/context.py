@@ -3,21 +3,72 @@
 P1-9: Context variables for request tracking across async boundaries.
 MS-6: Add run_id and tenant_id for complete observability.
 RC-6: Add plan_key and budget_decision for observability.
+
+All fields live in one frozen RequestCtx held by a single ContextVar, so
+setting several fields at once (set_ctx) is one context write and one Token.
+The per-field *_var objects keep the ContextVar-style get()/set() API.
 """
 
-from contextvars import ContextVar
+import dataclasses
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True, frozen=True)
+class RequestCtx:
+    """Per-request observability fields."""
+
+    # Request ID - unique per HTTP request
+    request_id: str = ""
+    # MS-6: Run ID - current run being processed
+    run_id: str = ""
+    # MS-6: Tenant ID - current tenant context
+    tenant_id: str = ""
+    # RC-6: Plan key - format: "{plan_id}:{profile_version}"
+    plan_key: str = ""
+    # RC-6: Budget decision - "reserve.ok" or "reserve.deny"
+    budget_decision: str = ""
+
+
+_EMPTY_CTX = RequestCtx()
+
+_ctx: ContextVar[RequestCtx] = ContextVar("dpp_ctx", default=_EMPTY_CTX)
+
+
+def get_ctx() -> RequestCtx:
+    """Get the current request context (all fields in one lookup)."""
+    return _ctx.get()
+
+
+def set_ctx(**fields: str) -> Token[RequestCtx]:
+    """Update one or more context fields with a single ContextVar write."""
+    return _ctx.set(dataclasses.replace(_ctx.get(), **fields))
+
+
+def reset_ctx(token: Token[RequestCtx]) -> None:
+    """Restore the context captured by set_ctx()."""
+    _ctx.reset(token)
+
+
+class _CtxField:
+    """ContextVar-compatible view of a single RequestCtx field."""
+
+    __slots__ = ("name",)
 
-# Request ID - unique per HTTP request
-request_id_var: ContextVar[str] = ContextVar("request_id", default="")
+    def __init__(self, name: str):
+        self.name = name
 
-# MS-6: Run ID - current run being processed
-run_id_var: ContextVar[str] = ContextVar("run_id", default="")
+    def get(self, default: Optional[str] = "") -> Optional[str]:
+        """Field value; an empty field counts as unset and yields default."""
+        return getattr(_ctx.get(), self.name) or default
 
-# MS-6: Tenant ID - current tenant context
-tenant_id_var: ContextVar[str] = ContextVar("tenant_id", default="")
+    def set(self, value: str) -> Token[RequestCtx]:
+        return set_ctx(**{self.name: value})
 
-# RC-6: Plan key - format: "{plan_id}:{profile_version}"
-plan_key_var: ContextVar[str] = ContextVar("plan_key", default="")
 
-# RC-6: Budget decision - "reserve.ok" or "reserve.deny"
-budget_decision_var: ContextVar[str] = ContextVar("budget_decision", default="")
+request_id_var = _CtxField("request_id")
+run_id_var = _CtxField("run_id")
+tenant_id_var = _CtxField("tenant_id")
+plan_key_var = _CtxField("plan_key")
+budget_decision_var = _CtxField("budget_decision")
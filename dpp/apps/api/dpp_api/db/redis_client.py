@@ -1,10 +1,40 @@
 """Redis client configuration for DPP."""
 
+import asyncio
+import logging
 import os
 import redis
+import redis.asyncio
+from redis.utils import HIREDIS_AVAILABLE
 from typing import Optional
 from urllib.parse import urlparse
 
+logger = logging.getLogger(__name__)
+
+
+def _connection_kwargs() -> tuple[str, dict]:
+    """REDIS_URL and the connection options shared by the sync and async clients."""
+    redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    redis_password = os.getenv("REDIS_PASSWORD")
+
+    # Parse URL to check if password is already present
+    parsed = urlparse(redis_url)
+
+    # Build connection kwargs
+    kwargs = {
+        "decode_responses": True,
+        "socket_connect_timeout": 5,
+        "socket_timeout": 5,
+        "health_check_interval": 30,  # P0-1: Stability option
+        "socket_keepalive": True,
+    }
+
+    # If password not in URL and REDIS_PASSWORD is set, add it
+    if not parsed.password and redis_password:
+        kwargs["password"] = redis_password
+
+    return redis_url, kwargs
+
 
 class RedisClient:
     """Singleton Redis client."""
@@ -20,31 +50,31 @@ class RedisClient:
         - Priority: REDIS_URL env var (e.g., redis://host:6379/0 or rediss://...)
         - Fallback: redis://localhost:6379/0 for local development
         - REDIS_PASSWORD: Applied only if URL has no password
+        - REDIS_MAX_CONNECTIONS: BlockingConnectionPool size (default: 50).
+          Size to worker concurrency; callers wait for a free connection
+          instead of opening unbounded new ones.
+
+        The hiredis C parser is used automatically when installed.
 
         Returns:
             redis.Redis: Redis client
         """
         if cls._instance is None:
-            redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-            redis_password = os.getenv("REDIS_PASSWORD")
-
-            # Parse URL to check if password is already present
-            parsed = urlparse(redis_url)
-
-            # Build connection kwargs
-            kwargs = {
-                "decode_responses": True,
-                "socket_connect_timeout": 5,
-                "socket_timeout": 5,
-                "health_check_interval": 30,  # P0-1: Stability option
-            }
-
-            # If password not in URL and REDIS_PASSWORD is set, add it
-            if not parsed.password and redis_password:
-                kwargs["password"] = redis_password
-
-            # Create client from URL
-            cls._instance = redis.from_url(redis_url, **kwargs)
+            redis_url, kwargs = _connection_kwargs()
+
+            if not HIREDIS_AVAILABLE:
+                logger.warning(
+                    "hiredis is not installed; Redis replies use the pure-Python parser"
+                )
+
+            # Create client from URL over a bounded, blocking pool
+            pool = redis.BlockingConnectionPool.from_url(
+                redis_url,
+                max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+                timeout=5,
+                **kwargs,
+            )
+            cls._instance = redis.Redis(connection_pool=pool)
 
         return cls._instance
 
@@ -53,9 +83,60 @@ class RedisClient:
         """Reset Redis client (for testing)."""
         if cls._instance is not None:
             cls._instance.close()
+            # Pool was passed explicitly, so close() does not release it
+            cls._instance.connection_pool.disconnect()
             cls._instance = None
 
 
+class AsyncRedisClient:
+    """Per-event-loop redis.asyncio client for async request paths.
+
+    Same URL, password and pool settings as RedisClient; connections are
+    opened lazily on first await. redis.asyncio connections are bound to the
+    loop that opened them, so each running loop gets its own client, and
+    clients of loops that have closed are dropped.
+    """
+
+    _instances: dict[asyncio.AbstractEventLoop, redis.asyncio.Redis] = {}
+
+    @classmethod
+    def get_client(cls) -> redis.asyncio.Redis:
+        """
+        Get the async Redis client for the running event loop.
+
+        Returns:
+            redis.asyncio.Redis: Async Redis client
+
+        Raises:
+            RuntimeError: If called outside a running event loop
+        """
+        loop = asyncio.get_running_loop()
+        client = cls._instances.get(loop)
+        if client is None:
+            for stale in [other for other in cls._instances if other.is_closed()]:
+                del cls._instances[stale]
+
+            redis_url, kwargs = _connection_kwargs()
+            pool = redis.asyncio.BlockingConnectionPool.from_url(
+                redis_url,
+                max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+                timeout=5,
+                **kwargs,
+            )
+            client = cls._instances[loop] = redis.asyncio.Redis(connection_pool=pool)
+
+        return client
+
+    @classmethod
+    async def reset(cls) -> None:
+        """Reset the running loop's async Redis client (for testing)."""
+        client = cls._instances.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+            # Pool was passed explicitly, so aclose() does not release it
+            await client.connection_pool.disconnect()
+
+
 def get_redis() -> redis.Redis:
     """
     Get Redis client for dependency injection.
@@ -64,3 +145,15 @@ def get_redis() -> redis.Redis:
         redis.Redis: Redis client
     """
     return RedisClient.get_client()
+
+
+def get_async_redis() -> redis.asyncio.Redis:
+    """
+    Get async Redis client for dependency injection.
+
+    Must be called from the event loop that will use the client.
+
+    Returns:
+        redis.asyncio.Redis: Async Redis client
+    """
+    return AsyncRedisClient.get_client()
@@ -10,14 +10,14 @@ from pathlib import Path
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from dpp_api.audit.sinks import AuditSinkConfigError, validate_audit_required_config
 from dpp_api.audit.kill_switch_audit import validate_kill_switch_audit_fingerprint_config
 from dpp_api.billing.active_preflight import run_billing_secrets_active_preflight
-from dpp_api.context import budget_decision_var, plan_key_var, request_id_var, run_id_var
+from dpp_api.context import request_id_var, set_ctx
 from dpp_api.enforce import PlanViolationError
 from dpp_api.utils.sanitize import sanitize_str
 from dpp_api.rate_limiter import NoOpRateLimiter, RateLimiter
@@ -260,9 +260,7 @@ async def http_completion_logging_middleware(request: Request, call_next):
     """
     # RC-6 Hardening: Clear per-request contextvars at start
     # This prevents context leakage if async tasks are reused across requests
-    run_id_var.set("")
-    plan_key_var.set("")
-    budget_decision_var.set("")
+    set_ctx(run_id="", plan_key="", budget_decision="")
 
     start_time = time.perf_counter()
     status_code = 500  # Default to 500 in case of unhandled exception
@@ -295,9 +293,7 @@ async def http_completion_logging_middleware(request: Request, call_next):
 
         # RC-6 Hardening: Clear per-request contextvars after logging
         # Ensures clean state for next request (defense in depth)
-        run_id_var.set("")
-        plan_key_var.set("")
-        budget_decision_var.set("")
+        set_ctx(run_id="", plan_key="", budget_decision="")
 
 
 # ============================================================================
@@ -334,6 +330,15 @@ async def request_id_middleware(request: Request, call_next):
     return response
 
 
+# ============================================================================
+# Health Check Interceptor (pure ASGI, registered after request_id → outermost)
+# ============================================================================
+
+from dpp_api.middleware.health_interceptor import HealthCheckInterceptor
+
+app.add_middleware(HealthCheckInterceptor)
+
+
 # ============================================================================
 # RFC 9457 Global Exception Handlers
 # ============================================================================
@@ -791,6 +796,10 @@ _OPENAPI_DEMO_SPEC: dict = {
 }
 
 
+# The spec is static: render it once (same bytes JSONResponse would produce).
+_OPENAPI_DEMO_BODY: bytes = JSONResponse(content=_OPENAPI_DEMO_SPEC).body
+
+
 @app.get("/.well-known/openapi-demo.json", include_in_schema=False)
 async def well_known_openapi_demo():
     """RC-14: Locked OpenAPI spec for demo marketplace listing.
@@ -798,7 +807,7 @@ async def well_known_openapi_demo():
     Returns a minimal spec with exactly 2 paths and 1 server.
     No auth required. Used by marketplace integrations (e.g. RapidAPI).
     """
-    return JSONResponse(content=_OPENAPI_DEMO_SPEC)
+    return Response(content=_OPENAPI_DEMO_BODY, media_type="application/json")
 
 
 @app.get("/pricing/ssot.json")
@@ -1281,9 +1290,7 @@ def create_app(
     @new_app.middleware("http")
     async def completion_logging_mw(request: Request, call_next):
         """Log HTTP request completion with trace context."""
-        run_id_var.set("")
-        plan_key_var.set("")
-        budget_decision_var.set("")
+        set_ctx(run_id="", plan_key="", budget_decision="")
 
         start_time = time.perf_counter()
         status_code = 500
@@ -1330,9 +1337,7 @@ def create_app(
                     },
                 )
 
-            run_id_var.set("")
-            plan_key_var.set("")
-            budget_decision_var.set("")
+            set_ctx(run_id="", plan_key="", budget_decision="")
 
     # Request ID middleware
     @new_app.middleware("http")
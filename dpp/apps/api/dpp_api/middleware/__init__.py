@@ -1,10 +1,12 @@
 """Middleware modules."""
 
+from .health_interceptor import HealthCheckInterceptor
 from .kill_switch import KillSwitchMiddleware
 from .logging_redaction import LoggingRedactionMiddleware
 from .maintenance import MaintenanceMiddleware
 
 __all__ = [
+    "HealthCheckInterceptor",
     "KillSwitchMiddleware",
     "LoggingRedactionMiddleware",
     "MaintenanceMiddleware",
@@ -0,0 +1,52 @@
+"""Health Check Interceptor (pure ASGI).
+
+Purpose:
+- Answer GET /health (liveness/startup probe) before the middleware stack
+- /health is constant and carries no sensitive data, so request-id, logging,
+  kill-switch and maintenance handling add per-probe cost for nothing
+
+Behavior:
+- GET /health → 200 with a pre-serialized body identical to the /health route
+- Everything else (including other methods on /health) is forwarded untouched,
+  so 405 handling and /readyz stay on the normal FastAPI path
+- Intercepted probes emit no http.request.completed log and no X-Request-ID
+
+Usage:
+    app.add_middleware(HealthCheckInterceptor)  # Register LAST (outermost)
+"""
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from dpp_api.routers.health import HEALTHY_BODY
+
+
+class HealthCheckInterceptor:
+    """Pure ASGI middleware that short-circuits GET /health."""
+
+    def __init__(self, app: ASGIApp):
+        """Initialize interceptor.
+
+        Args:
+            app: Downstream ASGI application
+        """
+        self.app = app
+        self.body = HEALTHY_BODY
+        self.start = {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(self.body)).encode()),
+            ],
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] == "http"
+            and scope["path"] == "/health"
+            and scope["method"] == "GET"
+        ):
+            await send(self.start)
+            await send({"type": "http.response.body", "body": self.body})
+            return
+        await self.app(scope, receive, send)
@@ -16,13 +16,65 @@ from opentelemetry.sdk.metrics import MeterProvider
 from opentelemetry.sdk.metrics.export import MetricReader
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import SpanExporter
-from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
 
 
 logger = logging.getLogger(__name__)
 
 
+class _NoopSpanExporter(SpanExporter):
+    """Span exporter that drops spans without buffering them.
+
+    Used when no OTLP endpoint is configured so spans are still created for
+    log correlation but never accumulate in memory.
+    """
+
+    def export(self, spans: Any) -> SpanExportResult:
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def _build_span_exporter() -> SpanExporter:
+    """OTLP exporter if OTEL_EXPORTER_OTLP_ENDPOINT is set and the exporter is installed."""
+    if os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning(
+                "OTEL_EXPORTER_OTLP_ENDPOINT is set but opentelemetry-exporter-otlp "
+                "is not installed. Spans will be dropped."
+            )
+        else:
+            return OTLPSpanExporter()
+    else:
+        logger.warning(
+            "No OTEL_EXPORTER_OTLP_ENDPOINT configured. Spans will be dropped."
+        )
+    return _NoopSpanExporter()
+
+
+def _build_metric_reader() -> MetricReader:
+    """Periodic OTLP metric reader if configured, otherwise a pull-only in-memory reader."""
+    if os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        try:
+            from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+        except ImportError:
+            pass
+        else:
+            from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+
+            return PeriodicExportingMetricReader(OTLPMetricExporter())
+
+    from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+    logger.warning(
+        "Using InMemoryMetricReader. For production, configure OTLP exporter via environment."
+    )
+    return InMemoryMetricReader()
+
+
 def init_otel(
     *,
     service_name: str = "decisionproof-api",
@@ -34,7 +86,8 @@ def init_otel(
 
     Args:
         service_name: Service name for OTel resource
-        span_exporter: Custom span exporter (for testing). If None, uses InMemorySpanExporter.
+        span_exporter: Custom span exporter (for testing). If None, uses OTLP when
+            OTEL_EXPORTER_OTLP_ENDPOINT is set, else a no-op exporter (batched).
         metric_reader: Custom metric reader (for testing). If None, creates default.
         log_correlation: Enable log correlation (inject trace/span IDs into logs)
 
@@ -71,23 +124,21 @@ def init_otel(
 
     # Initialize tracing
     tracer_provider = TracerProvider(resource=resource)
-    span_exporter = InMemorySpanExporter()
-    logger.warning(
-        "Using InMemorySpanExporter. For production, configure OTLP exporter via environment."
+    span_exporter = _build_span_exporter()
+
+    # Batch export off the request thread with a bounded queue
+    tracer_provider.add_span_processor(
+        BatchSpanProcessor(
+            span_exporter,
+            max_queue_size=2048,
+            max_export_batch_size=512,
+            schedule_delay_millis=5000,
+        )
     )
-
-    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
-
-    tracer_provider.add_span_processor(SimpleSpanProcessor(span_exporter))
     trace.set_tracer_provider(tracer_provider)
 
     # Initialize metrics
-    from opentelemetry.sdk.metrics.export import InMemoryMetricReader
-
-    metric_reader = InMemoryMetricReader()
-    logger.warning(
-        "Using InMemoryMetricReader. For production, configure OTLP exporter via environment."
-    )
+    metric_reader = _build_metric_reader()
 
     meter_provider = MeterProvider(resource=resource, metric_readers=[metric_reader])
     metrics.set_meter_provider(meter_provider)
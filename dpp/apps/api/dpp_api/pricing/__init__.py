@@ -26,6 +26,7 @@ from .ssot_loader import (
 )
 
 from .problem_details import (
+    PROBLEM_DETAILS_EXAMPLE,
     ProblemDetails,
     ViolatedPolicy,
     create_problem_details_response
@@ -36,7 +37,8 @@ from .ratelimit_headers import (
 )
 
 from .enforcement import (
-    EnforcementEngine
+    EnforcementEngine,
+    AsyncEnforcementEngine
 )
 
 from .metering import (
@@ -67,6 +69,7 @@ __all__ = [
     "load_pricing_ssot",
     
     # Problem Details
+    "PROBLEM_DETAILS_EXAMPLE",
     "ProblemDetails",
     "ViolatedPolicy",
     "create_problem_details_response",
@@ -76,6 +79,7 @@ __all__ = [
     
     # Enforcement
     "EnforcementEngine",
+    "AsyncEnforcementEngine",
     
     # Metering
     "MeteringService",
@@ -3,13 +3,61 @@ Runtime Enforcement Engine
 Enforces pricing policies: RPM, monthly DC quota, hard overage cap
 """
 
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from redis.exceptions import NoScriptError
 from .models import PricingSSoTModel, TierModel
 from .problem_details import ProblemDetails, ViolatedPolicy
 
 
+# RPM.lua - INCR-first RPM check in a single round trip
+# KEYS[1] = rpm:{workspace_id} (HASH), ARGV[1] = limit, ARGV[2] = window index,
+# ARGV[3] = window seconds
+# One hash field per fixed window. The first hit of a new window drops only
+# fields older than the previous window (workers with slightly skewed clocks
+# keep the live one) and refreshes a 2x window EXPIRE, so idle keys and any
+# stale rolled-back field are reclaimed.
+# Returns {1, count} when allowed, {0, count_after_rollback} when exceeded
+RPM_LUA = """
+local w = tonumber(ARGV[2])
+local c = redis.call("HINCRBY", KEYS[1], ARGV[2], 1)
+if c == 1 then
+  for _, f in ipairs(redis.call("HKEYS", KEYS[1])) do
+    if tonumber(f) < w - 1 then
+      redis.call("HDEL", KEYS[1], f)
+    end
+  end
+  redis.call("EXPIRE", KEYS[1], 2 * tonumber(ARGV[3]))
+end
+if c > tonumber(ARGV[1]) then
+  redis.call("HINCRBY", KEYS[1], ARGV[2], -1)
+  return {0, c - 1}
+end
+return {1, c}
+"""
+
+QUOTA_EXCEEDED_TITLE = "Request cannot be satisfied as assigned quota has been exceeded"
+
+
+@dataclass(slots=True)
+class _TierRT:
+    """Per-tier values derived once from the SSoT (limits, unlimited flags, grace)"""
+    rpm_unlimited: bool
+    rpm_limit: int
+    window_s: int
+    monthly_unlimited: bool
+    monthly_quota: int
+    overage_unlimited: bool
+    hard_cap: int
+    total_cap: int
+    grace_dc: int
+    effective_cap: int
+
+
 class EnforcementEngine:
     """
     Runtime enforcement of pricing policies:
@@ -25,6 +73,9 @@ class EnforcementEngine:
         Accepts either:
         - EnforcementEngine(ssot, redis)
         - EnforcementEngine(redis, ssot)
+
+        The Redis client should come from get_redis() (BlockingConnectionPool,
+        hiredis parser) so concurrent checks share a bounded pool.
         """
         # Detect argument order by duck typing
         if hasattr(a, "tiers") and hasattr(b, "get"):
@@ -34,6 +85,73 @@ class EnforcementEngine:
             # a is redis-like, b is ssot-like
             self.redis, self.ssot = a, b
 
+        # Pre-load RPM script using SCRIPT LOAD for efficiency
+        self._rpm_sha: Optional[str] = None
+        self._load_scripts()
+
+        # Static Problem Details fields, resolved once instead of per denial
+        self._quota_exceeded_type = self.ssot.http.problem_details.type_uris["quota_exceeded"]
+
+        # Derived per-tier runtime values, populated lazily by _get_rt()
+        self._tier_cache: dict[str, _TierRT] = {}
+
+    def _load_scripts(self) -> None:
+        """Load Lua scripts into Redis."""
+        self._rpm_sha = self.redis.script_load(RPM_LUA)
+
+    def _get_rt(self, tier: TierModel) -> _TierRT:
+        """Resolve per-tier runtime values once (SSoT tiers are static at runtime)"""
+        rt = self._tier_cache.get(tier.tier)
+        if rt is None:
+            limits = tier.limits
+            # Hard cap = monthly_quota + hard_overage_dc_cap
+            total_cap = limits.monthly_quota_dc + limits.hard_overage_dc_cap
+            grace_dc = self._calculate_grace_overage(tier)
+            rt = _TierRT(
+                rpm_unlimited=self.ssot.is_zero_unlimited(limits.rate_limit_rpm, "rate_limit_rpm"),
+                rpm_limit=limits.rate_limit_rpm,
+                window_s=limits.rate_limit_window_seconds,
+                monthly_unlimited=self.ssot.is_zero_unlimited(
+                    limits.monthly_quota_dc, "monthly_quota_dc"
+                ),
+                monthly_quota=limits.monthly_quota_dc,
+                overage_unlimited=self.ssot.is_zero_unlimited(
+                    limits.hard_overage_dc_cap, "hard_overage_dc_cap"
+                ),
+                hard_cap=limits.hard_overage_dc_cap,
+                total_cap=total_cap,
+                grace_dc=grace_dc,
+                effective_cap=total_cap + grace_dc,
+            )
+            self._tier_cache[tier.tier] = rt
+        return rt
+
+    def clear_tier_cache(self) -> None:
+        """Drop derived tier values (call after the SSoT is reloaded)"""
+        self._tier_cache.clear()
+
+    def _eval_rpm(self, rpm_key: str, rpm_limit: int, window_idx: int, window_s: int) -> list:
+        """Run RPM.lua via EVALSHA, falling back to EVAL if the script cache was flushed."""
+        try:
+            return self.redis.evalsha(self._rpm_sha, 1, rpm_key, rpm_limit, window_idx, window_s)
+        except NoScriptError:
+            return self.redis.eval(RPM_LUA, 1, rpm_key, rpm_limit, window_idx, window_s)
+
+    @staticmethod
+    def _rpm_key(workspace_id: str) -> str:
+        """Generate RPM counter hash key (one field per fixed window)."""
+        return f"rpm:{workspace_id}"
+
+    @staticmethod
+    def _rpm_window(window_seconds: int) -> int:
+        """Index of the current fixed window (the RPM hash field)."""
+        return int(time.time()) // window_seconds
+
+    @staticmethod
+    def _usage_key(workspace_id: str, occurred_at: datetime) -> str:
+        """Generate monthly DC usage key."""
+        return f"usage:{workspace_id}:{occurred_at.strftime('%Y-%m')}"
+
     def check_rpm_limit(
         self,
         workspace_id: str,
@@ -41,55 +159,29 @@ class EnforcementEngine:
     ) -> Optional[ProblemDetails]:
         """
         Check RPM limit (INCR-first pattern)
-        
+
+        HINCRBY, stale-window cleanup and rollback all run inside RPM.lua,
+        so each check costs exactly one Redis round trip.
+
         Returns:
             None if OK
             ProblemDetails if exceeded
         """
 
-        rpm_limit = tier.limits.rate_limit_rpm
+        rt = self._get_rt(tier)
 
         # Zero means unlimited?
-        if self.ssot.is_zero_unlimited(rpm_limit, "rate_limit_rpm"):
+        if rt.rpm_unlimited:
             return None
 
-        # RPM key
-        window_seconds = tier.limits.rate_limit_window_seconds
-        now_window = int(datetime.utcnow().timestamp() / window_seconds)
-        rpm_key = f"rpm:{workspace_id}:{now_window}"
-
-        # INCR-first (atomic)
-        new_count = self.redis.incr(rpm_key)
-
-        # Set TTL (first request only)
-        if new_count == 1:
-            self.redis.expire(rpm_key, window_seconds)
-
-        # Check limit
-        if new_count > rpm_limit:
-            # Exceeded - rollback
-            self.redis.decr(rpm_key)
-
-            # Get TTL for Retry-After
-            ttl = self.redis.ttl(rpm_key)
-            retry_after = max(1, ttl)
-
-            return ProblemDetails(
-                type=self.ssot.http.problem_details.type_uris["quota_exceeded"],
-                title="Request cannot be satisfied as assigned quota has been exceeded",
-                status=429,
-                detail=f"RPM limit of {rpm_limit} requests per minute exceeded",
-                violated_policies=[
-                    ViolatedPolicy(
-                        policy=tier.policies.rpm_policy_name,
-                        limit=rpm_limit,
-                        current=new_count - 1,  # After decr
-                        window_seconds=window_seconds
-                    )
-                ]
-            )
+        # RPM key and current window field
+        rpm_key = self._rpm_key(workspace_id)
+        window_idx = self._rpm_window(rt.window_s)
 
-        return None
+        # INCR-first + rollback on exceed (atomic, one round trip)
+        result = self._eval_rpm(rpm_key, rt.rpm_limit, window_idx, rt.window_s)
+
+        return self._evaluate_rpm(tier, rt, result)
 
     def check_monthly_dc_quota(
         self,
@@ -112,38 +204,17 @@ class EnforcementEngine:
             ProblemDetails if exceeded (projected > quota)
         """
 
-        monthly_quota = tier.limits.monthly_quota_dc
+        rt = self._get_rt(tier)
 
         # Zero means unlimited?
-        if self.ssot.is_zero_unlimited(monthly_quota, "monthly_quota_dc"):
+        if rt.monthly_unlimited:
             return None
 
         # Get current usage from Redis
-        current_month = occurred_at.strftime("%Y-%m")
-        usage_key = f"usage:{workspace_id}:{current_month}"
+        usage_key = self._usage_key(workspace_id, occurred_at)
         current_usage = int(self.redis.get(usage_key) or 0)
 
-        # P0-7: Projected usage = current + dc_amount
-        projected_usage = current_usage + dc_amount
-
-        # Check limit (projected basis)
-        if projected_usage > monthly_quota:
-            return ProblemDetails(
-                type=self.ssot.http.problem_details.type_uris["quota_exceeded"],
-                title="Request cannot be satisfied as assigned quota has been exceeded",
-                status=429,
-                detail=f"Monthly DC quota of {monthly_quota} would be exceeded (current: {current_usage}, requested: {dc_amount})",
-                violated_policies=[
-                    ViolatedPolicy(
-                        policy=tier.policies.monthly_dc_policy_name,
-                        limit=monthly_quota,
-                        current=current_usage,
-                        window_seconds=None  # Monthly quota
-                    )
-                ]
-            )
-
-        return None
+        return self._evaluate_monthly_dc_quota(tier, rt, current_usage, dc_amount)
 
     def check_hard_overage_cap(
         self,
@@ -166,45 +237,191 @@ class EnforcementEngine:
             ProblemDetails if exceeded (projected > cap + grace)
         """
 
-        hard_cap = tier.limits.hard_overage_dc_cap
+        rt = self._get_rt(tier)
 
         # Zero means unlimited?
-        if self.ssot.is_zero_unlimited(hard_cap, "hard_overage_dc_cap"):
+        if rt.overage_unlimited:
             return None
 
         # Get current usage
-        current_month = occurred_at.strftime("%Y-%m")
-        usage_key = f"usage:{workspace_id}:{current_month}"
+        usage_key = self._usage_key(workspace_id, occurred_at)
         current_usage = int(self.redis.get(usage_key) or 0)
 
+        return self._evaluate_hard_overage_cap(tier, rt, current_usage, dc_amount)
+
+    def check_all(
+        self,
+        workspace_id: str,
+        tier: TierModel,
+        dc_amount: int,
+        occurred_at: datetime
+    ) -> Optional[ProblemDetails]:
+        """
+        Check RPM, monthly DC quota and hard overage cap in one round trip
+
+        RPM.lua and the usage GET are sent in a single non-transactional
+        pipeline; both quota checks evaluate the same usage value. If a quota
+        check fails after the RPM counter was incremented, the increment is
+        rolled back so rejected requests do not consume RPM budget.
+
+        Args:
+            workspace_id: Workspace ID
+            tier: Tier configuration
+            dc_amount: DC amount to be charged
+            occurred_at: Timestamp of the request
+
+        Returns:
+            None if OK
+            ProblemDetails for the first violated policy (RPM, monthly, hard cap)
+        """
+
+        rt = self._get_rt(tier)
+        rpm_enforced = not rt.rpm_unlimited
+        monthly_enforced = not rt.monthly_unlimited
+        overage_enforced = not rt.overage_unlimited
+
+        if not (rpm_enforced or monthly_enforced or overage_enforced):
+            return None
+
+        rpm_key = self._rpm_key(workspace_id)
+        window_idx = self._rpm_window(rt.window_s)
+        usage_key = self._usage_key(workspace_id, occurred_at)
+
+        def _execute() -> list:
+            pipe = self.redis.pipeline(transaction=False)
+            if rpm_enforced:
+                pipe.evalsha(self._rpm_sha, 1, rpm_key, rt.rpm_limit, window_idx, rt.window_s)
+            if monthly_enforced or overage_enforced:
+                pipe.get(usage_key)
+            return pipe.execute()
+
+        try:
+            results = _execute()
+        except NoScriptError:
+            # Script cache was flushed: reload once and retry the batch
+            self._rpm_sha = self.redis.script_load(RPM_LUA)
+            results = _execute()
+
+        if rpm_enforced:
+            problem = self._evaluate_rpm(tier, rt, results[0])
+            if problem is not None:
+                return problem
+
+        problem = None
+        if monthly_enforced or overage_enforced:
+            # The usage GET is only pipelined when a quota is enforced
+            current_usage = int(results[-1] or 0)
+            if monthly_enforced:
+                problem = self._evaluate_monthly_dc_quota(tier, rt, current_usage, dc_amount)
+            if problem is None and overage_enforced:
+                problem = self._evaluate_hard_overage_cap(tier, rt, current_usage, dc_amount)
+
+        if problem is not None and rpm_enforced:
+            # Rejected by quota: give the RPM slot back
+            self.redis.hincrby(rpm_key, window_idx, -1)
+
+        return problem
+
+    def _evaluate_rpm(
+        self,
+        tier: TierModel,
+        rt: _TierRT,
+        result: list
+    ) -> Optional[ProblemDetails]:
+        """Evaluate an RPM.lua result: {allowed, current}"""
+
+        allowed, current = result[0], result[1]
+
+        if int(allowed):
+            return None
+
+        return self._quota_exceeded(
+            detail=f"RPM limit of {rt.rpm_limit} requests per minute exceeded",
+            policy=tier.policies.rpm_policy_name,
+            limit=rt.rpm_limit,
+            current=int(current),  # After rollback
+            window_seconds=rt.window_s
+        )
+
+    def _evaluate_monthly_dc_quota(
+        self,
+        tier: TierModel,
+        rt: _TierRT,
+        current_usage: int,
+        dc_amount: int
+    ) -> Optional[ProblemDetails]:
+        """Evaluate monthly DC quota against an already-fetched usage value"""
+
+        monthly_quota = rt.monthly_quota
+
         # P0-7: Projected usage = current + dc_amount
         projected_usage = current_usage + dc_amount
 
-        # Hard cap = monthly_quota + hard_overage_dc_cap
-        total_cap = tier.limits.monthly_quota_dc + hard_cap
-
-        # Check limit (with grace overage)
-        grace_dc = self._calculate_grace_overage(tier)
-        effective_cap = total_cap + grace_dc
-
-        if projected_usage > effective_cap:
-            return ProblemDetails(
-                type=self.ssot.http.problem_details.type_uris["quota_exceeded"],
-                title="Request cannot be satisfied as assigned quota has been exceeded",
-                status=429,
-                detail=f"Hard overage cap of {hard_cap} DC would be exceeded (current: {current_usage}, requested: {dc_amount}, grace: {grace_dc})",
-                violated_policies=[
-                    ViolatedPolicy(
-                        policy=tier.policies.hard_overage_cap_policy_name,
-                        limit=total_cap,
-                        current=current_usage,
-                        window_seconds=None
-                    )
-                ]
+        # Check limit (projected basis)
+        if projected_usage > monthly_quota:
+            return self._quota_exceeded(
+                detail=f"Monthly DC quota of {monthly_quota} would be exceeded (current: {current_usage}, requested: {dc_amount})",
+                policy=tier.policies.monthly_dc_policy_name,
+                limit=monthly_quota,
+                current=current_usage,
+                window_seconds=None  # Monthly quota
             )
 
         return None
 
+    def _evaluate_hard_overage_cap(
+        self,
+        tier: TierModel,
+        rt: _TierRT,
+        current_usage: int,
+        dc_amount: int
+    ) -> Optional[ProblemDetails]:
+        """Evaluate hard overage cap against an already-fetched usage value"""
+
+        # P0-7: Projected usage = current + dc_amount, checked against the
+        # precomputed cap (total cap + grace overage)
+        if current_usage + dc_amount > rt.effective_cap:
+            return self._quota_exceeded(
+                detail=f"Hard overage cap of {rt.hard_cap} DC would be exceeded (current: {current_usage}, requested: {dc_amount}, grace: {rt.grace_dc})",
+                policy=tier.policies.hard_overage_cap_policy_name,
+                limit=rt.total_cap,
+                current=current_usage,
+                window_seconds=None
+            )
+
+        return None
+
+    def _quota_exceeded(
+        self,
+        *,
+        detail: str,
+        policy: str,
+        limit: int,
+        current: int,
+        window_seconds: Optional[int]
+    ) -> ProblemDetails:
+        """
+        Build a 429 quota-exceeded ProblemDetails
+
+        Fields are produced internally and already typed, so model_construct
+        skips pydantic validation on the denial path.
+        """
+
+        return ProblemDetails.model_construct(
+            type=self._quota_exceeded_type,
+            title=QUOTA_EXCEEDED_TITLE,
+            status=429,
+            detail=detail,
+            violated_policies=[
+                ViolatedPolicy.model_construct(
+                    policy=policy,
+                    limit=limit,
+                    current=current,
+                    window_seconds=window_seconds
+                )
+            ]
+        )
+
     def _calculate_grace_overage(self, tier: TierModel) -> int:
         """
         Calculate grace overage amount
@@ -227,3 +444,144 @@ class EnforcementEngine:
         grace_from_dc = self.ssot.grace_overage.max_grace_dc
 
         return min(grace_from_percent, grace_from_dc)
+
+
+class AsyncEnforcementEngine(EnforcementEngine):
+    """
+    EnforcementEngine over redis.asyncio for ASGI call sites
+
+    Same policies, keys and Lua script as EnforcementEngine, but every check
+    is a coroutine so Redis round trips from concurrent requests overlap on
+    the event loop instead of blocking it. Construct with a
+    redis.asyncio.Redis; RPM.lua is loaded on first use.
+    """
+
+    redis: AsyncRedis
+
+    def _load_scripts(self) -> None:
+        """SCRIPT LOAD is a coroutine here; defer it to the first RPM check."""
+        self._rpm_sha = None
+
+    async def _ensure_scripts(self) -> str:
+        """Load RPM.lua once and return its SHA."""
+        if self._rpm_sha is None:
+            self._rpm_sha = await self.redis.script_load(RPM_LUA)
+        return self._rpm_sha
+
+    async def _eval_rpm(self, rpm_key: str, rpm_limit: int, window_idx: int, window_s: int) -> list:
+        """Run RPM.lua via EVALSHA, falling back to EVAL if the script cache was flushed."""
+        sha = await self._ensure_scripts()
+        try:
+            return await self.redis.evalsha(sha, 1, rpm_key, rpm_limit, window_idx, window_s)
+        except NoScriptError:
+            return await self.redis.eval(RPM_LUA, 1, rpm_key, rpm_limit, window_idx, window_s)
+
+    async def check_rpm_limit(
+        self,
+        workspace_id: str,
+        tier: TierModel
+    ) -> Optional[ProblemDetails]:
+        """Async check_rpm_limit (see EnforcementEngine.check_rpm_limit)"""
+
+        rt = self._get_rt(tier)
+        if rt.rpm_unlimited:
+            return None
+
+        rpm_key = self._rpm_key(workspace_id)
+        window_idx = self._rpm_window(rt.window_s)
+        result = await self._eval_rpm(rpm_key, rt.rpm_limit, window_idx, rt.window_s)
+
+        return self._evaluate_rpm(tier, rt, result)
+
+    async def check_monthly_dc_quota(
+        self,
+        workspace_id: str,
+        tier: TierModel,
+        dc_amount: int,
+        occurred_at: datetime
+    ) -> Optional[ProblemDetails]:
+        """Async check_monthly_dc_quota (see EnforcementEngine.check_monthly_dc_quota)"""
+
+        rt = self._get_rt(tier)
+        if rt.monthly_unlimited:
+            return None
+
+        usage_key = self._usage_key(workspace_id, occurred_at)
+        current_usage = int(await self.redis.get(usage_key) or 0)
+
+        return self._evaluate_monthly_dc_quota(tier, rt, current_usage, dc_amount)
+
+    async def check_hard_overage_cap(
+        self,
+        workspace_id: str,
+        tier: TierModel,
+        dc_amount: int,
+        occurred_at: datetime
+    ) -> Optional[ProblemDetails]:
+        """Async check_hard_overage_cap (see EnforcementEngine.check_hard_overage_cap)"""
+
+        rt = self._get_rt(tier)
+        if rt.overage_unlimited:
+            return None
+
+        usage_key = self._usage_key(workspace_id, occurred_at)
+        current_usage = int(await self.redis.get(usage_key) or 0)
+
+        return self._evaluate_hard_overage_cap(tier, rt, current_usage, dc_amount)
+
+    async def check_all(
+        self,
+        workspace_id: str,
+        tier: TierModel,
+        dc_amount: int,
+        occurred_at: datetime
+    ) -> Optional[ProblemDetails]:
+        """Async check_all (see EnforcementEngine.check_all)"""
+
+        rt = self._get_rt(tier)
+        rpm_enforced = not rt.rpm_unlimited
+        monthly_enforced = not rt.monthly_unlimited
+        overage_enforced = not rt.overage_unlimited
+
+        if not (rpm_enforced or monthly_enforced or overage_enforced):
+            return None
+
+        rpm_key = self._rpm_key(workspace_id)
+        window_idx = self._rpm_window(rt.window_s)
+        usage_key = self._usage_key(workspace_id, occurred_at)
+        sha = await self._ensure_scripts() if rpm_enforced else None
+
+        async def _execute(rpm_sha: Optional[str]) -> list:
+            pipe = self.redis.pipeline(transaction=False)
+            if rpm_enforced:
+                pipe.evalsha(rpm_sha, 1, rpm_key, rt.rpm_limit, window_idx, rt.window_s)
+            if monthly_enforced or overage_enforced:
+                pipe.get(usage_key)
+            return await pipe.execute()
+
+        try:
+            results = await _execute(sha)
+        except NoScriptError:
+            # Script cache was flushed: reload once and retry the batch
+            self._rpm_sha = None
+            results = await _execute(await self._ensure_scripts())
+
+        if rpm_enforced:
+            problem = self._evaluate_rpm(tier, rt, results[0])
+            if problem is not None:
+                return problem
+
+        problem = None
+        if monthly_enforced or overage_enforced:
+            # The usage GET is only pipelined when a quota is enforced
+            current_usage = int(results[-1] or 0)
+            if monthly_enforced:
+                problem = self._evaluate_monthly_dc_quota(tier, rt, current_usage, dc_amount)
+            if problem is None and overage_enforced:
+                problem = self._evaluate_hard_overage_cap(tier, rt, current_usage, dc_amount)
+
+        if problem is not None and rpm_enforced:
+            # Rejected by quota: give the RPM slot back
+            await self.redis.hincrby(rpm_key, window_idx, -1)
+
+        return problem
@@ -2,9 +2,30 @@
 RFC 9457 Problem Details for HTTP APIs
 """
 
+import orjson
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional
-from fastapi.responses import JSONResponse
+from fastapi import Response
+
+
+# OpenAPI example for 429 quota-exceeded responses. Kept off the model so the
+# schema only carries it where a route opts in, e.g.
+#   responses={429: {"model": ProblemDetails, "content": {
+#       "application/problem+json": {"example": PROBLEM_DETAILS_EXAMPLE}}}}
+PROBLEM_DETAILS_EXAMPLE = {
+    "type": "https://iana.org/assignments/http-problem-types#quota-exceeded",
+    "title": "Request cannot be satisfied as assigned quota has been exceeded",
+    "status": 429,
+    "detail": "RPM limit of 600 requests per minute exceeded",
+    "violated-policies": [
+        {
+            "policy": "rpm",
+            "limit": 600,
+            "current": 601,
+            "window_seconds": 60
+        }
+    ]
+}
 
 
 class ViolatedPolicy(BaseModel):
@@ -39,25 +60,7 @@ class ProblemDetails(BaseModel):
         alias="violated-policies"
     )
 
-    model_config = ConfigDict(
-        populate_by_name=True,
-        json_schema_extra={
-            "example": {
-                "type": "https://iana.org/assignments/http-problem-types#quota-exceeded",
-                "title": "Request cannot be satisfied as assigned quota has been exceeded",
-                "status": 429,
-                "detail": "RPM limit of 600 requests per minute exceeded",
-                "violated-policies": [
-                    {
-                        "policy_name": "rpm",
-                        "limit": 600,
-                        "current": 601,
-                        "window_seconds": 60
-                    }
-                ]
-            }
-        }
-    )
+    model_config = ConfigDict(populate_by_name=True)
 
 
 def create_problem_details_response(
@@ -69,7 +72,7 @@ def create_problem_details_response(
     instance: Optional[str] = None,
     violated_policies: Optional[List[ViolatedPolicy]] = None,
     headers: Optional[dict[str, str]] = None
-) -> JSONResponse:
+) -> Response:
     """
     Create RFC 9457 Problem Details JSON response
 
@@ -85,27 +88,23 @@ def create_problem_details_response(
         headers: Optional additional headers
 
     Returns:
-        JSONResponse with application/problem+json content type
+        Response with application/problem+json content type
     """
-    # Build ProblemDetails instance
-    problem = ProblemDetails(
-        type=type_uri,
-        title=title,
-        status=status,
-        detail=detail,
-        instance=instance,
-        violated_policies=violated_policies or []
-    )
-
-    response_headers = {"Content-Type": "application/problem+json"}
-    if headers:
-        response_headers.update(headers)
-
-    # Serialize with alias (violated-policies instead of violated_policies)
-    content = problem.model_dump(by_alias=True, exclude_none=True)
+    # Build the body directly: all fields come from internal code, so a
+    # validating ProblemDetails round trip adds cost without checking anything.
+    # Same shape as ProblemDetails.model_dump(by_alias=True, exclude_none=True).
+    content: dict = {"type": type_uri, "title": title, "status": status}
+    if detail is not None:
+        content["detail"] = detail
+    if instance is not None:
+        content["instance"] = instance
+    content["violated-policies"] = [
+        policy.model_dump(exclude_none=True) for policy in violated_policies or ()
+    ]
 
-    return JSONResponse(
-        status_code=problem.status,
-        content=content,
-        headers=response_headers
+    return Response(
+        content=orjson.dumps(content),
+        status_code=status,
+        media_type="application/problem+json",
+        headers=headers,
     )
@@ -3,12 +3,20 @@ IETF RateLimit Headers Generator
 draft-ietf-httpapi-ratelimit-headers
 """
 
-from datetime import datetime
+import time
+from functools import lru_cache
 from typing import Optional
 from redis import Redis
+from .enforcement import EnforcementEngine
 from .models import TierModel, PricingSSoTModel
 
 
+@lru_cache(maxsize=256)
+def _policy_header(policy_name: str, quota: int, window_seconds: int) -> str:
+    """RateLimit-Policy value; static per (tier, policy) so it is built once"""
+    return f'"{policy_name}";q={quota};w={window_seconds}'
+
+
 class RateLimitHeadersGenerator:
     """
     Generate RateLimit headers per IETF draft-ietf-httpapi-ratelimit-headers
@@ -55,22 +63,20 @@ class RateLimitHeadersGenerator:
         if self.ssot.is_zero_unlimited(rpm_limit, "rate_limit_rpm"):
             return {}
 
-        # Get current usage
-        now_window = int(datetime.utcnow().timestamp() / window_seconds)
-        rpm_key = f"rpm:{workspace_id}:{now_window}"
-        current_count = int(self.redis.get(rpm_key) or 0)
+        # Get current usage (field of the current fixed window)
+        now = int(time.time())
+        rpm_key = EnforcementEngine._rpm_key(workspace_id)
+        current_count = int(self.redis.hget(rpm_key, now // window_seconds) or 0)
         remaining = max(0, rpm_limit - current_count)
 
-        # TTL
-        ttl = self.redis.ttl(rpm_key)
-        if ttl < 0:
-            ttl = window_seconds
+        # Seconds until the fixed window resets (no TTL round trip)
+        ttl = window_seconds - (now % window_seconds)
 
         # Policy name
         policy_name = tier.policies.rpm_policy_name
 
         # RateLimit-Policy: "rpm";q=600;w=60
-        policy_header = f'"{policy_name}";q={rpm_limit};w={window_seconds}'
+        policy_header = _policy_header(policy_name, rpm_limit, window_seconds)
 
         # RateLimit: "rpm";r=123;t=17
         limit_header = f'"{policy_name}";r={remaining};t={ttl}'
@@ -126,7 +132,7 @@ class RateLimitHeadersGenerator:
         window_seconds = 30 * 24 * 3600
 
         # RateLimit-Policy: "monthly_dc";q=2000;w=2592000
-        policy_header = f'"{policy_name}";q={monthly_quota};w={window_seconds}'
+        policy_header = _policy_header(policy_name, monthly_quota, window_seconds)
 
         # RateLimit: "monthly_dc";r=1000
         # Note: No "t" parameter for monthly quotas (resets at month boundary)
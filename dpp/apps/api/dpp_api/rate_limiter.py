@@ -8,11 +8,12 @@ RC-3: Contract Gate - RateLimit Headers
 
 import time
 from abc import ABC, abstractmethod
+from array import array
 from dataclasses import dataclass
 from typing import Dict, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class RateLimitResult:
     """Result of rate limit check.
 
@@ -54,6 +55,10 @@ class NoOpRateLimiter(RateLimiter):
 
     RC-3: Default production limiter (actual rate limiting not implemented yet).
     Returns header values for documentation compliance.
+
+    The result never varies, so a single RateLimitResult is built at init and
+    returned on every call. Callers only read it to build headers; treat it
+    as read-only.
     """
 
     def __init__(self, quota: int = 60, window: int = 60):
@@ -65,18 +70,19 @@ class NoOpRateLimiter(RateLimiter):
         """
         self.quota = quota
         self.window = window
-
-    def check_rate_limit(self, key: str, path: str) -> RateLimitResult:
-        """Always allow, return full quota."""
-        return RateLimitResult(
+        self._result = RateLimitResult(
             allowed=True,
             policy_id="default",
-            quota=self.quota,
-            window=self.window,
-            remaining=self.quota - 1,  # Assume 1 request consumed
-            reset=self.window,
+            quota=quota,
+            window=window,
+            remaining=quota - 1,  # Assume 1 request consumed
+            reset=window,
         )
 
+    def check_rate_limit(self, key: str, path: str) -> RateLimitResult:
+        """Always allow, return full quota (shared read-only result)."""
+        return self._result
+
 
 class DeterministicTestLimiter(RateLimiter):
     """Deterministic in-memory rate limiter for testing.
@@ -96,8 +102,11 @@ class DeterministicTestLimiter(RateLimiter):
         """
         self.quota = quota
         self.window = window
-        # In-memory counter: {(key, path): (count, window_start_time)}
-        self._counters: Dict[Tuple[str, str], Tuple[int, float]] = {}
+        # In-memory counters as parallel arrays (SoA), indexed by partition id:
+        # {(key, path): idx} -> _count[idx], _start[idx]
+        self._ids: Dict[Tuple[str, str], int] = {}
+        self._count = array("i")
+        self._start = array("d")
 
     def check_rate_limit(self, key: str, path: str) -> RateLimitResult:
         """Check rate limit with deterministic behavior."""
@@ -105,9 +114,12 @@ class DeterministicTestLimiter(RateLimiter):
         current_time = time.time()
 
         # Get or create counter
-        if partition_key not in self._counters:
+        idx = self._ids.get(partition_key)
+        if idx is None:
             # First request in this window
-            self._counters[partition_key] = (1, current_time)
+            self._ids[partition_key] = len(self._count)
+            self._count.append(1)
+            self._start.append(current_time)
             return RateLimitResult(
                 allowed=True,
                 policy_id="default",
@@ -117,13 +129,14 @@ class DeterministicTestLimiter(RateLimiter):
                 reset=self.window,
             )
 
-        count, window_start = self._counters[partition_key]
-        elapsed = current_time - window_start
+        count = self._count[idx]
+        elapsed = current_time - self._start[idx]
 
         # Check if window expired
         if elapsed >= self.window:
             # New window
-            self._counters[partition_key] = (1, current_time)
+            self._count[idx] = 1
+            self._start[idx] = current_time
             return RateLimitResult(
                 allowed=True,
                 policy_id="default",
@@ -136,7 +149,7 @@ class DeterministicTestLimiter(RateLimiter):
         # Within same window
         if count < self.quota:
             # Still has quota
-            self._counters[partition_key] = (count + 1, window_start)
+            self._count[idx] = count + 1
             remaining = self.quota - (count + 1)
             time_left = int(self.window - elapsed)
             return RateLimitResult(
@@ -161,4 +174,6 @@ class DeterministicTestLimiter(RateLimiter):
 
     def reset(self):
         """Reset all counters (test utility)."""
-        self._counters.clear()
+        self._ids.clear()
+        self._count = array("i")
+        self._start = array("d")
@@ -37,23 +37,31 @@ Zombie enforcement:
   - BASIC: 5m hard timeout, PRO: 10m → TIMEOUT status, frees active slot
 """
 
+import asyncio
 import hashlib
+import heapq
 import hmac
+import itertools
 import json
 import logging
 import math
 import os
 import threading
 import time
-import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, NamedTuple, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import ValidationError
+from redis.exceptions import (
+    NoScriptError,
+    ResponseError,
+)
 
-from dpp_api.pricing.problem_details import create_problem_details_response
+from dpp_api.db.redis_client import get_async_redis
 from dpp_api.schemas_demo import AI_DISCLOSURE, DemoRunCreateRequest
 from dpp_api.utils.sanitize import sanitize_log_value
 
@@ -61,35 +69,52 @@ logger = logging.getLogger(__name__)
 
 # ─── Plan configuration ───────────────────────────────────────────────────────
 
-PLAN_LIMITS: dict[str, dict[str, Any]] = {
-    "BASIC": {
-        "post_rpm": 6,
-        "get_rpm": 24,
-        "poll_min_interval_s": 3,
-        "poll_max_count": 40,
-        "max_active": 1,
-        "zombie_timeout_s": 300,   # 5 minutes
-        "retention_days": 7,
-        "poll_delay_ms": 3000,
-    },
-    "PRO": {
-        "post_rpm": 24,
-        "get_rpm": 96,
-        "poll_min_interval_s": 2,
-        "poll_max_count": 60,
-        "max_active": 3,
-        "zombie_timeout_s": 600,   # 10 minutes
-        "retention_days": 30,
-        "poll_delay_ms": 2000,
-    },
+class PlanLimits(NamedTuple):
+    """Per-plan demo limits."""
+
+    post_rpm: int
+    get_rpm: int
+    poll_min_interval_s: int
+    poll_max_count: int
+    max_active: int
+    zombie_timeout_s: int
+    retention_days: int
+    retention_ttl_s: int   # retention_days in seconds
+    poll_delay_ms: int
+
+
+PLAN_LIMITS: dict[str, PlanLimits] = {
+    "BASIC": PlanLimits(
+        post_rpm=6,
+        get_rpm=24,
+        poll_min_interval_s=3,
+        poll_max_count=40,
+        max_active=1,
+        zombie_timeout_s=300,   # 5 minutes
+        retention_days=7,
+        retention_ttl_s=7 * 24 * 3600,
+        poll_delay_ms=3000,
+    ),
+    "PRO": PlanLimits(
+        post_rpm=24,
+        get_rpm=96,
+        poll_min_interval_s=2,
+        poll_max_count=60,
+        max_active=3,
+        zombie_timeout_s=600,   # 10 minutes
+        retention_days=30,
+        retention_ttl_s=30 * 24 * 3600,
+        poll_delay_ms=2000,
+    ),
 }
 
 TOMBSTONE_TTL_S = 90 * 24 * 3600   # 90 days in seconds
 MAX_BODY_BYTES = 4096
 MAX_QUESTION_LEN = 512
 
-# Mock result template (deterministic for demos)
-_MOCK_RESULT_BASE = {
+# Mock result template (deterministic for demos). Read-only: responses are
+# built as {**_MOCK_RESULT_BASE, "generated_at": ..., **_MOCK_RESULT_OVERLAY}.
+_MOCK_RESULT_BASE = MappingProxyType({
     "decision": "APPROVED",
     "confidence_score": 0.927,
     "reasoning": (
@@ -97,12 +122,81 @@ _MOCK_RESULT_BASE = {
         "the request against available criteria and determined approval with "
         "high confidence."
     ),
-    "factors": [
+    "factors": (
         {"name": "relevance",    "score": 0.95, "weight": 0.4},
         {"name": "completeness", "score": 0.88, "weight": 0.3},
         {"name": "clarity",      "score": 0.92, "weight": 0.3},
-    ],
-}
+    ),
+})
+_MOCK_RESULT_OVERLAY = MappingProxyType({
+    "is_ai_generated": True,
+    "disclaimer": AI_DISCLOSURE,
+})
+
+# Serialized mock result is constant except for generated_at: encode it once
+# and hash the constant prefix once, splicing the timestamp in per run.
+_MOCK_RESULT_TS_MARK = "__generated_at__"
+_MOCK_RESULT_PREFIX, _MOCK_RESULT_SUFFIX = json.dumps(
+    {
+        **_MOCK_RESULT_BASE,
+        "generated_at": _MOCK_RESULT_TS_MARK,
+        **_MOCK_RESULT_OVERLAY,
+    },
+    ensure_ascii=False,
+).encode("utf-8").split(_MOCK_RESULT_TS_MARK.encode("utf-8"))
+_MOCK_RESULT_PREFIX_SHA256 = hashlib.sha256(_MOCK_RESULT_PREFIX)
+
+
+def _mock_result_bytes(generated_at: str) -> tuple[bytes, str]:
+    """Serialized mock result and its sha256 hex for an ISO timestamp."""
+    ts = generated_at.encode("utf-8")   # ISO 8601: nothing to JSON-escape
+    h = _MOCK_RESULT_PREFIX_SHA256.copy()
+    h.update(ts)
+    h.update(_MOCK_RESULT_SUFFIX)
+    return _MOCK_RESULT_PREFIX + ts + _MOCK_RESULT_SUFFIX, h.hexdigest()
+
+
+# Sliding-window rate limit (one round trip, atomic)
+# KEYS[1] = bucket ZSET, ARGV = now_ms, window_ms, limit, member
+# Returns {1, 0} when allowed, {0, retry_after_ms} when blocked
+_RPM_LUA = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call("ZREMRANGEBYSCORE", KEYS[1], 0, now - window)
+if redis.call("ZCARD", KEYS[1]) < tonumber(ARGV[3]) then
+  redis.call("ZADD", KEYS[1], now, ARGV[4])
+  redis.call("PEXPIRE", KEYS[1], window)
+  return {1, 0}
+end
+local oldest = redis.call("ZRANGE", KEYS[1], 0, 0, "WITHSCORES")
+return {0, tonumber(oldest[2]) + window - now}
+"""
+
+# Poll gate (one round trip, atomic check-and-record)
+# KEYS[1] = poll_last, KEYS[2] = poll_count
+# ARGV = now_ts, min_interval_s, max_count, last_ttl_s, count_ttl_s
+# Returns {1, 0, ""} when allowed, {0, retry_after_s, "interval" | "count"} when blocked
+_POLL_LUA = """
+local now = tonumber(ARGV[1])
+local last = redis.call("GET", KEYS[1])
+if last then
+  local wait = tonumber(ARGV[2]) - (now - tonumber(last))
+  if wait > 0 then
+    return {0, math.ceil(wait), "interval"}
+  end
+end
+if tonumber(redis.call("GET", KEYS[2]) or "0") >= tonumber(ARGV[3]) then
+  return {0, 0, "count"}
+end
+redis.call("SET", KEYS[1], ARGV[1], "EX", ARGV[4])
+if redis.call("INCR", KEYS[2]) == 1 then
+  redis.call("EXPIRE", KEYS[2], ARGV[5])
+end
+return {1, 0, ""}
+"""
+
+# Script SHAs, loaded on first use (SCRIPT LOAD needs a live connection)
+_script_shas: dict[str, str] = {}
 
 
 # ─── Redis key helpers ────────────────────────────────────────────────────────
@@ -113,11 +207,14 @@ def _rk_run(run_id: str) -> str:
 def _rk_tombstone(run_id: str) -> str:
     return f"demo:tombstone:{run_id}"
 
+# Rate buckets are _RPM_LUA ZSETs under their own ":z:" namespace: the
+# previous release's INCR strings at demo:rate:{post,get}:{actor} would make
+# the script fail with WRONGTYPE. Those keys expire on their own within 60s.
 def _rk_rate_post(actor_key: str) -> str:
-    return f"demo:rate:post:{actor_key}"
+    return f"demo:rate:post:z:{actor_key}"
 
 def _rk_rate_get(actor_key: str) -> str:
-    return f"demo:rate:get:{actor_key}"
+    return f"demo:rate:get:z:{actor_key}"
 
 def _rk_active(actor_key: str) -> str:
     return f"demo:active:{actor_key}"
@@ -131,187 +228,424 @@ def _rk_poll_last(actor_key: str, run_id: str) -> str:
 
 # ─── In-memory fallback store (NOT suitable for multi-replica) ────────────────
 
-_mem: dict[str, tuple[str, Optional[float]]] = {}
-_mem_lock = threading.Lock()
+# Sharded by key hash so concurrent threads on different keys don't serialize.
+# Expiry times are time.monotonic(); a min-heap of (expire_at, key) lets the
+# background sweeper reclaim expired entries without scanning every shard.
+_MEM_SHARDS = 16
+_mem_shards: list[dict[str, tuple[Any, Optional[float]]]] = [{} for _ in range(_MEM_SHARDS)]
+_mem_locks: list[threading.Lock] = [threading.Lock() for _ in range(_MEM_SHARDS)]
+_mem_exp_heap: list[tuple[float, str]] = []
+_mem_exp_lock = threading.Lock()
+_mem_sweeper_task: Optional[asyncio.Task] = None
 
 
-def _mem_clean_expired() -> None:
-    now = time.time()
-    with _mem_lock:
-        expired = [k for k, (_, ex) in _mem.items() if ex and now > ex]
-        for k in expired:
-            del _mem[k]
+def _shard(key: str) -> tuple[dict[str, tuple[Any, Optional[float]]], threading.Lock]:
+    i = hash(key) & (_MEM_SHARDS - 1)
+    return _mem_shards[i], _mem_locks[i]
 
 
-def _mem_set(key: str, value: str, ex: Optional[int] = None) -> None:
-    expire_at = time.time() + ex if ex else None
-    with _mem_lock:
-        _mem[key] = (value, expire_at)
+def _mem_expire_at(key: str, ex: float) -> float:
+    """Expiry deadline ex seconds from now, registered with the sweeper."""
+    expire_at = time.monotonic() + ex
+    with _mem_exp_lock:
+        heapq.heappush(_mem_exp_heap, (expire_at, key))
+    return expire_at
 
 
-def _mem_get(key: str) -> Optional[str]:
-    with _mem_lock:
-        entry = _mem.get(key)
+def _mem_clean_expired(now: Optional[float] = None) -> None:
+    """Drop entries whose deadline has passed (heap pop, no full scan).
+
+    now defaults to time.monotonic().
+    """
+    if now is None:
+        now = time.monotonic()
+    due = []
+    with _mem_exp_lock:
+        while _mem_exp_heap and _mem_exp_heap[0][0] <= now:
+            due.append(heapq.heappop(_mem_exp_heap)[1])
+    for key in due:
+        shard, lock = _shard(key)
+        with lock:
+            entry = shard.get(key)
+            # Key may have been re-set with a later deadline since it was pushed
+            if entry and entry[1] and entry[1] <= now:
+                del shard[key]
+
+
+async def _mem_sweeper() -> None:
+    while True:
+        await asyncio.sleep(1)
+        _mem_clean_expired()
+
+
+async def _start_mem_sweeper() -> None:
+    global _mem_sweeper_task
+    if _mem_sweeper_task is None:
+        _mem_sweeper_task = asyncio.get_running_loop().create_task(_mem_sweeper())
+
+
+async def _stop_mem_sweeper() -> None:
+    global _mem_sweeper_task
+    if _mem_sweeper_task is not None:
+        _mem_sweeper_task.cancel()
+        _mem_sweeper_task = None
+
+
+def _mem_set(key: str, value: str | bytes | dict, ex: Optional[int] = None) -> None:
+    expire_at = _mem_expire_at(key, ex) if ex else None
+    shard, lock = _shard(key)
+    with lock:
+        shard[key] = (value, expire_at)
+
+
+def _mem_get(key: str) -> Optional[str | dict]:
+    shard, lock = _shard(key)
+    with lock:
+        entry = shard.get(key)
         if entry is None:
             return None
         value, expire_at = entry
-        if expire_at and time.time() > expire_at:
-            del _mem[key]
+        # Sweeper runs once a second; never serve a value past its deadline
+        if expire_at and time.monotonic() > expire_at:
+            del shard[key]
             return None
         return value
 
 
 def _mem_incr(key: str, ex: Optional[int] = None) -> int:
-    with _mem_lock:
-        entry = _mem.get(key)
-        if entry is None or (entry[1] and time.time() > entry[1]):
+    shard, lock = _shard(key)
+    with lock:
+        entry = shard.get(key)
+        if entry is None or (entry[1] and time.monotonic() > entry[1]):
             new_val = 1
-            expire_at = time.time() + ex if ex else None
+            expire_at = _mem_expire_at(key, ex) if ex else None
         else:
             new_val = int(entry[0]) + 1
             expire_at = entry[1]
-        _mem[key] = (str(new_val), expire_at)
+        shard[key] = (str(new_val), expire_at)
         return new_val
 
 
 def _mem_delete(key: str) -> None:
-    with _mem_lock:
-        _mem.pop(key, None)
+    shard, lock = _shard(key)
+    with lock:
+        shard.pop(key, None)
 
 
 def _mem_decr(key: str) -> int:
-    with _mem_lock:
-        entry = _mem.get(key)
-        current = int(entry[0]) if entry and not (entry[1] and time.time() > entry[1]) else 0
+    shard, lock = _shard(key)
+    with lock:
+        entry = shard.get(key)
+        current = int(entry[0]) if entry and not (entry[1] and time.monotonic() > entry[1]) else 0
         new_val = max(0, current - 1)
-        _mem[key] = (str(new_val), entry[1] if entry else None)
+        shard[key] = (str(new_val), entry[1] if entry else None)
         return new_val
 
 
+def _mem_rate_check(key: str, now_ms: int, window_ms: int, limit: int) -> tuple[bool, int]:
+    shard, lock = _shard(key)
+    with lock:
+        entry = shard.get(key)
+        hits = [t for t in entry[0] if t > now_ms - window_ms] if entry else []
+        if len(hits) < limit:
+            hits.append(now_ms)
+            shard[key] = (hits, _mem_expire_at(key, window_ms / 1000))
+            return True, 0
+        shard[key] = (hits, entry[1])
+        return False, hits[0] + window_ms - now_ms
+
+
+def _mem_poll_check(
+    last_key: str, count_key: str, now_ts: float,
+    min_interval_s: int, max_count: int, last_ex: int, count_ex: int,
+) -> tuple[bool, int, str]:
+    # Never awaits, so no other request on the loop can interleave
+    last = _mem_get(last_key)
+    if last is not None:
+        wait = min_interval_s - (now_ts - float(last))
+        if wait > 0:
+            return False, math.ceil(wait), "interval"
+    if int(_mem_get(count_key) or "0") >= max_count:
+        return False, 0, "count"
+    _mem_set(last_key, str(now_ts), last_ex)
+    _mem_incr(count_key, count_ex)
+    return True, 0, ""
+
+
 # ─── Storage abstraction (Redis → in-memory fallback) ─────────────────────────
 
-def _store_get(key: str) -> Optional[str]:
+# Resolved per call on the running loop (a dict lookup after the first call);
+# redis.asyncio connections are loop-bound, so a client created at import
+# would break under a second loop. The client connects lazily and keeps the
+# event loop free during round trips; the _mem_* fallback stays synchronous.
+# A failed call falls through to _mem_*, and the pool opens a fresh
+# connection on the next call.
+def _redis():
+    """Return the async Redis client for the running loop, or None if it cannot be created."""
     try:
-        from dpp_api.db.redis_client import get_redis
-        return get_redis().get(key)
+        return get_async_redis()
     except Exception:
-        return _mem_get(key)
+        return None
 
 
-def _store_set(key: str, value: str, ex: Optional[int] = None) -> None:
-    try:
-        from dpp_api.db.redis_client import get_redis
-        r = get_redis()
-        if ex:
-            r.setex(key, ex, value)
-        else:
-            r.set(key, value)
-    except Exception:
-        _mem_set(key, value, ex)
+async def _store_get(key: str) -> Optional[str]:
+    r = _redis()
+    if r is not None:
+        try:
+            return await r.get(key)
+        except Exception:
+            pass
+    return _mem_get(key)
 
 
-def _store_incr(key: str, ex: Optional[int] = None) -> int:
-    try:
-        from dpp_api.db.redis_client import get_redis
-        r = get_redis()
-        val = r.incr(key)
-        if ex and int(val) == 1:   # Set TTL only on first increment
-            r.expire(key, ex)
-        return int(val)
-    except Exception:
-        return _mem_incr(key, ex)
+async def _store_hgetall_mget(
+    hash_key: str, keys: list[str]
+) -> tuple[Optional[str | dict], list[Optional[str]]]:
+    """HGETALL one hash and MGET several plain keys in one round trip.
 
+    The hash slot may still hold a pre-HASH JSON string; that string is
+    returned as-is for the caller to decode.
+    """
+    r = _redis()
+    if r is not None:
+        try:
+            pipe = r.pipeline(transaction=False)
+            pipe.hgetall(hash_key)
+            pipe.mget(keys)
+            record, values = await pipe.execute(raise_on_error=False)
+            if isinstance(values, Exception):
+                raise values
+            if isinstance(record, ResponseError):   # WRONGTYPE: legacy string value
+                record = await r.get(hash_key)
+            elif isinstance(record, Exception):
+                raise record
+            return record or None, values
+        except Exception:
+            pass
+    return _mem_get(hash_key), [_mem_get(k) for k in keys]
 
-def _store_decr(key: str) -> int:
-    try:
-        from dpp_api.db.redis_client import get_redis
-        r = get_redis()
-        val = r.decr(key)
-        return max(0, int(val))
-    except Exception:
-        return _mem_decr(key)
+
+async def _store_set(key: str, value: str | bytes, ex: Optional[int] = None) -> None:
+    r = _redis()
+    if r is not None:
+        try:
+            if ex:
+                await r.setex(key, ex, value)
+            else:
+                await r.set(key, value)
+            return
+        except Exception:
+            pass
+    _mem_set(key, value, ex)
 
 
-def _store_delete(key: str) -> None:
+async def _store_set_hash(
+    key: str, mapping: dict[str, str | bytes], ex: Optional[int] = None
+) -> None:
+    """Replace key with a HASH of mapping (DEL + HSET + EXPIRE in one MULTI)."""
+    r = _redis()
+    if r is not None:
+        try:
+            pipe = r.pipeline()
+            pipe.delete(key)
+            pipe.hset(key, mapping=mapping)
+            if ex:
+                pipe.expire(key, ex)
+            await pipe.execute()
+            return
+        except Exception:
+            pass
+    _mem_set(key, dict(mapping), ex)
+
+
+async def _store_incr(key: str, ex: Optional[int] = None) -> int:
+    r = _redis()
+    if r is not None:
+        try:
+            val = await r.incr(key)
+            if ex and int(val) == 1:   # Set TTL only on first increment
+                await r.expire(key, ex)
+            return int(val)
+        except Exception:
+            pass
+    return _mem_incr(key, ex)
+
+
+async def _eval_script(r: Any, script: str, numkeys: int, *args: Any) -> Any:
+    """EVALSHA a cached script, falling back to EVAL if Redis lost it."""
+    sha = _script_shas.get(script)
+    if sha is None:
+        sha = _script_shas[script] = await r.script_load(script)
     try:
-        from dpp_api.db.redis_client import get_redis
-        get_redis().delete(key)
-    except Exception:
-        _mem_delete(key)
+        return await r.evalsha(sha, numkeys, *args)
+    except NoScriptError:
+        return await r.eval(script, numkeys, *args)
+
+
+async def _store_rate_check(key: str, now_ms: int, window_ms: int, limit: int) -> tuple[bool, int]:
+    """Sliding-window check-and-record. Returns (allowed, retry_after_ms)."""
+    r = _redis()
+    if r is not None:
+        try:
+            allowed, retry_ms = await _eval_script(
+                r, _RPM_LUA, 1, key, now_ms, window_ms, limit, f"{now_ms}-{os.urandom(8).hex()}"
+            )
+            return bool(allowed), int(retry_ms)
+        except Exception:
+            pass
+    return _mem_rate_check(key, now_ms, window_ms, limit)
+
+
+async def _store_poll_check(
+    last_key: str, count_key: str, now_ts: float,
+    min_interval_s: int, max_count: int, last_ex: int, count_ex: int,
+) -> tuple[bool, int, str]:
+    """Atomic poll gate: enforce interval and count, record the poll if allowed.
+
+    Returns (allowed, retry_after_s, reason) with reason "interval" or "count"
+    when blocked.
+    """
+    r = _redis()
+    if r is not None:
+        try:
+            allowed, retry_s, reason = await _eval_script(
+                r, _POLL_LUA, 2, last_key, count_key,
+                now_ts, min_interval_s, max_count, last_ex, count_ex,
+            )
+            return bool(allowed), int(retry_s), reason
+        except Exception:
+            pass
+    return _mem_poll_check(
+        last_key, count_key, now_ts, min_interval_s, max_count, last_ex, count_ex
+    )
+
+
+async def _store_decr(key: str) -> int:
+    r = _redis()
+    if r is not None:
+        try:
+            return max(0, int(await r.decr(key)))
+        except Exception:
+            pass
+    return _mem_decr(key)
+
+
+async def _store_delete(key: str) -> None:
+    r = _redis()
+    if r is not None:
+        try:
+            await r.delete(key)
+            return
+        except Exception:
+            pass
+    _mem_delete(key)
 
 
 # ─── Problem response helpers ─────────────────────────────────────────────────
 
+# Random base + pid + counter: unique per response without an os.urandom
+# read on every error. The pid keeps workers forked after import apart;
+# count() increments atomically under the GIL.
+_INSTANCE_BASE = f"urn:decisionproof:trace:{os.urandom(8).hex()}"
+_INSTANCE_CTR = itertools.count()
+
+
 def _make_instance() -> str:
     """RFC 9457 opaque instance URI — unique per response."""
-    return f"urn:decisionproof:trace:{uuid.uuid4()}"
+    return f"{_INSTANCE_BASE}-{os.getpid():x}-{next(_INSTANCE_CTR):x}"
 
 
-def _p401(detail: str) -> JSONResponse:
-    return create_problem_details_response(
-        type_uri="https://api.decisionproof.io.kr/problems/unauthorized",
-        title="Unauthorized",
-        status=401,
-        detail=detail,
-        instance=_make_instance(),
-    )
+# Problem bodies are constant apart from detail and instance: serialize each
+# once with placeholders, split around them, and splice per response.
+# Same bytes as create_problem_details_response() without violated policies.
+_PROBLEM_JSON_MEDIA = "application/problem+json"
+_DETAIL_MARK = orjson.dumps("__detail__")
+_INSTANCE_MARK = orjson.dumps("__instance__")
 
 
-def _p413() -> JSONResponse:
-    return create_problem_details_response(
-        type_uri="https://api.decisionproof.io.kr/problems/request-too-large",
-        title="Request Entity Too Large",
-        status=413,
-        detail=f"Request body exceeds {MAX_BODY_BYTES} bytes.",
-        instance=_make_instance(),
+def _problem_template(type_uri: str, title: str, status: int) -> tuple[int, bytes, bytes, bytes]:
+    body = orjson.dumps({
+        "type": type_uri,
+        "title": title,
+        "status": status,
+        "detail": "__detail__",
+        "instance": "__instance__",
+        "violated-policies": [],
+    })
+    head, rest = body.split(_DETAIL_MARK)
+    mid, tail = rest.split(_INSTANCE_MARK)
+    return status, head, mid, tail
+
+
+_P401 = _problem_template("https://api.decisionproof.io.kr/problems/unauthorized", "Unauthorized", 401)
+_P413 = _problem_template(
+    "https://api.decisionproof.io.kr/problems/request-too-large", "Request Entity Too Large", 413
+)
+_P422 = _problem_template(
+    "https://api.decisionproof.io.kr/problems/validation-error", "Unprocessable Entity", 422
+)
+_P429 = _problem_template(
+    "https://iana.org/assignments/http-problem-types#quota-exceeded", "Too Many Requests", 429
+)
+_P404 = _problem_template("https://api.decisionproof.io.kr/problems/not-found", "Not Found", 404)
+_P410 = _problem_template("https://api.decisionproof.io.kr/problems/gone", "Gone", 410)
+
+
+def _problem(
+    template: tuple[int, bytes, bytes, bytes], detail: str, headers: Optional[dict[str, str]] = None
+) -> Response:
+    status, head, mid, tail = template
+    return Response(
+        content=head + orjson.dumps(detail) + mid + orjson.dumps(_make_instance()) + tail,
+        status_code=status,
+        media_type=_PROBLEM_JSON_MEDIA,
+        headers=headers,
     )
 
 
-def _p422(detail: str) -> JSONResponse:
-    return create_problem_details_response(
-        type_uri="https://api.decisionproof.io.kr/problems/validation-error",
-        title="Unprocessable Entity",
-        status=422,
-        detail=detail,
-        instance=_make_instance(),
-    )
+def _p401(detail: str) -> Response:
+    return _problem(_P401, detail)
 
 
-def _p429(detail: str, retry_after: int) -> JSONResponse:
-    return create_problem_details_response(
-        type_uri="https://iana.org/assignments/http-problem-types#quota-exceeded",
-        title="Too Many Requests",
-        status=429,
-        detail=detail,
-        instance=_make_instance(),
-        headers={"Retry-After": str(retry_after)},
-    )
+def _p413() -> Response:
+    return _problem(_P413, f"Request body exceeds {MAX_BODY_BYTES} bytes.")
 
 
-def _p404(detail: str = "Run not found.") -> JSONResponse:
-    return create_problem_details_response(
-        type_uri="https://api.decisionproof.io.kr/problems/not-found",
-        title="Not Found",
-        status=404,
-        detail=detail,
-        instance=_make_instance(),
-    )
+def _p422(detail: str) -> Response:
+    return _problem(_P422, detail)
 
 
-def _p410(detail: str = "Run has expired and its data has been purged.") -> JSONResponse:
-    return create_problem_details_response(
-        type_uri="https://api.decisionproof.io.kr/problems/gone",
-        title="Gone",
-        status=410,
-        detail=detail,
-        instance=_make_instance(),
-    )
+def _p429(detail: str, retry_after: int) -> Response:
+    return _problem(_P429, detail, {"Retry-After": str(retry_after)})
+
+
+def _p404(detail: str = "Run not found.") -> Response:
+    return _problem(_P404, detail)
+
+
+def _p410(detail: str = "Run has expired and its data has been purged.") -> Response:
+    return _problem(_P410, detail)
 
 
 # ─── Auth dependency ───────────────────────────────────────────────────────────
 
-async def _verify_rapid_auth(request: Request) -> None:
-    """Validate X-RapidAPI-Proxy-Secret (required) and Authorization: Bearer (optional).
+@lru_cache(maxsize=8)
+def _secret_bytes(raw: str, strip: bool = False) -> bytes:
+    """Encoded form of a secret env value, cached per raw value.
+
+    Keyed on the raw string so a rotated env var takes effect on the next
+    request without a restart.
+    """
+    return (raw.strip() if strip else raw).encode()
+
+
+async def _auth_ctx(request: Request) -> tuple[str, str]:
+    """Authenticate a demo request and resolve its (plan, actor_key).
+
+    Each header is read once here and shared by the auth checks, plan
+    resolution and actor key derivation.
+
+    Validates X-RapidAPI-Proxy-Secret (required) and Authorization: Bearer (optional).
 
     FAIL-CLOSED: If RAPIDAPI_PROXY_SECRET is not configured, all demo
     requests are rejected with 503. This prevents silent bypass when the
@@ -323,7 +657,7 @@ async def _verify_rapid_auth(request: Request) -> None:
     - 직접 호출: Bearer 헤더 존재 시 검증, 틀리면 401
     - Bearer 헤더가 없으면 건너뜀 (RapidAPI 프로덕션 플로우)
     """
-    expected_proxy = os.getenv("RAPIDAPI_PROXY_SECRET", "").strip()
+    expected_proxy = _secret_bytes(os.getenv("RAPIDAPI_PROXY_SECRET", ""), strip=True)
     if not expected_proxy:
         # Server misconfiguration — fail closed, never bypass
         raise HTTPException(
@@ -331,16 +665,18 @@ async def _verify_rapid_auth(request: Request) -> None:
             detail="missing RAPIDAPI_PROXY_SECRET",
         )
 
-    proxy_secret = request.headers.get("X-RapidAPI-Proxy-Secret", "")
-    if not hmac.compare_digest(proxy_secret.encode(), expected_proxy.encode()):
+    headers = request.headers
+    proxy_secret = headers.get("X-RapidAPI-Proxy-Secret", "")
+    auth = headers.get("Authorization", "")
+
+    if not hmac.compare_digest(proxy_secret.encode(), expected_proxy):
         raise HTTPException(
             status_code=401,
             detail="Invalid or missing X-RapidAPI-Proxy-Secret",
         )
 
-    expected_token = os.getenv("DP_DEMO_SHARED_TOKEN", "")
+    expected_token = _secret_bytes(os.getenv("DP_DEMO_SHARED_TOKEN", ""))
     if expected_token:
-        auth = request.headers.get("Authorization", "")
         if auth:  # RapidAPI Runtime은 Bearer 없음 → 없으면 건너뜀
             if not auth.startswith("Bearer "):
                 raise HTTPException(
@@ -348,24 +684,33 @@ async def _verify_rapid_auth(request: Request) -> None:
                     detail="Invalid Authorization Bearer token format",
                 )
             token = auth[7:]
-            if not hmac.compare_digest(token.encode(), expected_token.encode()):
+            if not hmac.compare_digest(token.encode(), expected_token):
                 raise HTTPException(
                     status_code=401,
                     detail="Invalid Authorization Bearer token",
                 )
 
+    plan = _resolve_plan(headers.get("X-RapidAPI-Subscription", ""))
+    actor_key = _derive_actor_key(headers.get("X-RapidAPI-User", ""), auth)
+    return plan, actor_key
+
 
 # ─── Plan resolution ──────────────────────────────────────────────────────────
 
-def _resolve_plan(request: Request) -> str:
+def _resolve_plan(subscription: str) -> str:
     """Derive plan from X-RapidAPI-Subscription header. Default: BASIC."""
-    sub = request.headers.get("X-RapidAPI-Subscription", "").upper()
-    return "PRO" if sub == "PRO" else "BASIC"
+    return "PRO" if subscription.upper() == "PRO" else "BASIC"
 
 
 # ─── Actor key derivation (HMAC — no raw PII stored) ─────────────────────────
 
-def _derive_actor_key(request: Request) -> str:
+@lru_cache(maxsize=4)
+def _actor_hmac(salt: str) -> hmac.HMAC:
+    """Keyed HMAC-SHA256 state for a salt; callers .copy() it per request."""
+    return hmac.new(salt.encode("utf-8"), digestmod=hashlib.sha256)
+
+
+def _derive_actor_key(rapid_user: str, auth: str) -> str:
     """Derive stable, non-reversible actor key from request identity.
 
     Priority:
@@ -374,21 +719,26 @@ def _derive_actor_key(request: Request) -> str:
 
     Never stores raw user identifier. Only the HMAC output is used.
     """
-    rapid_user = request.headers.get("X-RapidAPI-User", "").strip()
+    rapid_user = rapid_user.strip()
     if rapid_user:
         identifier = rapid_user
     else:
-        auth = request.headers.get("Authorization", "")
         identifier = hashlib.sha256(auth.encode("utf-8")).hexdigest()
 
-    salt = os.getenv("DEMO_ACTOR_KEY_SALT", "demo-actor-v1").encode("utf-8")
-    return hmac.new(salt, identifier.encode("utf-8"), hashlib.sha256).hexdigest()
+    # The algorithm is part of the stored contract: actor keys persist as
+    # owner_key in runs and tombstones (up to 90 days), so a different hash
+    # would turn owners' 410s into 404s. Every worker must also agree, which
+    # rules out an optional faster hash with a fallback.
+    # Inner/outer pads are keyed once per salt; copy() skips re-keying
+    h = _actor_hmac(os.getenv("DEMO_ACTOR_KEY_SALT", "demo-actor-v1")).copy()
+    h.update(identifier.encode("utf-8"))
+    return h.hexdigest()
 
 
 # ─── S3 helper (optional — graceful fallback if unavailable) ─────────────────
 
-def _get_s3_for_demo():
-    """Get S3 client for demo result storage. Returns None if unavailable."""
+def _resolve_s3():
+    """Return the shared S3 client for demo results, or None if unavailable."""
     try:
         from dpp_api.storage.s3_client import get_s3_client
         return get_s3_client()
@@ -397,6 +747,16 @@ def _get_s3_for_demo():
         return None
 
 
+# Resolved once at import; boto3 client setup does no I/O. A missing bucket
+# or failed guardrail is configuration, so retrying per request cannot help.
+_S3 = _resolve_s3()
+
+
+def _get_s3_for_demo():
+    """Get S3 client for demo result storage. Returns None if unavailable."""
+    return _S3
+
+
 def _store_result_in_s3(
     run_id: str, result_bytes: bytes
 ) -> Optional[tuple[str, str]]:
@@ -411,7 +771,8 @@ def _store_result_in_s3(
         )
         return (s3.bucket, key)
     except Exception as e:
-        logger.warning("demo: S3 upload failed for %s: %s", sanitize_log_value(run_id), e)
+        if logger.isEnabledFor(logging.WARNING):   # Skip sanitizing when filtered out
+            logger.warning("demo: S3 upload failed for %s: %s", sanitize_log_value(run_id), e)
         return None
 
 
@@ -432,42 +793,88 @@ def _generate_presigned_url(
 
 # ─── Rate limit helpers ───────────────────────────────────────────────────────
 
-def _check_rpm(bucket_key: str, limit: int) -> Optional[int]:
-    """Check and increment a 60-second sliding window RPM bucket.
+async def _check_rpm(bucket_key: str, limit: int) -> Optional[int]:
+    """Check and record a hit in a 60-second sliding window RPM bucket.
 
     Returns None if allowed, or retry_after_seconds if blocked.
     """
-    count = _store_incr(bucket_key, ex=60)
-    if count > limit:
-        return 60   # Fixed: bucket resets in up to 60s
-    return None
+    allowed, retry_after_ms = await _store_rate_check(
+        bucket_key, int(time.time() * 1000), 60_000, limit
+    )
+    if allowed:
+        return None
+    return max(1, math.ceil(retry_after_ms / 1000))   # Until the oldest hit leaves the window
+
+
+# ─── Run record encoding (Redis HASH fields) ──────────────────────────────────
+
+_RUN_INT_FIELDS = ("inputs_len", "created_at_ts", "retention_until_ts")
+
+
+def _encode_run(run_data: dict) -> dict[str, str | bytes]:
+    """Flatten run_data into HASH fields (ints as text, inline result as JSON)."""
+    fields: dict[str, str | bytes] = {}
+    for name, value in run_data.items():
+        if name == "result_inline_json":
+            fields[name] = orjson.dumps(value)
+        elif isinstance(value, int):
+            fields[name] = str(value)
+        else:
+            fields[name] = value
+    return fields
+
+
+def _decode_run(record: str | bytes | dict) -> dict:
+    """Rebuild run_data from HASH fields, or from a legacy JSON string record.
+
+    Raises ValueError (orjson.JSONDecodeError included) on a corrupt record.
+    """
+    if not isinstance(record, dict):
+        return orjson.loads(record)
+    run_data = dict(record)
+    for name in _RUN_INT_FIELDS:
+        if name in run_data:
+            run_data[name] = int(run_data[name])
+    if "result_inline_json" in run_data:
+        run_data["result_inline_json"] = orjson.loads(run_data["result_inline_json"])
+    return run_data
 
 
 # ─── Zombie enforcement (applied on GET for active runs) ─────────────────────
 
-def _maybe_enforce_zombie(run_data: dict, actor_key: str) -> dict:
+def _run_ts(run_data: dict, field: str) -> float:
+    """Epoch seconds for a run_data timestamp.
+
+    Runs store "<field>_ts" alongside the ISO string; records written before
+    that fall back to parsing the ISO value.
+    """
+    ts = run_data.get(f"{field}_ts")
+    if ts is not None:
+        return ts
+    return datetime.fromisoformat(run_data[field]).timestamp()
+
+
+async def _maybe_enforce_zombie(run_data: dict, actor_key: str, now_ts: float) -> dict:
     """If run is active and past zombie timeout, transition to TIMEOUT."""
     if run_data.get("status") not in ("QUEUED", "PROCESSING"):
         return run_data
 
     limits = PLAN_LIMITS[run_data.get("plan", "BASIC")]
-    created_at = datetime.fromisoformat(run_data["created_at"])
-    age_s = (datetime.now(timezone.utc) - created_at).total_seconds()
+    age_s = now_ts - _run_ts(run_data, "created_at")
 
-    if age_s > limits["zombie_timeout_s"]:
+    if age_s > limits.zombie_timeout_s:
         run_data["status"] = "TIMEOUT"
-        _store_decr(_rk_active(run_data.get("actor_key", actor_key)))
+        await _store_decr(_rk_active(run_data.get("actor_key", actor_key)))
         run_id = run_data["run_id"]
-        retention_until = datetime.fromisoformat(run_data["retention_until"])
-        ttl = max(1, int((retention_until - datetime.now(timezone.utc)).total_seconds()))
-        _store_set(_rk_run(run_id), json.dumps(run_data), ex=ttl)
+        ttl = max(1, int(_run_ts(run_data, "retention_until") - now_ts))
+        await _store_set_hash(_rk_run(run_id), _encode_run(run_data), ex=ttl)
 
     return run_data
 
 
 # ─── Tombstone helpers ────────────────────────────────────────────────────────
 
-def _create_tombstone(run_id: str, owner_key: str) -> None:
+async def _create_tombstone(run_id: str, owner_key: str) -> None:
     """Store tombstone (no PII). Kept 90 days."""
     now = datetime.now(timezone.utc)
     tombstone = {
@@ -476,14 +883,17 @@ def _create_tombstone(run_id: str, owner_key: str) -> None:
         "expired_at": now.isoformat(),
         "tombstone_purge_at": (now + timedelta(days=90)).isoformat(),
     }
-    _store_set(_rk_tombstone(run_id), json.dumps(tombstone), ex=TOMBSTONE_TTL_S)
+    await _store_set(_rk_tombstone(run_id), orjson.dumps(tombstone), ex=TOMBSTONE_TTL_S)
 
 
 # ─── Router ───────────────────────────────────────────────────────────────────
 
-router = APIRouter(prefix="/v1/demo/runs", tags=["demo"])
-
-_PROBLEM_JSON_MEDIA = "application/problem+json"
+router = APIRouter(
+    prefix="/v1/demo/runs",
+    tags=["demo"],
+    on_startup=[_start_mem_sweeper],
+    on_shutdown=[_stop_mem_sweeper],
+)
 
 _401_RESPONSE = {
     "description": "Missing or invalid authentication credentials",
@@ -552,20 +962,19 @@ _429_RESPONSE = {
 )
 async def create_demo_run(
     request: Request,
-    _auth: None = Depends(_verify_rapid_auth),
-) -> JSONResponse:
+    ctx: tuple[str, str] = Depends(_auth_ctx),
+) -> Response:
     """POST /v1/demo/runs — Create a new demo decision run."""
 
     # ── Plan / actor ──────────────────────────────────────────────────────────
-    plan = _resolve_plan(request)
-    actor_key = _derive_actor_key(request)
+    plan, actor_key = ctx
     limits = PLAN_LIMITS[plan]
 
     # ── POST RPM rate limit ───────────────────────────────────────────────────
-    retry_after = _check_rpm(_rk_rate_post(actor_key), limits["post_rpm"])
+    retry_after = await _check_rpm(_rk_rate_post(actor_key), limits.post_rpm)
     if retry_after is not None:
         return _p429(
-            f"POST rate limit exceeded ({limits['post_rpm']}/min for {plan} plan)",
+            f"POST rate limit exceeded ({limits.post_rpm}/min for {plan} plan)",
             retry_after,
         )
 
@@ -576,8 +985,8 @@ async def create_demo_run(
 
     # ── JSON parse ────────────────────────────────────────────────────────────
     try:
-        raw = json.loads(body_bytes) if body_bytes else {}
-    except json.JSONDecodeError:
+        raw = orjson.loads(body_bytes) if body_bytes else {}
+    except orjson.JSONDecodeError:
         return _p422("Request body is not valid JSON.")
 
     # ── Pydantic validation (strict: extra='forbid') ───────────────────────────
@@ -590,36 +999,32 @@ async def create_demo_run(
         return _p422(f"Invalid field '{field}': {msg}")
 
     # ── Concurrency limit ─────────────────────────────────────────────────────
-    active_str = _store_get(_rk_active(actor_key))
+    active_str = await _store_get(_rk_active(actor_key))
     active_count = int(active_str) if active_str else 0
-    if active_count >= limits["max_active"]:
+    if active_count >= limits.max_active:
         return _p429(
-            f"Max concurrent active runs ({limits['max_active']}) reached for {plan} plan.",
+            f"Max concurrent active runs ({limits.max_active}) reached for {plan} plan.",
             retry_after=900,
         )
 
     # ── Generate run ──────────────────────────────────────────────────────────
-    run_id = f"demo_{uuid.uuid4().hex[:16]}"
+    run_id = "demo_" + os.urandom(8).hex()   # 64 bits, no UUID object
     now = datetime.now(timezone.utc)
     now_iso = now.isoformat()
-    retention_until = (now + timedelta(days=limits["retention_days"])).isoformat()
-    retention_ttl = limits["retention_days"] * 24 * 3600
+    retention_until = (now + timedelta(days=limits.retention_days)).isoformat()
+    retention_ttl = limits.retention_ttl_s
+    now_ts = int(now.timestamp())
 
     # Derive owner_key (same logic as actor_key but with a different context label)
     owner_key = actor_key  # For demo, owner = actor
 
-    # Hash inputs (no raw question stored)
-    question = req.inputs.question
-    inputs_hash = hashlib.sha256(question.encode("utf-8")).hexdigest()
-    inputs_len = len(question)
+    # Hash inputs (no raw question stored); inputs_len is the hashed byte count
+    question_bytes = req.inputs.question.encode("utf-8")
+    inputs_hash = hashlib.sha256(question_bytes).hexdigest()
+    inputs_len = len(question_bytes)
 
     # ── Build mock AI result (synchronous "processing" for demo) ──────────────
-    result_payload = dict(_MOCK_RESULT_BASE)
-    result_payload["generated_at"] = now_iso
-    result_payload["is_ai_generated"] = True
-    result_payload["disclaimer"] = AI_DISCLOSURE
-    result_bytes = json.dumps(result_payload, ensure_ascii=False).encode("utf-8")
-    result_sha256 = hashlib.sha256(result_bytes).hexdigest()
+    result_bytes, result_sha256 = _mock_result_bytes(now_iso)
 
     # Try S3 upload (optional — graceful fallback)
     s3_info = _store_result_in_s3(run_id, result_bytes)
@@ -630,21 +1035,25 @@ async def create_demo_run(
         "status": "COMPLETED",   # Immediate for demo (no real async worker)
         "plan": plan,
         "created_at": now_iso,
+        "created_at_ts": now_ts,
         "owner_key": owner_key,
         "actor_key": actor_key,
         "inputs_hash": inputs_hash,
         "inputs_len": inputs_len,
         "result_sha256": result_sha256,
         "retention_until": retention_until,
+        "retention_until_ts": now_ts + retention_ttl,
     }
     if s3_info:
         run_data["result_bucket"] = s3_info[0]
         run_data["result_key"] = s3_info[1]
     else:
         # Fallback: store result inline in Redis (≤ 8KiB)
-        run_data["result_inline_json"] = result_payload
+        run_data["result_inline_json"] = {
+            **_MOCK_RESULT_BASE, "generated_at": now_iso, **_MOCK_RESULT_OVERLAY,
+        }
 
-    _store_set(_rk_run(run_id), json.dumps(run_data), ex=retention_ttl)
+    await _store_set_hash(_rk_run(run_id), _encode_run(run_data), ex=retention_ttl)
 
     # No active slot consumed (run is immediately COMPLETED)
 
@@ -656,7 +1065,7 @@ async def create_demo_run(
         "poll_url": poll_url,
         "created_at": now_iso,
         "poll": {
-            "recommended_delay_ms": limits["poll_delay_ms"],
+            "recommended_delay_ms": limits.poll_delay_ms,
         },
         "meta": {
             "ai_generated": True,
@@ -665,9 +1074,10 @@ async def create_demo_run(
         },
     }
 
-    return JSONResponse(
+    return Response(
+        content=orjson.dumps(receipt),
         status_code=202,
-        content=receipt,
+        media_type="application/json",
         headers={
             "Cache-Control": "no-store",
             "X-DP-AI-Generated": "true",
@@ -704,81 +1114,79 @@ async def create_demo_run(
 async def get_demo_run(
     run_id: str,
     request: Request,
-    _auth: None = Depends(_verify_rapid_auth),
-) -> JSONResponse:
+    ctx: tuple[str, str] = Depends(_auth_ctx),
+) -> Response:
     """GET /v1/demo/runs/{run_id} — Poll demo run status."""
 
     # ── Plan / actor ──────────────────────────────────────────────────────────
-    plan = _resolve_plan(request)
-    actor_key = _derive_actor_key(request)
+    plan, actor_key = ctx
     limits = PLAN_LIMITS[plan]
 
     # ── GET RPM rate limit ────────────────────────────────────────────────────
-    retry_after = _check_rpm(_rk_rate_get(actor_key), limits["get_rpm"])
+    retry_after = await _check_rpm(_rk_rate_get(actor_key), limits.get_rpm)
     if retry_after is not None:
         return _p429(
-            f"GET rate limit exceeded ({limits['get_rpm']}/min for {plan} plan)",
+            f"GET rate limit exceeded ({limits.get_rpm}/min for {plan} plan)",
             retry_after,
         )
 
+    # ── Fetch tombstone and run in one round trip ─────────────────────────────
+    run_record, (tombstone_str,) = await _store_hgetall_mget(
+        _rk_run(run_id), [_rk_tombstone(run_id)]
+    )
+
     # ── Tombstone check (expiry / deletion) ───────────────────────────────────
-    tombstone_str = _store_get(_rk_tombstone(run_id))
     if tombstone_str:
         try:
-            tombstone = json.loads(tombstone_str)
+            tombstone = orjson.loads(tombstone_str)
             if tombstone.get("owner_key") == actor_key:
                 return _p410()
-        except (json.JSONDecodeError, KeyError):
+        except (orjson.JSONDecodeError, KeyError):
             pass
         return _p404()
 
     # ── Load run ──────────────────────────────────────────────────────────────
-    run_str = _store_get(_rk_run(run_id))
-    if not run_str:
+    if not run_record:
         return _p404()
 
     try:
-        run_data: dict = json.loads(run_str)
-    except json.JSONDecodeError:
-        logger.error("demo: corrupt run_data for %s", sanitize_log_value(run_id))
+        run_data = _decode_run(run_record)
+    except ValueError:
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error("demo: corrupt run_data for %s", sanitize_log_value(run_id))
         return _p404()
 
     # ── Retention / expiry check ──────────────────────────────────────────────
-    retention_until = datetime.fromisoformat(run_data["retention_until"])
-    if datetime.now(timezone.utc) > retention_until:
-        _create_tombstone(run_id, run_data.get("owner_key", ""))
-        _store_delete(_rk_run(run_id))
+    now_ts = time.time()
+    if now_ts > _run_ts(run_data, "retention_until"):
+        await _create_tombstone(run_id, run_data.get("owner_key", ""))
+        await _store_delete(_rk_run(run_id))
         if run_data.get("owner_key") == actor_key:
             return _p410()
         return _p404()
 
     # ── Zombie enforcement ────────────────────────────────────────────────────
-    run_data = _maybe_enforce_zombie(run_data, actor_key)
+    run_data = await _maybe_enforce_zombie(run_data, actor_key, now_ts)
 
     # ── Poll rate limiting (per actor+run_id) ─────────────────────────────────
-    now_ts = time.time()
-    last_poll_str = _store_get(_rk_poll_last(actor_key, run_id))
-    if last_poll_str is not None:
-        elapsed = now_ts - float(last_poll_str)
-        min_interval = limits["poll_min_interval_s"]
-        if elapsed < min_interval:
-            retry_after_s = math.ceil(min_interval - elapsed)
+    # Checked and recorded atomically; tracking only advances on a pass
+    allowed, retry_after_s, reason = await _store_poll_check(
+        _rk_poll_last(actor_key, run_id), _rk_poll_count(actor_key, run_id), now_ts,
+        limits.poll_min_interval_s, limits.poll_max_count,
+        TOMBSTONE_TTL_S, limits.retention_ttl_s,
+    )
+    if not allowed:
+        if reason == "interval":
             return _p429(
-                f"Polling too fast. Minimum interval: {min_interval}s for {plan} plan.",
+                f"Polling too fast. Minimum interval: {limits.poll_min_interval_s}s "
+                f"for {plan} plan.",
                 retry_after_s,
             )
-
-    poll_count = int(_store_get(_rk_poll_count(actor_key, run_id)) or "0")
-    if poll_count >= limits["poll_max_count"]:
         return _p429(
-            f"Maximum poll count ({limits['poll_max_count']}) reached for this run.",
+            f"Maximum poll count ({limits.poll_max_count}) reached for this run.",
             retry_after=900,
         )
 
-    # Update poll tracking (only on successful pass)
-    _store_set(_rk_poll_last(actor_key, run_id), str(now_ts), ex=TOMBSTONE_TTL_S)
-    _store_incr(_rk_poll_count(actor_key, run_id), ex=limits["retention_days"] * 86400)
-
     # ── Build response ────────────────────────────────────────────────────────
     status = run_data["status"]
     now_iso = datetime.now(timezone.utc).isoformat()
@@ -798,12 +1206,13 @@ async def get_demo_run(
     if status == "COMPLETED":
         # Build result_inline from stored data
         if "result_inline_json" in run_data:
-            result_inline = dict(run_data["result_inline_json"])
+            result_inline = {**run_data["result_inline_json"], **_MOCK_RESULT_OVERLAY}
         else:
-            result_inline = dict(_MOCK_RESULT_BASE)
-            result_inline["generated_at"] = run_data.get("created_at", now_iso)
-        result_inline["is_ai_generated"] = True
-        result_inline["disclaimer"] = AI_DISCLOSURE
+            result_inline = {
+                **_MOCK_RESULT_BASE,
+                "generated_at": run_data.get("created_at", now_iso),
+                **_MOCK_RESULT_OVERLAY,
+            }
 
         # Generate FRESH presigned URL (never stored, never reused)
         result_download: Optional[dict] = None
@@ -828,7 +1237,9 @@ async def get_demo_run(
         if result_download:
             content["result_download"] = result_download
 
-        return JSONResponse(status_code=200, content=content, headers=response_headers)
+        return Response(
+            orjson.dumps(content), media_type="application/json", headers=response_headers
+        )
 
     # Non-terminal: return current status with poll hints
     content = {
@@ -837,7 +1248,7 @@ async def get_demo_run(
         "created_at": run_data["created_at"],
         "meta": base_meta,
         "poll": {
-            "recommended_delay_ms": limits["poll_delay_ms"],
+            "recommended_delay_ms": limits.poll_delay_ms,
         },
     }
-    return JSONResponse(status_code=200, content=content, headers=response_headers)
+    return Response(orjson.dumps(content), media_type="application/json", headers=response_headers)
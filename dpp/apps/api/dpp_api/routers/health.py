@@ -4,141 +4,363 @@ Ops Hardening v2: Use centralized env helpers.
 """
 
 import asyncio
+import contextlib
 import logging
 import os
+import time
+from functools import lru_cache
+from typing import Awaitable, Callable, Literal
 
 import boto3
+from botocore.config import Config
 from fastapi import APIRouter, Response, status
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from redis.exceptions import ConnectionError as RedisConnectionError
 from sqlalchemy import text
 
 from dpp_api.billing.active_preflight import get_billing_preflight_status
 from dpp_api.config.env import get_s3_result_bucket, is_irsa_environment, is_localstack_endpoint
-from dpp_api.db.redis_client import RedisClient
+from dpp_api.db.redis_client import get_async_redis
 from dpp_api.db.session import engine
 
-router = APIRouter()
 logger = logging.getLogger(__name__)
 
+HEALTH_VERSION = "0.4.2.2"
+
+
+# Per-check verdict TTLs (seconds). Probes inside the window reuse the last
+# verdict, so dependency load is bounded by 1/TTL instead of the probe rate.
+# S3/SQS change rarely and their calls are the most expensive.
+CHECK_TTL_S = {"database": 2.0, "redis": 2.0, "s3": 5.0, "sqs": 5.0}
+
+# Hard per-check deadline: a hung dependency reads "down: timeout" instead of
+# stalling /readyz past the probe's own timeout. The worker thread cannot be
+# cancelled, so client-level timeouts below keep it from lingering.
+CHECK_TIMEOUT_S = 2.0
+
+# Verdicts are fixed strings: probe consumers never see exception text (it
+# goes to the log only), and the healthy path allocates nothing per probe.
+UP = "up"
+DOWN_TIMEOUT = "down: timeout"
+DOWN_CONFIG = "down: config error"
+DOWN_CONNECTION = "down: connection"
+DOWN_ERROR = "down: error"
+DOWN_STALE = "down: stale"
+
+
+def _down(service: str, e: BaseException) -> str:
+    """Log a failed check and map it to a fixed verdict."""
+    if isinstance(e, TimeoutError):
+        logger.error("%s health check timed out after %ss", service, CHECK_TIMEOUT_S)
+        return DOWN_TIMEOUT
+    logger.error("%s health check failed: %s", service, e)
+    if isinstance(e, ValueError):
+        # Config error (missing env var)
+        return DOWN_CONFIG
+    if isinstance(e, (ConnectionError, OSError, RedisConnectionError)):
+        return DOWN_CONNECTION
+    return DOWN_ERROR
+
+
+_check_cache: dict[str, tuple[float, str]] = {}
+_inflight: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Task]] = {}
+
+
+async def _single_flight(name: str, check: Callable[[], Awaitable[str]]) -> str:
+    """Join the in-flight run of check for name, or start one.
+
+    Concurrent probes and the background refresher share a single dependency
+    call. The run is shielded, so a disconnecting caller does not cancel it
+    for the others. Entries are keyed to their loop: a task left behind by
+    another (or a closed) loop is replaced, never awaited.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _inflight.get(name)
+    if entry is not None and entry[0] is loop:
+        task = entry[1]
+    else:
+        task = loop.create_task(check())
+        entry = (loop, task)
+        _inflight[name] = entry
+
+        def _done(_: asyncio.Task, entry=entry) -> None:
+            if _inflight.get(name) is entry:
+                del _inflight[name]
+
+        task.add_done_callback(_done)
+    return await asyncio.shield(task)
+
+
+async def _cached(name: str, check: Callable[[], Awaitable[str]]) -> str:
+    """Return the cached verdict for name, or run check (single-flight)."""
+    hit = _check_cache.get(name)
+    if hit is not None and time.monotonic() - hit[0] < CHECK_TTL_S[name]:
+        return hit[1]
+
+    result = await _single_flight(name, check)
+    _check_cache[name] = (time.monotonic(), result)
+    return result
+
+
+# S3/SQS are remote AWS calls: a background task refreshes them every
+# REFRESH_INTERVAL_S and /readyz only reads the snapshot, so probe rate never
+# turns into AWS call rate. Snapshots older than STALE_AFTER_S (refresher wedged
+# or dead) read "down: stale"; before the first refresh /readyz checks inline.
+REFRESH_INTERVAL_S = 5.0
+STALE_AFTER_S = 3 * REFRESH_INTERVAL_S
+
+_snapshot: dict[str, tuple[float, str]] = {}
+_refresher_task: asyncio.Task | None = None
+
+
+async def _probe(ping: Callable[[], None]) -> None:
+    """Run a blocking ping in a thread, bounded by CHECK_TIMEOUT_S."""
+    await asyncio.wait_for(asyncio.to_thread(ping), CHECK_TIMEOUT_S)
+
+
+# Declared fields (not dict[str, str]) let pydantic-core build a fixed-shape
+# serializer; frozen models can be shared safely.
+class LivenessServices(BaseModel):
+    """Services reported by /health."""
+
+    model_config = ConfigDict(frozen=True)
+
+    api: Literal["up"] = "up"
+
+
+class ReadinessServices(BaseModel):
+    """Services reported by /readyz."""
+
+    model_config = ConfigDict(frozen=True)
+
+    api: Literal["up"] = "up"
+    database: str
+    redis: str
+    s3: str
+    sqs: str
+    billing_secrets: str
+
 
 class HealthResponse(BaseModel):
     """Health check response model."""
 
-    status: str
+    model_config = ConfigDict(frozen=True)
+
+    status: Literal["healthy", "ready", "not_ready"]
     version: str
-    services: dict[str, str]
+    services: LivenessServices | ReadinessServices
+
+
+def _body(status_: str, services: LivenessServices | ReadinessServices) -> bytes:
+    return HealthResponse(
+        status=status_, version=HEALTH_VERSION, services=services
+    ).model_dump_json().encode()
+
+
+# Constant bodies for the common cases, serialized once at import instead of
+# building and validating a HealthResponse per probe.
+HEALTHY_BODY = _body("healthy", LivenessServices())
+
+_READY_BODIES = {
+    billing: _body(
+        "ready",
+        ReadinessServices(
+            database=UP, redis=UP, s3=UP, sqs=UP, billing_secrets=billing
+        ),
+    )
+    for billing in (UP, "skipped")
+}
+
+
+# P0 Hotfix: text() for SQLAlchemy 2.0 compatibility; built once, reused per probe
+_SELECT_1 = text("SELECT 1")
+
+
+def _ping_database() -> None:
+    # P1-J: Execute simple query to verify DB connection.
+    # The SELECT is still needed: under NullPool + Supabase pooler a successful
+    # connect only proves the pooler is up, not the database behind it.
+    # Round trips are bounded by CHECK_TTL_S["database"] via _cached().
+    with engine.connect() as conn:
+        conn.scalar(_SELECT_1)
 
 
-def check_database() -> str:
+async def check_database() -> str:
     """Check database connectivity.
 
     Returns:
-        str: "up" if healthy, error message otherwise
+        str: UP if healthy, a fixed DOWN_* verdict otherwise
     """
     try:
-        # P1-J: Execute simple query to verify DB connection
-        # P0 Hotfix: Use text() for SQLAlchemy 2.0 compatibility
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-        return "up"
+        await _probe(_ping_database)
+        return UP
     except Exception as e:
-        logger.error(f"Database health check failed: {e}")
-        return f"down: {str(e)[:50]}"
+        return _down("Database", e)
 
 
-def check_redis() -> str:
+async def _ping_redis() -> None:
+    # P1-J: PING Redis to verify connection.
+    # Native async client on the shared process-wide pool: no thread offload,
+    # and health_check_interval keeps pooled connections validated.
+    await get_async_redis().ping()
+
+
+async def check_redis() -> str:
     """Check Redis connectivity.
 
     Returns:
-        str: "up" if healthy, error message otherwise
+        str: UP if healthy, a fixed DOWN_* verdict otherwise
     """
     try:
-        # P1-J: PING Redis to verify connection
-        redis_client = RedisClient.get_client()
-        redis_client.ping()
-        return "up"
+        await asyncio.wait_for(_ping_redis(), CHECK_TIMEOUT_S)
+        return UP
     except Exception as e:
-        logger.error(f"Redis health check failed: {e}")
-        return f"down: {str(e)[:50]}"
+        return _down("Redis", e)
+
+
+def _ping_sqs() -> None:
+    from dpp_api.queue.sqs_client import get_sqs_client
+
+    sqs_client = get_sqs_client()
+    # P1: Use GetQueueAttributes on the configured queue URL (more specific check)
+    # This verifies both connectivity AND that the queue exists/is accessible
+    sqs_client.client.get_queue_attributes(
+        QueueUrl=sqs_client.queue_url,
+        AttributeNames=["ApproximateNumberOfMessages"]
+    )
 
 
-def check_sqs() -> str:
+async def check_sqs() -> str:
     """Check SQS connectivity.
 
     Ops Hardening v2 + P1: Use GetQueueAttributes on configured queue (more specific than list_queues).
 
     Returns:
-        str: "up" if healthy, error message otherwise
+        str: UP if healthy, a fixed DOWN_* verdict otherwise
     """
     try:
-        from dpp_api.queue.sqs_client import get_sqs_client
-
-        sqs_client = get_sqs_client()
-        # P1: Use GetQueueAttributes on the configured queue URL (more specific check)
-        # This verifies both connectivity AND that the queue exists/is accessible
-        sqs_client.client.get_queue_attributes(
-            QueueUrl=sqs_client.queue_url,
-            AttributeNames=["ApproximateNumberOfMessages"]
-        )
-        return "up"
-    except ValueError as e:
-        # Config error (missing env var)
-        logger.error(f"SQS config error: {e}")
-        return f"down: config error - {str(e)[:40]}"
+        await _probe(_ping_sqs)
+        return UP
     except Exception as e:
-        logger.error(f"SQS health check failed: {e}")
-        return f"down: {str(e)[:50]}"
+        return _down("SQS", e)
+
+
+@lru_cache(maxsize=1)
+def _s3_health_target():
+    """(boto3 S3 client, results bucket) for health checks, resolved once.
+
+    boto3.client() loads service models and builds an HTTPS session — far more
+    work than the head_bucket call it serves. Env is read here rather than per
+    probe; cache_clear() picks up changes (tests). A missing bucket raises
+    ValueError, which lru_cache does not memoize.
+    """
+    # Ops Hardening v2: Use centralized resolver (raises ValueError if missing)
+    results_bucket = get_s3_result_bucket()
+
+    # P0-2: Conditional endpoint_url and credentials
+    s3_endpoint = os.getenv("S3_ENDPOINT_URL")
+    s3_kwargs = {"region_name": os.getenv("AWS_REGION", "us-east-1")}
+
+    if s3_endpoint:
+        s3_kwargs["endpoint_url"] = s3_endpoint
+        # P1-1: Test credentials ONLY for LocalStack AND NOT in IRSA/production
+        if (
+            is_localstack_endpoint(s3_endpoint)
+            and not os.getenv("AWS_ACCESS_KEY_ID")
+            and not is_irsa_environment()
+        ):
+            s3_kwargs["aws_access_key_id"] = "test"
+            s3_kwargs["aws_secret_access_key"] = "test"
+
+    # Explicit credentials if provided
+    if os.getenv("AWS_ACCESS_KEY_ID"):
+        s3_kwargs["aws_access_key_id"] = os.getenv("AWS_ACCESS_KEY_ID")
+    if os.getenv("AWS_SECRET_ACCESS_KEY"):
+        s3_kwargs["aws_secret_access_key"] = os.getenv("AWS_SECRET_ACCESS_KEY")
+
+    # Fail fast: one attempt, short timeouts (the probe deadline is CHECK_TIMEOUT_S)
+    s3_kwargs["config"] = Config(
+        connect_timeout=1, read_timeout=1, retries={"max_attempts": 1}
+    )
+    return boto3.client("s3", **s3_kwargs), results_bucket
+
+
+def _ping_s3() -> None:
+    client, results_bucket = _s3_health_target()
+    # P1-1: head_bucket instead of list_buckets
+    client.head_bucket(Bucket=results_bucket)
 
 
-def check_s3() -> str:
+async def check_s3() -> str:
     """Check S3 connectivity.
 
     Ops Hardening v2: Use centralized bucket resolver (fail-fast if missing).
 
     Returns:
-        str: "up" if healthy, error message otherwise
+        str: UP if healthy, a fixed DOWN_* verdict otherwise
     """
     try:
-        # Ops Hardening v2: Use centralized resolver (raises ValueError if missing)
-        results_bucket = get_s3_result_bucket()
-
-        # P0-2: Conditional endpoint_url and credentials
-        s3_endpoint = os.getenv("S3_ENDPOINT_URL")
-        s3_kwargs = {"region_name": os.getenv("AWS_REGION", "us-east-1")}
-
-        if s3_endpoint:
-            s3_kwargs["endpoint_url"] = s3_endpoint
-            # P1-1: Test credentials ONLY for LocalStack AND NOT in IRSA/production
-            if (
-                is_localstack_endpoint(s3_endpoint)
-                and not os.getenv("AWS_ACCESS_KEY_ID")
-                and not is_irsa_environment()
-            ):
-                s3_kwargs["aws_access_key_id"] = "test"
-                s3_kwargs["aws_secret_access_key"] = "test"
-
-        # Explicit credentials if provided
-        if os.getenv("AWS_ACCESS_KEY_ID"):
-            s3_kwargs["aws_access_key_id"] = os.getenv("AWS_ACCESS_KEY_ID")
-        if os.getenv("AWS_SECRET_ACCESS_KEY"):
-            s3_kwargs["aws_secret_access_key"] = os.getenv("AWS_SECRET_ACCESS_KEY")
-
-        s3_client = boto3.client("s3", **s3_kwargs)
-
-        # P1-1: head_bucket instead of list_buckets
-        s3_client.head_bucket(Bucket=results_bucket)
-        return "up"
-    except ValueError as e:
-        # Config error (missing env var)
-        logger.error(f"S3 config error: {e}")
-        return f"down: config error - {str(e)[:40]}"
+        await _probe(_ping_s3)
+        return UP
     except Exception as e:
-        logger.error(f"S3 health check failed: {e}")
-        return f"down: {str(e)[:50]}"
+        return _down("S3", e)
+
+
+async def _refresh_snapshot() -> None:
+    """Run the background-owned checks once and publish their verdicts."""
+    s3_status, sqs_status = await asyncio.gather(
+        _single_flight("s3", check_s3), _single_flight("sqs", check_sqs)
+    )
+    now = time.monotonic()
+    _snapshot["s3"] = (now, s3_status)
+    _snapshot["sqs"] = (now, sqs_status)
+
+
+async def _refresher_loop() -> None:
+    while True:
+        try:
+            await _refresh_snapshot()
+        except Exception as e:
+            # Keep looping; the snapshot going stale surfaces the failure
+            logger.error(f"Health snapshot refresh failed: {e}")
+        await asyncio.sleep(REFRESH_INTERVAL_S)
+
+
+async def _start_refresher() -> None:
+    global _refresher_task
+    if _refresher_task is None:
+        _refresher_task = asyncio.get_running_loop().create_task(_refresher_loop())
+
+
+async def _stop_refresher() -> None:
+    global _refresher_task
+    task, _refresher_task = _refresher_task, None
+    if task is not None:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    # A later startup must not serve verdicts from before the shutdown
+    _snapshot.clear()
+
+
+async def _snapshot_status(name: str, check: Callable[[], Awaitable[str]]) -> str:
+    """Latest background verdict for name (inline check until the first refresh)."""
+    hit = _snapshot.get(name)
+    if hit is None:
+        return await _cached(name, check)
+    if time.monotonic() - hit[0] > STALE_AFTER_S:
+        return DOWN_STALE
+    return hit[1]
+
+
+router = APIRouter(
+    on_startup=[_start_refresher],
+    on_shutdown=[_stop_refresher],
+)
 
 
 @router.get("/health", response_model=HealthResponse)
-async def health_check() -> HealthResponse:
+async def health_check() -> Response:
     """
     Liveness and startup probe endpoint.
 
@@ -148,65 +370,63 @@ async def health_check() -> HealthResponse:
     when the app itself is healthy.
     Use /readyz for full dependency health (readiness probe only).
     """
-    return HealthResponse(
-        status="healthy",
-        version="0.4.2.2",
-        services={"api": "up"},
-    )
+    return Response(content=HEALTHY_BODY, media_type="application/json")
 
 
 @router.get("/readyz", response_model=HealthResponse)
-async def readiness_check(response: Response) -> HealthResponse:
+async def readiness_check() -> Response:
     """
     Readiness check endpoint (P1-J).
 
     Returns whether the service is ready to accept requests.
     Returns 503 if any dependency is down.
 
-    Sync check_* functions run in a thread pool via asyncio.to_thread so they
-    do not block the event loop. Without this, a 15s Redis timeout would freeze
-    the entire server for the duration of the probe.
+    The check_* coroutines run their blocking client calls in a thread pool via
+    asyncio.to_thread so they do not block the event loop. Without this, a 15s
+    Redis timeout would freeze the entire server for the duration of the probe.
     """
-    # P1-J: Check all critical dependencies concurrently, off the event loop
+    # P1-J: Check all critical dependencies concurrently, off the event loop.
+    # return_exceptions: one failing check never cancels the others.
+    # DB/Redis are checked inline (cheap, local); S3/SQS come from the snapshot.
     # P6.1: billing_secrets reads cached preflight result — NO network call
-    db_status, redis_status, s3_status, sqs_status = await asyncio.gather(
-        asyncio.to_thread(check_database),
-        asyncio.to_thread(check_redis),
-        asyncio.to_thread(check_s3),
-        asyncio.to_thread(check_sqs),
+    results = await asyncio.gather(
+        _cached("database", check_database),
+        _cached("redis", check_redis),
+        _snapshot_status("s3", check_s3),
+        _snapshot_status("sqs", check_sqs),
+        return_exceptions=True,
+    )
+    db_status, redis_status, s3_status, sqs_status = (
+        _down("Readiness", r) if isinstance(r, BaseException) else r for r in results
     )
 
     billing_cache = get_billing_preflight_status()
     if "status" in billing_cache and billing_cache["status"] == "skipped":
         billing_status = "skipped"
     elif all(v == "ok" for v in billing_cache.values()):
-        billing_status = "up"
+        billing_status = UP
     else:
         failed = [f"{k}:{v}" for k, v in billing_cache.items() if v != "ok"]
         billing_status = "down: " + ", ".join(failed)
 
-    services = {
-        "api": "up",
-        "database": db_status,
-        "redis": redis_status,
-        "s3": s3_status,
-        "sqs": sqs_status,
-        "billing_secrets": billing_status,
-    }
+    checks = (db_status, redis_status, s3_status, sqs_status, billing_status)
 
     # If any service is down, return 503
-    any_down = any("down" in svc_status for svc_status in services.values())
+    any_down = any("down" in svc_status for svc_status in checks)
 
     if any_down:
-        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
-        return HealthResponse(
-            status="not_ready",
-            version="0.4.2.2",
-            services=services,
+        services = ReadinessServices(
+            database=db_status,
+            redis=redis_status,
+            s3=s3_status,
+            sqs=sqs_status,
+            billing_secrets=billing_status,
+        )
+        return Response(
+            content=_body("not_ready", services),
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            media_type="application/json",
         )
 
-    return HealthResponse(
-        status="ready",
-        version="0.4.2.2",
-        services=services,
-    )
+    # All dependency checks are "up" here; only billing can vary
+    return Response(content=_READY_BODIES[billing_status], media_type="application/json")
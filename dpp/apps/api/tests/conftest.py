@@ -1,15 +1,18 @@
-"""Pytest configuration and fixtures."""
+"""Pytest configuration and fixtures.
 
-import sys
-from pathlib import Path
-# P0-3: Inject sys.path for reliable pytest imports
-sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # => .../apps/api
+P0-3: apps/api is put on sys.path by pytest itself (pythonpath in
+pyproject.toml), so dpp_api imports resolve without runtime path setup.
+"""
 
 import hashlib
+import math
 import os
+import time
 import uuid
+from typing import Any, Optional
 from unittest.mock import MagicMock, patch
 
+import orjson
 import pytest
 import redis
 from fastapi.testclient import TestClient
@@ -36,6 +39,14 @@ REDIS_TEST_HOST = "localhost"
 REDIS_TEST_PORT = 6379
 REDIS_TEST_DB = 15  # Use separate DB for tests
 
+# Demo auth credentials (set_demo_env + smoke_auth_headers)
+SMOKE_PROXY_SECRET = "smoke-proxy-secret-789xyz"
+SMOKE_BEARER_TOKEN = "smoke-bearer-token-012abc"
+DEMO_TEST_ENV = {
+    "RAPIDAPI_PROXY_SECRET": SMOKE_PROXY_SECRET,
+    "DP_DEMO_SHARED_TOKEN": SMOKE_BEARER_TOKEN,
+}
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_env_vars():
@@ -74,6 +85,50 @@ def setup_test_env_vars():
             os.environ[key] = original_value
 
 
+@pytest.fixture(scope="session", autouse=True)
+def set_demo_env():
+    """Set demo auth env vars once for the session (Fail-Closed compliance).
+
+    Uses os.environ directly since monkeypatch is function-scoped. Tests that
+    need the secret unset or different still override it with monkeypatch.
+    """
+    original_env = {key: os.environ.get(key) for key in DEMO_TEST_ENV}
+    os.environ.update(DEMO_TEST_ENV)
+    try:
+        yield
+    finally:
+        for key, original_value in original_env.items():
+            if original_value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = original_value
+
+
+@pytest.fixture(scope="session")
+def smoke_auth_headers() -> dict[str, str]:
+    """Demo auth headers matching set_demo_env."""
+    return {
+        "X-RapidAPI-Proxy-Secret": SMOKE_PROXY_SECRET,
+        "Authorization": f"Bearer {SMOKE_BEARER_TOKEN}",
+    }
+
+
+def jload(r) -> Any:
+    """Parse a response body with orjson (the app's own JSON library)."""
+    return orjson.loads(r.content)
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Shared TestClient (no DB, no Redis required).
+
+    Not entered as a context: app startup runs the billing preflight, which
+    fails closed without PayPal credentials. Modules that need a different
+    client (dependency overrides, per-test state) define their own.
+    """
+    return TestClient(app)
+
+
 @pytest.fixture(scope="function")
 def db_session() -> Session:
     """
@@ -273,3 +328,142 @@ def test_tenant_with_api_key(db_session: Session, basic_plan: Plan) -> tuple[str
     budget_scripts.set_balance(tenant_id, 10_000_000)  # $10.00
 
     return (tenant_id, api_key, key_hash)
+
+
+# ─── Demo router store fakes ──────────────────────────────────────────────────
+
+class FakeDemoStore:
+    """In-memory stand-ins for the demo router's _store_* helpers.
+
+    Values and expiry deadlines live in separate dicts: writes allocate no
+    (value, expire_at) tuples, and keys without a TTL never touch expiries.
+    INCR/DECR counters stay ints and are only stringified when read back.
+    clock is a logical clock that stands in for time.time() in the fakes and
+    in demo_runs, so elapsed time only passes when a test advances clock[0].
+    It is seeded from the wall clock so stored *_ts values stay comparable
+    with real dates.
+    """
+
+    def __init__(self) -> None:
+        self.values: dict[str, Any] = {}
+        self.counters: dict[str, int] = {}
+        self.expiries: dict[str, float] = {}
+        self.clock = [time.time()]
+
+    def clear(self) -> None:
+        self.values.clear()
+        self.counters.clear()
+        self.expiries.clear()
+
+    def _expire(self, key: str) -> None:
+        exp = self.expiries.get(key)
+        if exp is not None and self.clock[0] > exp:
+            self.delete(key)
+
+    def get(self, key: str) -> Optional[str]:
+        self._expire(key)
+        if key in self.counters:
+            return str(self.counters[key])
+        return self.values.get(key)
+
+    def set(self, key: str, value: Any, ex: Optional[int] = None) -> None:
+        self.counters.pop(key, None)
+        self.values[key] = value
+        if ex:
+            self.expiries[key] = self.clock[0] + ex
+        else:
+            self.expiries.pop(key, None)
+
+    def incr(self, key: str, ex: Optional[int] = None) -> int:
+        self._expire(key)
+        new_val = self.counters.get(key, 0) + 1
+        if new_val == 1 and ex:
+            self.expiries[key] = self.clock[0] + ex
+        self.counters[key] = new_val
+        return new_val
+
+    def decr(self, key: str) -> int:
+        new_val = max(0, self.counters.get(key, 0) - 1)
+        self.counters[key] = new_val
+        return new_val
+
+    def delete(self, key: str) -> None:
+        self.values.pop(key, None)
+        self.counters.pop(key, None)
+        self.expiries.pop(key, None)
+
+    def set_hash(self, key: str, mapping: dict, ex: Optional[int] = None) -> None:
+        # Redis (decode_responses=True) hands every field back as str
+        self.set(key, {
+            k: v.decode() if isinstance(v, bytes) else v for k, v in mapping.items()
+        }, ex)
+
+    def hgetall_mget(self, hash_key: str, keys: list[str]) -> tuple[Any, list[Optional[str]]]:
+        return self.get(hash_key), [self.get(k) for k in keys]
+
+    def poll_check(
+        self, last_key: str, count_key: str, now_ts: float,
+        min_interval_s: int, max_count: int, last_ex: int, count_ex: int,
+    ) -> tuple[bool, int, str]:
+        last = self.get(last_key)
+        if last is not None:
+            wait = min_interval_s - (now_ts - float(last))
+            if wait > 0:
+                return False, math.ceil(wait), "interval"
+        self._expire(count_key)
+        if self.counters.get(count_key, 0) >= max_count:
+            return False, 0, "count"
+        self.set(last_key, str(now_ts), last_ex)
+        self.incr(count_key, count_ex)
+        return True, 0, ""
+
+    def rate_check(self, key: str, now_ms: int, window_ms: int, limit: int) -> tuple[bool, int]:
+        hits = [t for t in self.values.get(key, ()) if t > now_ms - window_ms]
+        if len(hits) < limit:
+            self.values[key] = hits + [now_ms]
+            return True, 0
+        return False, hits[0] + window_ms - now_ms
+
+
+@pytest.fixture(scope="class")
+def demo_store_fakes():
+    """Install a FakeDemoStore over demo_runs' _store_* helpers for one class.
+
+    Class scope: entering and leaving the patch stack per test costs far
+    more than clearing the store, which per-test fixtures do instead.
+    demo_runs.time is swapped for one whose time() reads the store's clock.
+    """
+    import dpp_api.routers.demo_runs as demo_runs_mod
+
+    store = FakeDemoStore()
+    clock = store.clock
+
+    class _FrozenTime:
+        def time(self) -> float:
+            return clock[0]
+
+        def __getattr__(self, name: str) -> Any:
+            return getattr(time, name)
+
+    def as_async(fake):
+        # The real _store_* helpers are coroutines; install plain async
+        # functions rather than MagicMock wrappers on this hot path.
+        async def store_fn(*args, **kwargs):
+            return fake(*args, **kwargs)
+        return store_fn
+
+    with pytest.MonkeyPatch.context() as mp:
+        for name, fake in (
+            ("_store_get", store.get),
+            ("_store_set", store.set),
+            ("_store_incr", store.incr),
+            ("_store_decr", store.decr),
+            ("_store_delete", store.delete),
+            ("_store_set_hash", store.set_hash),
+            ("_store_hgetall_mget", store.hgetall_mget),
+            ("_store_poll_check", store.poll_check),
+            ("_store_rate_check", store.rate_check),
+        ):
+            mp.setattr(demo_runs_mod, name, as_async(fake))
+        mp.setattr(demo_runs_mod, "time", _FrozenTime())
+        yield store
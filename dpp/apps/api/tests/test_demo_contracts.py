@@ -18,27 +18,32 @@ All tests use monkeypatching to control:
   - S3 unavailable (graceful fallback)
 
 NOTE: After Fail-Closed (A1), RAPIDAPI_PROXY_SECRET MUST be set for any demo
-endpoint call to succeed. The mem_store fixture sets it automatically.
-Tests that test auth failures (401) explicitly use auth_env + wrong headers.
+endpoint call to succeed. The module-wide _auth_env fixture sets it once.
+Tests that test auth failures (401) keep the env set and send wrong headers.
 """
 
+import asyncio
 import json
-import sys
 import time
-from pathlib import Path
-from typing import Any, Optional
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
 
-sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+try:
+    import uvloop  # shipped with uvicorn[standard]
+except ImportError:
+    uvloop = None
+
 from dpp_api.main import app
 from dpp_api.schemas_demo import AI_DISCLOSURE
 import dpp_api.routers.demo_runs as demo_runs_mod
+from dpp_api.routers.demo_runs import _rk_run
+from .conftest import jload
 
 DEMO_BASE_URL = "https://api.decisionproof.io.kr"
-ALLOWED_PATHS = {"/v1/demo/runs", "/v1/demo/runs/{run_id}"}
+ALLOWED_PATHS = frozenset({"/v1/demo/runs", "/v1/demo/runs/{run_id}"})
 
 # Fixed test auth credentials
 TEST_PROXY_SECRET = "test-proxy-secret-abc123"
@@ -49,295 +54,277 @@ VALID_AUTH_HEADERS = {
     "X-RapidAPI-Proxy-Secret": TEST_PROXY_SECRET,
     "Authorization": f"Bearer {TEST_BEARER_TOKEN}",
 }
+_BASIC_HEADERS = {**VALID_AUTH_HEADERS, "X-RapidAPI-Subscription": "BASIC"}
+_PRO_HEADERS = {**VALID_AUTH_HEADERS, "X-RapidAPI-Subscription": "PRO"}
+
+# Retention boundaries for injected legacy runs (a day either side of import)
+_PAST_ISO = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+_FUTURE_ISO = (datetime.now(timezone.utc) + timedelta(days=1)).isoformat()
+
+# Shared request payloads (module constants; tests must not mutate them)
+VALID_BODY = {"inputs": {"question": "Should we approve the proposal?"}}
+_Q512 = {"inputs": {"question": "q" * 512}}
+_Q513 = {"inputs": {"question": "x" * 513}}
+# The happy-path POST, encoded once; client.send() replays the same bytes and
+# each send still mints a fresh run_id server-side.
+_VALID_POST_REQ = TestClient(app).build_request(
+    "POST", "/v1/demo/runs", json=VALID_BODY, headers=VALID_AUTH_HEADERS
+)
+_BIG_BODY = (
+    '{"inputs": {"question": "' + "q" * 512 + '"}, "padding": "' + "p" * 4000 + '"}'
+).encode()
+
+
+def _is_problem_json(r) -> bool:
+    ct = r.headers.get("content-type")
+    return ct is not None and "problem+json" in ct
+
+
+def _assert_problem(r, status: int) -> None:
+    """Assert an RFC 9457 problem response carrying the given status."""
+    assert r.status_code == status
+    assert jload(r)["status"] == status
+    assert _is_problem_json(r)
 
 
 # ─── Fixtures ─────────────────────────────────────────────────────────────────
 
-@pytest.fixture
+async def _app_without_lifespan(scope, receive, send):
+    """The app with startup/shutdown acknowledged but not run.
+
+    App startup runs the billing preflight, which fails closed without
+    PayPal credentials; none of these tests depend on it.
+    """
+    if scope["type"] != "lifespan":
+        await app(scope, receive, send)
+        return
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+@pytest.fixture(scope="module")
 def client():
-    return TestClient(app)
+    """One TestClient, entered once, for the whole module.
 
+    A bare TestClient starts a fresh portal (thread + event loop) per request;
+    entering it keeps one portal open. The portal loop is uvloop when
+    available; pytest-asyncio tests elsewhere keep the default loop policy.
+    """
+    backend_options = {"loop_factory": uvloop.new_event_loop} if uvloop else {}
+    with TestClient(_app_without_lifespan, backend_options=backend_options) as c:
+        yield c
 
-@pytest.fixture
-def mem_store(monkeypatch):
-    """Provide a clean in-memory dict as the demo store for each test.
 
-    Also sets RAPIDAPI_PROXY_SECRET and DP_DEMO_SHARED_TOKEN env vars so that
-    the Fail-Closed auth guard passes. Tests that test auth failures use
-    auth_env explicitly and send wrong headers — the env var being set is correct.
+@pytest.fixture(scope="module", autouse=True)
+def _auth_env():
+    """Fail-Closed auth env (RAPIDAPI_PROXY_SECRET, DP_DEMO_SHARED_TOKEN).
+
+    Every test needs the same fixed values, so they are set once per module
+    rather than installed and restored around each test.
     """
-    # Fail-Closed: must set RAPIDAPI_PROXY_SECRET for demo endpoints to respond
-    monkeypatch.setenv("RAPIDAPI_PROXY_SECRET", TEST_PROXY_SECRET)
-    monkeypatch.setenv("DP_DEMO_SHARED_TOKEN", TEST_BEARER_TOKEN)
-
-    store: dict[str, tuple[str, Optional[float]]] = {}
-
-    def fake_get(key: str) -> Optional[str]:
-        entry = store.get(key)
-        if entry is None:
-            return None
-        value, expire_at = entry
-        if expire_at and time.time() > expire_at:
-            del store[key]
-            return None
-        return value
-
-    def fake_set(key: str, value: str, ex: Optional[int] = None) -> None:
-        expire_at = time.time() + ex if ex else None
-        store[key] = (value, expire_at)
-
-    def fake_incr(key: str, ex: Optional[int] = None) -> int:
-        entry = store.get(key)
-        if entry is None or (entry[1] and time.time() > entry[1]):
-            new_val = 1
-            expire_at = time.time() + ex if ex else None
-        else:
-            new_val = int(entry[0]) + 1
-            expire_at = entry[1]
-        store[key] = (str(new_val), expire_at)
-        return new_val
-
-    def fake_decr(key: str) -> int:
-        entry = store.get(key)
-        current = int(entry[0]) if entry else 0
-        new_val = max(0, current - 1)
-        store[key] = (str(new_val), entry[1] if entry else None)
-        return new_val
-
-    def fake_delete(key: str) -> None:
-        store.pop(key, None)
-
-    with (
-        patch.object(demo_runs_mod, "_store_get", side_effect=fake_get),
-        patch.object(demo_runs_mod, "_store_set", side_effect=fake_set),
-        patch.object(demo_runs_mod, "_store_incr", side_effect=fake_incr),
-        patch.object(demo_runs_mod, "_store_decr", side_effect=fake_decr),
-        patch.object(demo_runs_mod, "_store_delete", side_effect=fake_delete),
-        # S3 unavailable in tests → graceful fallback (result_inline only)
-        patch.object(demo_runs_mod, "_store_result_in_s3", return_value=None),
-        patch.object(demo_runs_mod, "_generate_presigned_url", return_value=None),
-    ):
-        yield store
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("RAPIDAPI_PROXY_SECRET", TEST_PROXY_SECRET)
+        mp.setenv("DP_DEMO_SHARED_TOKEN", TEST_BEARER_TOKEN)
+        yield
 
 
-@pytest.fixture
-def auth_env(monkeypatch):
-    """Set auth env vars for tests that require auth enforcement."""
-    monkeypatch.setenv("RAPIDAPI_PROXY_SECRET", TEST_PROXY_SECRET)
-    monkeypatch.setenv("DP_DEMO_SHARED_TOKEN", TEST_BEARER_TOKEN)
+@pytest.fixture(scope="module", autouse=True)
+def _disable_s3():
+    """S3 unavailable in tests → graceful fallback (result_inline only).
+
+    Module scope, not session: the patch must not outlive this file.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(demo_runs_mod, "_store_result_in_s3", lambda *a, **kw: None)
+        mp.setattr(demo_runs_mod, "_generate_presigned_url", lambda *a, **kw: None)
+        yield
 
 
 @pytest.fixture
-def valid_headers():
-    """Headers that pass auth validation."""
-    return {
-        "X-RapidAPI-Proxy-Secret": TEST_PROXY_SECRET,
-        "Authorization": f"Bearer {TEST_BEARER_TOKEN}",
-        "X-RapidAPI-Subscription": "BASIC",
-    }
+def mem_store(demo_store_fakes):
+    """Provide a clean in-memory store for each test; returns the values dict."""
+    demo_store_fakes.clear()
+    return demo_store_fakes.values
 
 
 @pytest.fixture
-def valid_body():
-    return {"inputs": {"question": "Should we approve the proposal?"}}
+def clock(demo_store_fakes, mem_store) -> list[float]:
+    """The store's logical clock; advance clock[0] to simulate elapsed time."""
+    return demo_store_fakes.clock
 
 
 # ─── openapi-demo AC tests ────────────────────────────────────────────────────
 
+@pytest.fixture(scope="module")
+def openapi_demo_response(client):
+    """/.well-known/openapi-demo.json, fetched once for the AC assertions."""
+    return client.get("/.well-known/openapi-demo.json")
+
+
+@pytest.fixture(scope="module")
+def openapi_demo(openapi_demo_response):
+    return jload(openapi_demo_response)
+
+
+@pytest.fixture(scope="module")
+def openapi_demo_paths(openapi_demo):
+    return frozenset(openapi_demo["paths"])
+
+
 class TestOpenAPIDemoAC:
     """Acceptance criteria for /.well-known/openapi-demo.json."""
 
-    def test_ac1_status_200(self, client):
-        assert client.get("/.well-known/openapi-demo.json").status_code == 200
+    def test_ac1_status_200(self, openapi_demo_response):
+        assert openapi_demo_response.status_code == 200
 
-    def test_ac2_openapi_version(self, client):
-        data = client.get("/.well-known/openapi-demo.json").json()
-        assert data["openapi"] == "3.1.0"
+    def test_ac2_openapi_version(self, openapi_demo):
+        assert openapi_demo["openapi"] == "3.1.0"
 
-    def test_ac3_servers_length_is_1(self, client):
-        data = client.get("/.well-known/openapi-demo.json").json()
-        assert len(data["servers"]) == 1
+    def test_ac3_servers_length_is_1(self, openapi_demo):
+        assert len(openapi_demo["servers"]) == 1
 
-    def test_ac3_servers_url_locked(self, client):
-        data = client.get("/.well-known/openapi-demo.json").json()
-        assert data["servers"][0]["url"] == DEMO_BASE_URL
+    def test_ac3_servers_url_locked(self, openapi_demo):
+        assert openapi_demo["servers"][0]["url"] == DEMO_BASE_URL
 
-    def test_ac4_paths_exact_match(self, client):
-        data = client.get("/.well-known/openapi-demo.json").json()
-        actual = set(data["paths"].keys())
-        leaked = actual - ALLOWED_PATHS
-        missing = ALLOWED_PATHS - actual
+    def test_ac4_paths_exact_match(self, openapi_demo_paths):
+        leaked = openapi_demo_paths - ALLOWED_PATHS
+        missing = ALLOWED_PATHS - openapi_demo_paths
         assert not leaked, f"Leaked paths: {sorted(leaked)}"
         assert not missing, f"Missing paths: {sorted(missing)}"
 
-    def test_ac4b_no_extra_paths(self, client):
-        data = client.get("/.well-known/openapi-demo.json").json()
-        extra = set(data["paths"].keys()) - ALLOWED_PATHS
-        assert len(extra) == 0
+    def test_ac4b_no_extra_paths(self, openapi_demo_paths):
+        assert not (openapi_demo_paths - ALLOWED_PATHS)
 
-    def test_ac5_content_type_json(self, client):
-        r = client.get("/.well-known/openapi-demo.json")
-        assert "application/json" in r.headers.get("content-type", "")
+    def test_ac5_content_type_json(self, openapi_demo_response):
+        assert "application/json" in openapi_demo_response.headers.get("content-type", "")
 
-    def test_operation_id_post_fixed(self, client):
-        data = client.get("/.well-known/openapi-demo.json").json()
-        assert data["paths"]["/v1/demo/runs"]["post"]["operationId"] == "demo_run_create"
+    def test_operation_id_post_fixed(self, openapi_demo):
+        assert openapi_demo["paths"]["/v1/demo/runs"]["post"]["operationId"] == "demo_run_create"
 
-    def test_operation_id_get_fixed(self, client):
-        data = client.get("/.well-known/openapi-demo.json").json()
-        assert data["paths"]["/v1/demo/runs/{run_id}"]["get"]["operationId"] == "demo_run_get"
+    def test_operation_id_get_fixed(self, openapi_demo):
+        assert openapi_demo["paths"]["/v1/demo/runs/{run_id}"]["get"]["operationId"] == "demo_run_get"
 
-    def test_error_examples_401_problem_json(self, client):
-        data = client.get("/.well-known/openapi-demo.json").json()
-        post_resp = data["paths"]["/v1/demo/runs"]["post"]["responses"]
+    def test_error_examples_401_problem_json(self, openapi_demo):
+        post_resp = openapi_demo["paths"]["/v1/demo/runs"]["post"]["responses"]
         assert "401" in post_resp
-        assert "problem+json" in str(post_resp["401"])
+        assert "application/problem+json" in post_resp["401"].get("content", {})
 
-    def test_error_examples_422_exists(self, client):
-        data = client.get("/.well-known/openapi-demo.json").json()
-        post_resp = data["paths"]["/v1/demo/runs"]["post"]["responses"]
+    def test_error_examples_422_exists(self, openapi_demo):
+        post_resp = openapi_demo["paths"]["/v1/demo/runs"]["post"]["responses"]
         assert "422" in post_resp
 
-    def test_error_examples_429_problem_json(self, client):
-        data = client.get("/.well-known/openapi-demo.json").json()
-        post_resp = data["paths"]["/v1/demo/runs"]["post"]["responses"]
+    def test_error_examples_429_problem_json(self, openapi_demo):
+        post_resp = openapi_demo["paths"]["/v1/demo/runs"]["post"]["responses"]
         assert "429" in post_resp
-        assert "problem+json" in str(post_resp["429"])
+        assert "application/problem+json" in post_resp["429"].get("content", {})
+
+    def test_openapi_doc_is_cached(self, client):
+        """The locked spec is served from prebuilt bytes, not re-rendered."""
+        import dpp_api.main as main_mod
+        from fastapi.responses import JSONResponse
+
+        with patch.object(JSONResponse, "render", side_effect=AssertionError("re-rendered")):
+            r1 = client.get("/.well-known/openapi-demo.json")
+            r2 = client.get("/.well-known/openapi-demo.json")
+
+        assert r1.content == r2.content == main_mod._OPENAPI_DEMO_BODY
+        assert json.loads(r1.content) == main_mod._OPENAPI_DEMO_SPEC
 
-    def test_get_has_401_and_429(self, client):
-        data = client.get("/.well-known/openapi-demo.json").json()
-        get_resp = data["paths"]["/v1/demo/runs/{run_id}"]["get"]["responses"]
+    def test_get_has_401_and_429(self, openapi_demo):
+        get_resp = openapi_demo["paths"]["/v1/demo/runs/{run_id}"]["get"]["responses"]
         assert "401" in get_resp
         assert "429" in get_resp
 
 
 # ─── POST /v1/demo/runs contracts ─────────────────────────────────────────────
 
+@pytest.fixture
+def valid_post_response(client, mem_store):
+    """One happy-path POST shared by the receipt shape/header assertions."""
+    return client.send(_VALID_POST_REQ)
+
+
 class TestPostDemoRunsContracts:
     """Contract tests for POST /v1/demo/runs.
 
     All non-auth-failure tests send VALID_AUTH_HEADERS to pass Fail-Closed guard.
-    Auth-failure tests use auth_env (env var set) but send intentionally wrong headers.
+    Auth-failure tests keep the env set but send intentionally wrong headers.
     """
 
     # ── Happy path ────────────────────────────────────────────────────────────
 
-    def test_valid_request_returns_202(self, client, mem_store, valid_body):
-        r = client.post("/v1/demo/runs", json=valid_body, headers=VALID_AUTH_HEADERS)
-        assert r.status_code == 202
+    def test_valid_request_returns_202(self, valid_post_response):
+        assert valid_post_response.status_code == 202
 
-    def test_receipt_has_run_id(self, client, mem_store, valid_body):
-        r = client.post("/v1/demo/runs", json=valid_body, headers=VALID_AUTH_HEADERS)
-        data = r.json()
-        assert "run_id" in data
+    def test_receipt_body_shape(self, valid_post_response):
+        data = jload(valid_post_response)
         assert data["run_id"].startswith("demo_")
-
-    def test_receipt_has_poll_url(self, client, mem_store, valid_body):
-        r = client.post("/v1/demo/runs", json=valid_body, headers=VALID_AUTH_HEADERS)
-        data = r.json()
         assert "poll_url" in data
-
-    def test_receipt_has_created_at(self, client, mem_store, valid_body):
-        r = client.post("/v1/demo/runs", json=valid_body, headers=VALID_AUTH_HEADERS)
-        data = r.json()
         assert "created_at" in data
+        assert data["meta"]["ai_generated"] is True
+        assert data["meta"]["ai_disclosure"] == AI_DISCLOSURE
 
-    def test_receipt_has_poll_delay_basic(self, client, mem_store, valid_body):
+    def test_response_headers(self, valid_post_response):
+        headers = valid_post_response.headers
+        assert "no-store" in headers.get("Cache-Control", "")
+        assert headers.get("X-DP-AI-Generated") == "true"
+        assert AI_DISCLOSURE in headers.get("X-DP-AI-Disclosure", "")
+
+    def test_receipt_has_poll_delay_basic(self, client, mem_store):
         """BASIC plan → poll.recommended_delay_ms == 3000."""
         r = client.post(
             "/v1/demo/runs",
-            json=valid_body,
-            headers={**VALID_AUTH_HEADERS, "X-RapidAPI-Subscription": "BASIC"},
+            json=VALID_BODY,
+            headers=_BASIC_HEADERS,
         )
-        data = r.json()
+        data = jload(r)
         assert data["poll"]["recommended_delay_ms"] == 3000
 
-    def test_receipt_has_poll_delay_pro(self, client, mem_store, valid_body):
+    def test_receipt_has_poll_delay_pro(self, client, mem_store):
         """PRO plan → poll.recommended_delay_ms == 2000."""
         r = client.post(
             "/v1/demo/runs",
-            json=valid_body,
-            headers={**VALID_AUTH_HEADERS, "X-RapidAPI-Subscription": "PRO"},
+            json=VALID_BODY,
+            headers=_PRO_HEADERS,
         )
-        data = r.json()
+        data = jload(r)
         assert data["poll"]["recommended_delay_ms"] == 2000
 
-    def test_receipt_ai_meta(self, client, mem_store, valid_body):
-        r = client.post("/v1/demo/runs", json=valid_body, headers=VALID_AUTH_HEADERS)
-        data = r.json()
-        assert data["meta"]["ai_generated"] is True
-        assert data["meta"]["ai_disclosure"] == AI_DISCLOSURE
-
-    def test_response_header_no_store(self, client, mem_store, valid_body):
-        r = client.post("/v1/demo/runs", json=valid_body, headers=VALID_AUTH_HEADERS)
-        assert "no-store" in r.headers.get("Cache-Control", "")
-
-    def test_response_header_ai_generated(self, client, mem_store, valid_body):
-        r = client.post("/v1/demo/runs", json=valid_body, headers=VALID_AUTH_HEADERS)
-        assert r.headers.get("X-DP-AI-Generated") == "true"
-
-    def test_response_header_ai_disclosure(self, client, mem_store, valid_body):
-        r = client.post("/v1/demo/runs", json=valid_body, headers=VALID_AUTH_HEADERS)
-        assert AI_DISCLOSURE in r.headers.get("X-DP-AI-Disclosure", "")
-
     # ── Validation errors ─────────────────────────────────────────────────────
 
-    def test_extra_top_level_key_returns_422(self, client, mem_store):
-        """Extra key at top level → 422 problem+json."""
-        r = client.post(
-            "/v1/demo/runs",
-            json={
-                "inputs": {"question": "Valid question"},
-                "evil_extra_key": "injected",
-            },
-            headers=VALID_AUTH_HEADERS,
-        )
-        assert r.status_code == 422
-        data = r.json()
-        assert data["status"] == 422
-        assert "problem+json" in r.headers.get("content-type", "")
-
-    def test_extra_nested_key_in_inputs_returns_422(self, client, mem_store):
-        """Extra key inside inputs → 422 problem+json."""
-        r = client.post(
-            "/v1/demo/runs",
-            json={"inputs": {"question": "q", "injected": "bad"}},
-            headers=VALID_AUTH_HEADERS,
-        )
-        assert r.status_code == 422
-        assert r.json()["status"] == 422
-        assert "problem+json" in r.headers.get("content-type", "")
-
-    def test_extra_key_in_reservation_returns_422(self, client, mem_store):
-        """Extra key inside reservation → 422."""
-        r = client.post(
-            "/v1/demo/runs",
-            json={
-                "inputs": {"question": "valid"},
-                "reservation": {"unauthorized_field": "value"},
-            },
-            headers=VALID_AUTH_HEADERS,
-        )
-        assert r.status_code == 422
-        assert "problem+json" in r.headers.get("content-type", "")
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"inputs": {"question": "Valid question"}, "evil_extra_key": "injected"},
+            {"inputs": {"question": "q", "injected": "bad"}},
+            {"inputs": {"question": "valid"}, "reservation": {"unauthorized_field": "value"}},
+        ],
+        ids=["top_level", "nested_in_inputs", "in_reservation"],
+    )
+    def test_extra_key_returns_422(self, client, mem_store, payload):
+        """Extra key anywhere in the body → 422 problem+json."""
+        r = client.post("/v1/demo/runs", json=payload, headers=VALID_AUTH_HEADERS)
+        _assert_problem(r, 422)
 
     def test_question_too_long_returns_422(self, client, mem_store):
         """question > 512 chars → 422 problem+json."""
         r = client.post(
             "/v1/demo/runs",
-            json={"inputs": {"question": "x" * 513}},
+            json=_Q513,
             headers=VALID_AUTH_HEADERS,
         )
-        assert r.status_code == 422
-        data = r.json()
-        assert data["status"] == 422
-        assert "problem+json" in r.headers.get("content-type", "")
+        _assert_problem(r, 422)
 
     def test_question_exactly_512_chars_ok(self, client, mem_store):
         """question == 512 chars → 202 (boundary check)."""
         r = client.post(
             "/v1/demo/runs",
-            json={"inputs": {"question": "q" * 512}},
+            json=_Q512,
             headers=VALID_AUTH_HEADERS,
         )
         assert r.status_code == 202
@@ -362,49 +349,25 @@ class TestPostDemoRunsContracts:
 
     # ── Auth enforcement ──────────────────────────────────────────────────────
 
-    def test_invalid_proxy_secret_returns_401(
-        self, client, mem_store, auth_env, valid_body
-    ):
-        """Wrong X-RapidAPI-Proxy-Secret → 401 problem+json."""
-        r = client.post(
-            "/v1/demo/runs",
-            json=valid_body,
-            headers={
+    @pytest.mark.parametrize(
+        "headers",
+        [
+            {
                 "X-RapidAPI-Proxy-Secret": "wrong-secret",
                 "Authorization": f"Bearer {TEST_BEARER_TOKEN}",
             },
-        )
-        assert r.status_code == 401
-        data = r.json()
-        assert data["status"] == 401
-        assert "problem+json" in r.headers.get("content-type", "")
-
-    def test_missing_proxy_secret_returns_401(
-        self, client, mem_store, auth_env, valid_body
-    ):
-        """No X-RapidAPI-Proxy-Secret → 401."""
-        r = client.post(
-            "/v1/demo/runs",
-            json=valid_body,
-            headers={"Authorization": f"Bearer {TEST_BEARER_TOKEN}"},
-        )
-        assert r.status_code == 401
-        assert "problem+json" in r.headers.get("content-type", "")
-
-    def test_invalid_bearer_token_returns_401(
-        self, client, mem_store, auth_env, valid_body
-    ):
-        """Wrong Bearer token → 401 problem+json."""
-        r = client.post(
-            "/v1/demo/runs",
-            json=valid_body,
-            headers={
+            {"Authorization": f"Bearer {TEST_BEARER_TOKEN}"},
+            {
                 "X-RapidAPI-Proxy-Secret": TEST_PROXY_SECRET,
                 "Authorization": "Bearer wrong-token",
             },
-        )
-        assert r.status_code == 401
-        assert r.json()["status"] == 401
+        ],
+        ids=["invalid_proxy_secret", "missing_proxy_secret", "invalid_bearer_token"],
+    )
+    def test_bad_auth_returns_401(self, client, mem_store, headers):
+        """Wrong or missing proxy secret / Bearer token → 401 problem+json."""
+        r = client.post("/v1/demo/runs", json=VALID_BODY, headers=headers)
+        _assert_problem(r, 401)
 
     # ── Body size enforcement ─────────────────────────────────────────────────
 
@@ -414,11 +377,10 @@ class TestPostDemoRunsContracts:
         Auth runs first (Depends), then body size guard. After Fail-Closed,
         we must include valid auth headers so the 413 guard is reached.
         """
-        big_body = '{"inputs": {"question": "' + "q" * 512 + '"}, "padding": "' + "p" * 4000 + '"}'
-        assert len(big_body.encode()) > 4096, "Test setup error: body must exceed 4096 bytes"
+        assert len(_BIG_BODY) > 4096, "Test setup error: body must exceed 4096 bytes"
         r = client.post(
             "/v1/demo/runs",
-            content=big_body.encode(),
+            content=_BIG_BODY,
             headers={
                 "Content-Type": "application/json",
                 **VALID_AUTH_HEADERS,
@@ -426,88 +388,357 @@ class TestPostDemoRunsContracts:
         )
         # Body size check (> 4096) fires before Pydantic → must be 413
         assert r.status_code == 413, (
-            f"Expected 413 for {len(big_body)}-byte body, got {r.status_code}: {r.text}"
+            f"Expected 413 for {len(_BIG_BODY)}-byte body, got {r.status_code}: {r.text}"
         )
-        data = r.json()
-        assert data["status"] == 413
-        assert "problem+json" in r.headers.get("content-type", "")
+        _assert_problem(r, 413)
+
+    # ── POST rate limiting (sliding window) ───────────────────────────────────
+
+    def test_post_over_rpm_returns_429(self, client, mem_store):
+        """7th POST within a minute (BASIC: 6/min) → 429 with Retry-After <= 60."""
+        for _ in range(6):
+            with patch.object(demo_runs_mod, "_store_get", return_value=None):
+                assert client.send(_VALID_POST_REQ).status_code == 202
+
+        r = client.send(_VALID_POST_REQ)
+        assert r.status_code == 429
+        assert 1 <= int(r.headers["Retry-After"]) <= 60
+
+    def test_mem_rate_check_is_rolling(self):
+        """In-memory fallback frees capacity as old hits leave the window."""
+        key = demo_runs_mod._rk_rate_post("test_rolling")
+        demo_runs_mod._mem_delete(key)
+
+        for i in range(3):
+            assert demo_runs_mod._mem_rate_check(key, 1_000 + i * 1_000, 60_000, 3) == (True, 0)
+
+        # Window full until the first hit (t=1000) expires at t=61000
+        assert demo_runs_mod._mem_rate_check(key, 60_000, 60_000, 3) == (False, 1_000)
+        assert demo_runs_mod._mem_rate_check(key, 61_001, 60_000, 3) == (True, 0)
+        demo_runs_mod._mem_delete(key)
+
+
+# ─── Storage fallback ─────────────────────────────────────────────────────────
+
+class TestStoreFallback:
+    """Redis handle is resolved per event loop; failures fall back to the in-memory store."""
+
+    async def test_connection_error_falls_back_to_memory(self):
+        from unittest.mock import AsyncMock, Mock
+        from redis.exceptions import ConnectionError as RedisConnectionError
+
+        broken = Mock()
+        broken.get = AsyncMock(side_effect=RedisConnectionError("down"))
+        demo_runs_mod._mem_set("demo:test:fallback", "v", ex=60)
+
+        with patch.object(demo_runs_mod, "_redis", return_value=broken):
+            assert await demo_runs_mod._store_get("demo:test:fallback") == "v"
+            # Each call retries Redis before falling back
+            assert await demo_runs_mod._store_get("demo:test:fallback") == "v"
+            assert broken.get.call_count == 2
+
+        demo_runs_mod._mem_delete("demo:test:fallback")
+
+    async def test_rate_check_ignores_legacy_incr_keys(self):
+        """A previous-release INCR string under the old key name must not
+        push the check onto the per-process in-memory fallback."""
+        from unittest.mock import AsyncMock, Mock
+        from redis.exceptions import ResponseError
+
+        legacy = {"demo:rate:post:actor_legacy": "5", "demo:rate:get:actor_legacy": "5"}
+
+        async def evalsha(sha, numkeys, key, *args):
+            if key in legacy:
+                raise ResponseError(
+                    "WRONGTYPE Operation against a key holding the wrong kind of value"
+                )
+            return [1, 0]
+
+        redis_mock = Mock()
+        redis_mock.script_load = AsyncMock(return_value="rpm_sha")
+        redis_mock.evalsha = AsyncMock(side_effect=evalsha)
+
+        with (
+            patch.dict(demo_runs_mod._script_shas),
+            patch.object(demo_runs_mod, "_redis", return_value=redis_mock),
+            patch.object(demo_runs_mod, "_mem_rate_check", side_effect=AssertionError),
+        ):
+            assert await demo_runs_mod._check_rpm(
+                demo_runs_mod._rk_rate_post("actor_legacy"), 6
+            ) is None
+            assert await demo_runs_mod._check_rpm(
+                demo_runs_mod._rk_rate_get("actor_legacy"), 60
+            ) is None
+
+        assert redis_mock.evalsha.await_count == 2
+
+    async def test_hgetall_mget_reads_legacy_string_run(self):
+        """A pre-HASH JSON string run (WRONGTYPE on HGETALL) is fetched with GET."""
+        from unittest.mock import AsyncMock, Mock
+        from redis.exceptions import ResponseError
+
+        legacy = '{"run_id": "demo_legacy"}'
+        redis_mock = Mock()
+        redis_mock.pipeline.return_value.execute = AsyncMock(return_value=[
+            ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value"),
+            [None, "1"],
+        ])
+        redis_mock.get = AsyncMock(return_value=legacy)
+
+        with patch.object(demo_runs_mod, "_redis", return_value=redis_mock):
+            record, values = await demo_runs_mod._store_hgetall_mget("demo:run:x", ["a", "b"])
+
+        assert record == legacy
+        assert values == [None, "1"]
+        redis_mock.get.assert_called_once_with("demo:run:x")
+
+    def test_redis_client_is_bound_per_event_loop(self):
+        """Each loop gets its own client; a closed loop's client is dropped."""
+        from dpp_api.db.redis_client import AsyncRedisClient
+
+        async def resolve():
+            first = demo_runs_mod._redis()
+            assert demo_runs_mod._redis() is first
+            return first
+
+        loop_a, loop_b = asyncio.new_event_loop(), asyncio.new_event_loop()
+        try:
+            client_a = loop_a.run_until_complete(resolve())
+            client_b = loop_b.run_until_complete(resolve())
+            assert client_a is not None and client_b is not None
+            assert client_a is not client_b
+            assert client_a.connection_pool is not client_b.connection_pool
+
+            loop_a.close()
+            loop_b.run_until_complete(AsyncRedisClient.reset())
+            assert loop_b.run_until_complete(resolve()) is not client_b
+            assert loop_a not in AsyncRedisClient._instances
+        finally:
+            loop_a.close()
+            loop_b.run_until_complete(AsyncRedisClient.reset())
+            loop_b.close()
+
+        # Outside a running loop there is no client to hand out
+        assert demo_runs_mod._redis() is None
+
+    def test_mem_poll_check_interval_then_count(self):
+        last_key, count_key = "demo:test:poll:last", "demo:test:poll:count"
+        check = demo_runs_mod._mem_poll_check
+
+        assert check(last_key, count_key, 1000.0, 3, 2, 60, 60) == (True, 0, "")
+        assert check(last_key, count_key, 1001.5, 3, 2, 60, 60) == (False, 2, "interval")
+        assert check(last_key, count_key, 1003.0, 3, 2, 60, 60) == (True, 0, "")
+        # Count exhausted; a blocked poll records nothing
+        assert check(last_key, count_key, 1010.0, 3, 2, 60, 60) == (False, 0, "count")
+        assert demo_runs_mod._mem_get(last_key) == "1003.0"
+        assert demo_runs_mod._mem_get(count_key) == "2"
+
+        demo_runs_mod._mem_delete(last_key)
+        demo_runs_mod._mem_delete(count_key)
+
+    def test_sharded_mem_incr_is_atomic_per_key(self):
+        import threading
+
+        keys = [f"demo:test:shard:{i}" for i in range(4)]
+
+        def worker():
+            for _ in range(200):
+                for k in keys:
+                    demo_runs_mod._mem_incr(k, ex=60)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert [demo_runs_mod._mem_get(k) for k in keys] == ["1600"] * 4
+        for k in keys:
+            demo_runs_mod._mem_delete(k)
+
+    def test_clean_expired_pops_due_entries_only(self):
+        now = time.monotonic()
+        demo_runs_mod._mem_set("demo:test:sweep:short", "a", ex=1)
+        demo_runs_mod._mem_set("demo:test:sweep:long", "b", ex=3600)
+
+        demo_runs_mod._mem_clean_expired(now=now + 2)
+
+        short_shard, _ = demo_runs_mod._shard("demo:test:sweep:short")
+        assert "demo:test:sweep:short" not in short_shard
+        assert demo_runs_mod._mem_get("demo:test:sweep:long") == "b"
+        demo_runs_mod._mem_delete("demo:test:sweep:long")
+
+
+# ─── Actor key derivation ─────────────────────────────────────────────────────
+
+class TestActorKey:
+    """Cached HMAC state must produce the same keys as a fresh hmac.new()."""
+
+    def test_actor_key_matches_hmac_sha256(self, monkeypatch):
+        import hashlib
+        import hmac
+
+        for salt in ("salt-one", "salt-two"):
+            monkeypatch.setenv("DEMO_ACTOR_KEY_SALT", salt)
+
+            expected = hmac.new(
+                salt.encode("utf-8"), b"rapid-user-42", hashlib.sha256
+            ).hexdigest()
+            assert demo_runs_mod._derive_actor_key("rapid-user-42", "") == expected
+            # Second call reuses the cached keyed state
+            assert demo_runs_mod._derive_actor_key("rapid-user-42", "") == expected
+
+
+# ─── Mock result serialization ────────────────────────────────────────────────
+
+class TestMockResultBytes:
+    """Precomputed mock result bytes must match a full per-run encode."""
+
+    def test_bytes_and_sha256_match_full_encode(self):
+        import hashlib
+
+        ts = "2026-02-14T09:30:00.123456+00:00"
+        payload = dict(demo_runs_mod._MOCK_RESULT_BASE)
+        payload["generated_at"] = ts
+        payload["is_ai_generated"] = True
+        payload["disclaimer"] = AI_DISCLOSURE
+        expected = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+        result_bytes, sha = demo_runs_mod._mock_result_bytes(ts)
+
+        assert result_bytes == expected
+        assert sha == hashlib.sha256(expected).hexdigest()
+
+
+# ─── Problem body templates ───────────────────────────────────────────────────
+
+class TestProblemTemplates:
+    """Spliced problem bodies must match create_problem_details_response."""
+
+    def test_p429_matches_create_problem_details_response(self):
+        from dpp_api.pricing.problem_details import create_problem_details_response
+
+        detail = 'Quote " and backslash \\ and 한글'
+        with patch.object(demo_runs_mod, "_make_instance", return_value="urn:decisionproof:trace:x"):
+            r = demo_runs_mod._p429(detail, retry_after=7)
+
+        expected = create_problem_details_response(
+            type_uri="https://iana.org/assignments/http-problem-types#quota-exceeded",
+            title="Too Many Requests",
+            status=429,
+            detail=detail,
+            instance="urn:decisionproof:trace:x",
+        )
+        assert r.body == expected.body
+        assert r.status_code == 429
+        assert r.headers["retry-after"] == "7"
+        assert r.headers["content-type"] == "application/problem+json"
+
+    def test_instance_is_unique_per_response(self):
+        instances = {demo_runs_mod._make_instance() for _ in range(1000)}
+        assert len(instances) == 1000
+        assert all(i.startswith("urn:decisionproof:trace:") for i in instances)
+
+
+# ─── Run record encoding ──────────────────────────────────────────────────────
+
+class TestRunRecordEncoding:
+    """run_data is stored as HASH fields and decoded back losslessly."""
+
+    def test_encode_decode_round_trip(self):
+        run_data = {
+            "run_id": "demo_0123456789abcdef",
+            "status": "COMPLETED",
+            "inputs_len": 12,
+            "created_at_ts": 1771061400,
+            "retention_until_ts": 1771666200,
+            "result_inline_json": {"summary": "s", "factors": [{"name": "a"}]},
+        }
+        fields = demo_runs_mod._encode_run(run_data)
+        assert fields["inputs_len"] == "12"
+        assert isinstance(fields["result_inline_json"], bytes)
+
+        # Redis returns every field as str
+        as_read = {k: v.decode() if isinstance(v, bytes) else v for k, v in fields.items()}
+        assert demo_runs_mod._decode_run(as_read) == run_data
+
+    def test_decode_legacy_json_string(self):
+        legacy = json.dumps({"run_id": "demo_legacy", "status": "COMPLETED"})
+        assert demo_runs_mod._decode_run(legacy)["run_id"] == "demo_legacy"
 
 
 # ─── GET /v1/demo/runs/{run_id} contracts ─────────────────────────────────────
 
+@pytest.fixture(scope="class")
+def completed_get(client, demo_store_fakes):
+    """First GET of one freshly POSTed run, shared by the COMPLETED shape tests.
+
+    Poll-limit tests mutate last_poll state and keep minting their own runs.
+    """
+    r = client.send(_VALID_POST_REQ)
+    assert r.status_code == 202
+    return client.get(f"/v1/demo/runs/{jload(r)['run_id']}", headers=VALID_AUTH_HEADERS)
+
+
 class TestGetDemoRunContracts:
     """Contract tests for GET /v1/demo/runs/{run_id}."""
 
     def _post_and_get_run_id(self, client, mem_store) -> str:
         """POST a valid run and return run_id. Includes auth headers (Fail-Closed)."""
-        r = client.post(
-            "/v1/demo/runs",
-            json={"inputs": {"question": "Contract test question."}},
-            headers=VALID_AUTH_HEADERS,
-        )
+        r = client.send(_VALID_POST_REQ)
         assert r.status_code == 202
-        return r.json()["run_id"]
+        return jload(r)["run_id"]
 
     # ── COMPLETED response structure ──────────────────────────────────────────
 
-    def test_completed_status_200(self, client, mem_store):
-        run_id = self._post_and_get_run_id(client, mem_store)
-        r = client.get(f"/v1/demo/runs/{run_id}", headers=VALID_AUTH_HEADERS)
+    def test_completed_status_200(self, completed_get):
+        r = completed_get
         assert r.status_code == 200
 
-    def test_completed_has_status_field(self, client, mem_store):
-        run_id = self._post_and_get_run_id(client, mem_store)
-        data = client.get(f"/v1/demo/runs/{run_id}", headers=VALID_AUTH_HEADERS).json()
+    def test_completed_has_status_field(self, completed_get):
+        data = jload(completed_get)
         assert data["status"] == "COMPLETED"
 
-    def test_completed_meta_ai_generated(self, client, mem_store):
+    def test_completed_meta_ai_generated(self, completed_get):
         """meta.ai_generated must be True."""
-        run_id = self._post_and_get_run_id(client, mem_store)
-        data = client.get(f"/v1/demo/runs/{run_id}", headers=VALID_AUTH_HEADERS).json()
+        data = jload(completed_get)
         assert data["meta"]["ai_generated"] is True
 
-    def test_completed_meta_ai_disclosure(self, client, mem_store):
+    def test_completed_meta_ai_disclosure(self, completed_get):
         """meta.ai_disclosure must equal AI_DISCLOSURE."""
-        run_id = self._post_and_get_run_id(client, mem_store)
-        data = client.get(f"/v1/demo/runs/{run_id}", headers=VALID_AUTH_HEADERS).json()
+        data = jload(completed_get)
         assert data["meta"]["ai_disclosure"] == AI_DISCLOSURE
 
-    def test_completed_result_inline_exists(self, client, mem_store):
+    def test_completed_result_inline_exists(self, completed_get):
         """COMPLETED response must contain result_inline."""
-        run_id = self._post_and_get_run_id(client, mem_store)
-        data = client.get(f"/v1/demo/runs/{run_id}", headers=VALID_AUTH_HEADERS).json()
+        data = jload(completed_get)
         assert "result_inline" in data, "COMPLETED must have result_inline"
 
-    def test_completed_result_inline_is_ai_generated(self, client, mem_store):
+    def test_completed_result_inline_is_ai_generated(self, completed_get):
         """result_inline.is_ai_generated must be True."""
-        run_id = self._post_and_get_run_id(client, mem_store)
-        data = client.get(f"/v1/demo/runs/{run_id}", headers=VALID_AUTH_HEADERS).json()
+        data = jload(completed_get)
         ri = data["result_inline"]
         assert ri["is_ai_generated"] is True
 
-    def test_completed_result_inline_disclaimer(self, client, mem_store):
+    def test_completed_result_inline_disclaimer(self, completed_get):
         """result_inline.disclaimer must equal AI_DISCLOSURE."""
-        run_id = self._post_and_get_run_id(client, mem_store)
-        data = client.get(f"/v1/demo/runs/{run_id}", headers=VALID_AUTH_HEADERS).json()
+        data = jload(completed_get)
         ri = data["result_inline"]
         assert ri["disclaimer"] == AI_DISCLOSURE
 
-    def test_completed_header_ai_generated(self, client, mem_store):
+    def test_completed_header_ai_generated(self, completed_get):
         """X-DP-AI-Generated: true on COMPLETED response."""
-        run_id = self._post_and_get_run_id(client, mem_store)
-        r = client.get(f"/v1/demo/runs/{run_id}", headers=VALID_AUTH_HEADERS)
+        r = completed_get
         assert r.headers.get("X-DP-AI-Generated") == "true"
 
-    def test_completed_header_ai_disclosure(self, client, mem_store):
+    def test_completed_header_ai_disclosure(self, completed_get):
         """X-DP-AI-Disclosure header present."""
-        run_id = self._post_and_get_run_id(client, mem_store)
-        r = client.get(f"/v1/demo/runs/{run_id}", headers=VALID_AUTH_HEADERS)
+        r = completed_get
         assert AI_DISCLOSURE in r.headers.get("X-DP-AI-Disclosure", "")
 
-    def test_completed_cache_control_no_store(self, client, mem_store):
+    def test_completed_cache_control_no_store(self, completed_get):
         """Cache-Control: no-store on COMPLETED response."""
-        run_id = self._post_and_get_run_id(client, mem_store)
-        r = client.get(f"/v1/demo/runs/{run_id}", headers=VALID_AUTH_HEADERS)
+        r = completed_get
         assert "no-store" in r.headers.get("Cache-Control", "")
 
     # ── Poll rate limiting ────────────────────────────────────────────────────
@@ -525,9 +756,20 @@ class TestGetDemoRunContracts:
         assert r2.status_code == 429, (
             f"Expected 429 on immediate double poll, got {r2.status_code}"
         )
-        data = r2.json()
-        assert data["status"] == 429
-        assert "problem+json" in r2.headers.get("content-type", "")
+        _assert_problem(r2, 429)
+
+    def test_poll_after_min_interval_returns_200(self, client, mem_store, clock):
+        """Once the BASIC min interval has elapsed, the next poll passes again."""
+        run_id = self._post_and_get_run_id(client, mem_store)
+        assert client.get(f"/v1/demo/runs/{run_id}", headers=VALID_AUTH_HEADERS).status_code == 200
+
+        clock[0] += 2
+        r = client.get(f"/v1/demo/runs/{run_id}", headers=VALID_AUTH_HEADERS)
+        assert r.status_code == 429
+        assert r.headers["retry-after"] == "1"
+
+        clock[0] += 1
+        assert client.get(f"/v1/demo/runs/{run_id}", headers=VALID_AUTH_HEADERS).status_code == 200
 
     def test_429_has_retry_after_header(self, client, mem_store):
         """429 response must include Retry-After header."""
@@ -545,82 +787,91 @@ class TestGetDemoRunContracts:
         client.get(f"/v1/demo/runs/{run_id}", headers=VALID_AUTH_HEADERS)
         r = client.get(f"/v1/demo/runs/{run_id}", headers=VALID_AUTH_HEADERS)
         assert r.status_code == 429
-        assert "problem+json" in r.headers.get("content-type", "")
+        assert _is_problem_json(r)
 
     # ── 404 handling ──────────────────────────────────────────────────────────
 
     def test_nonexistent_run_returns_404(self, client, mem_store):
         r = client.get("/v1/demo/runs/demo_nonexistent_xyz000", headers=VALID_AUTH_HEADERS)
-        assert r.status_code == 404
-        data = r.json()
-        assert data["status"] == 404
-        assert "problem+json" in r.headers.get("content-type", "")
+        _assert_problem(r, 404)
 
     def test_404_is_problem_json(self, client, mem_store):
         r = client.get("/v1/demo/runs/demo_unknown_run", headers=VALID_AUTH_HEADERS)
         assert r.status_code == 404
-        assert "problem+json" in r.headers.get("content-type", "")
+        assert _is_problem_json(r)
 
     # ── 410 tombstone simulation ──────────────────────────────────────────────
 
     def test_expired_run_owner_gets_410(self, client, mem_store):
         """Simulated expiry: owner actor → 410 Gone."""
-        import json as _json
-        from datetime import datetime, timezone, timedelta
-
         # Manually inject a run that is already expired
         run_id = "demo_expired_owner_test"
-        past = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
         run_data = {
             "run_id": run_id,
             "status": "COMPLETED",
             "plan": "BASIC",
-            "created_at": past,
+            "created_at": _PAST_ISO,
             "owner_key": "owner-hmac-abc",
             "actor_key": "owner-hmac-abc",
             "inputs_hash": "hash",
             "inputs_len": 5,
             "result_sha256": "sha",
-            "retention_until": past,   # Already expired
+            "retention_until": _PAST_ISO,   # Already expired
         }
-        # Inject into mem_store via _store_set
-        from dpp_api.routers.demo_runs import _rk_run
-        demo_runs_mod._store_set(_rk_run(run_id), _json.dumps(run_data))
+        # Inject directly into the fixture store (pre-HASH JSON string record)
+        mem_store[_rk_run(run_id)] = json.dumps(run_data)
 
         # Patch actor_key derivation to match owner
         with patch.object(demo_runs_mod, "_derive_actor_key", return_value="owner-hmac-abc"):
             r = client.get(f"/v1/demo/runs/{run_id}", headers=VALID_AUTH_HEADERS)
 
-        assert r.status_code == 410
-        data = r.json()
-        assert data["status"] == 410
-        assert "problem+json" in r.headers.get("content-type", "")
+        _assert_problem(r, 410)
 
     def test_expired_run_nonowner_gets_404(self, client, mem_store):
         """Simulated expiry: non-owner actor → 404 (stealth)."""
-        import json as _json
-        from datetime import datetime, timezone, timedelta
-
         run_id = "demo_expired_nonowner_test"
-        past = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
         run_data = {
             "run_id": run_id,
             "status": "COMPLETED",
             "plan": "BASIC",
-            "created_at": past,
+            "created_at": _PAST_ISO,
             "owner_key": "real-owner-hmac",
             "actor_key": "real-owner-hmac",
             "inputs_hash": "hash",
             "inputs_len": 5,
             "result_sha256": "sha",
-            "retention_until": past,
+            "retention_until": _PAST_ISO,
         }
-        from dpp_api.routers.demo_runs import _rk_run
-        demo_runs_mod._store_set(_rk_run(run_id), _json.dumps(run_data))
+        mem_store[_rk_run(run_id)] = json.dumps(run_data)
 
         # Different actor → non-owner
         with patch.object(demo_runs_mod, "_derive_actor_key", return_value="different-actor-hmac"):
             r = client.get(f"/v1/demo/runs/{run_id}", headers=VALID_AUTH_HEADERS)
 
         assert r.status_code == 404
-        assert "problem+json" in r.headers.get("content-type", "")
+        assert _is_problem_json(r)
+
+    def test_expiry_uses_epoch_ts_fields(self, client, mem_store):
+        """Retention is decided by retention_until_ts when present."""
+        run_id = "demo_expired_ts_test"
+        now_ts = int(time.time())
+        run_data = {
+            "run_id": run_id,
+            "status": "COMPLETED",
+            "plan": "BASIC",
+            "created_at": _FUTURE_ISO,
+            "created_at_ts": now_ts - 2 * 86400,
+            "owner_key": "owner-hmac-abc",
+            "actor_key": "owner-hmac-abc",
+            "inputs_hash": "hash",
+            "inputs_len": 5,
+            "result_sha256": "sha",
+            "retention_until": _FUTURE_ISO,   # Stale ISO; the epoch field wins
+            "retention_until_ts": now_ts - 86400,
+        }
+        mem_store[_rk_run(run_id)] = json.dumps(run_data)
+
+        with patch.object(demo_runs_mod, "_derive_actor_key", return_value="owner-hmac-abc"):
+            r = client.get(f"/v1/demo/runs/{run_id}", headers=VALID_AUTH_HEADERS)
+
+        assert r.status_code == 410
@@ -9,13 +9,12 @@ from fastapi import APIRouter, Response
 from fastapi.testclient import TestClient
 
 
-def test_ratelimit_middleware_respects_handler_headers(monkeypatch):
-    """
-    T1: RateLimit middleware MUST NOT override headers set by handlers.
+@pytest.fixture(scope="module")
+def ratelimit_client():
+    """Standalone app with the test handlers and rate limit middleware.
 
-    P0-4 Contract:
-    - If handler sets RateLimit-Policy/RateLimit, middleware preserves them
-    - If handler does NOT set them, middleware adds default headers
+    Built once per module: routes and middleware are registered a single
+    time instead of on every run of the test.
     """
     from fastapi import FastAPI
     from dpp_api.rate_limiter import NoOpRateLimiter
@@ -82,7 +81,18 @@ def test_ratelimit_middleware_respects_handler_headers(monkeypatch):
 
         return response
 
-    client = TestClient(test_app)
+    return TestClient(test_app)
+
+
+def test_ratelimit_middleware_respects_handler_headers(ratelimit_client):
+    """
+    T1: RateLimit middleware MUST NOT override headers set by handlers.
+
+    P0-4 Contract:
+    - If handler sets RateLimit-Policy/RateLimit, middleware preserves them
+    - If handler does NOT set them, middleware adds default headers
+    """
+    client = ratelimit_client
 
     # Test 1: Handler sets custom headers -> middleware preserves them
     resp1 = client.get("/v1/test-custom-ratelimit")
@@ -16,17 +16,11 @@ STOP RULES (any failure → CI BLOCKED):
   - secretKeyRef optional:true (K8s manifest — checked separately)
 """
 
-import sys
-import time
-from pathlib import Path
-from typing import Optional
+from typing import Any
 from unittest.mock import patch
 
 import pytest
-from fastapi.testclient import TestClient
 
-sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-from dpp_api.main import app
 import dpp_api.routers.demo_runs as demo_runs_mod
 
 DEMO_BASE_URL = "https://api.decisionproof.io.kr"
@@ -40,8 +34,11 @@ RC14_ACTOR_SALT = "rc14-actor-salt-qrs"
 
 # ─── Common assertion helper ──────────────────────────────────────────────────
 
-def assert_problem_json(resp, expected_status: int) -> None:
-    """Assert response is RFC 9457 application/problem+json with all required fields."""
+def assert_problem_json(resp, expected_status: int) -> dict[str, Any]:
+    """Assert response is RFC 9457 application/problem+json with all required fields.
+
+    Returns the parsed body so callers need not decode it again.
+    """
     ct = resp.headers.get("content-type", "")
     assert "application/problem+json" in ct, (
         f"Expected application/problem+json, got '{ct}'"
@@ -52,14 +49,12 @@ def assert_problem_json(resp, expected_status: int) -> None:
     assert data["status"] == expected_status, (
         f"Expected status={expected_status}, got {data['status']}"
     )
+    return data
 
 
 # ─── Fixtures ─────────────────────────────────────────────────────────────────
-
-@pytest.fixture
-def client():
-    return TestClient(app)
-
+# client: session-scoped TestClient from conftest.py. The demo router reads
+# its auth env at request time, so per-test monkeypatched env still applies.
 
 @pytest.fixture
 def demo_env(monkeypatch):
@@ -84,84 +79,56 @@ def valid_headers(demo_env):
     }
 
 
-@pytest.fixture
-def mem_store(demo_env):
-    """In-memory store + auth env (demo_env already set via fixture dependency)."""
-    store: dict[str, tuple[str, Optional[float]]] = {}
-
-    def fake_get(key: str) -> Optional[str]:
-        entry = store.get(key)
-        if entry is None:
-            return None
-        value, expire_at = entry
-        if expire_at and time.time() > expire_at:
-            del store[key]
-            return None
-        return value
-
-    def fake_set(key: str, value: str, ex: Optional[int] = None) -> None:
-        expire_at = time.time() + ex if ex else None
-        store[key] = (value, expire_at)
-
-    def fake_incr(key: str, ex: Optional[int] = None) -> int:
-        entry = store.get(key)
-        if entry is None or (entry[1] and time.time() > entry[1]):
-            new_val = 1
-            expire_at = time.time() + ex if ex else None
-        else:
-            new_val = int(entry[0]) + 1
-            expire_at = entry[1]
-        store[key] = (str(new_val), expire_at)
-        return new_val
-
-    def fake_decr(key: str) -> int:
-        entry = store.get(key)
-        current = int(entry[0]) if entry else 0
-        new_val = max(0, current - 1)
-        store[key] = (str(new_val), entry[1] if entry else None)
-        return new_val
-
-    def fake_delete(key: str) -> None:
-        store.pop(key, None)
-
+@pytest.fixture(scope="class")
+def _no_s3(demo_store_fakes):
+    """Keep result storage off S3 alongside the shared store fakes."""
     with (
-        patch.object(demo_runs_mod, "_store_get", side_effect=fake_get),
-        patch.object(demo_runs_mod, "_store_set", side_effect=fake_set),
-        patch.object(demo_runs_mod, "_store_incr", side_effect=fake_incr),
-        patch.object(demo_runs_mod, "_store_decr", side_effect=fake_decr),
-        patch.object(demo_runs_mod, "_store_delete", side_effect=fake_delete),
         patch.object(demo_runs_mod, "_store_result_in_s3", return_value=None),
         patch.object(demo_runs_mod, "_generate_presigned_url", return_value=None),
     ):
-        yield store
+        yield demo_store_fakes
+
+
+@pytest.fixture
+def mem_store(_no_s3, demo_env):
+    """Empty in-memory store + auth env (demo_env already set via fixture dependency)."""
+    _no_s3.clear()
+    return _no_s3.values
 
 
 # ─── (1) openapi-demo LOCK ────────────────────────────────────────────────────
 
+@pytest.fixture(scope="class")
+def openapi_demo_doc(client):
+    """(status_code, headers, body) of one GET, shared by the class."""
+    r = client.get("/.well-known/openapi-demo.json")
+    return r.status_code, r.headers, r.json()
+
+
 class TestRC14OpenAPIDemoLock:
     """Gate: /.well-known/openapi-demo.json LOCK invariants.
 
     This endpoint requires no auth. Failures here block the marketplace listing.
     """
 
-    def test_status_200(self, client):
-        r = client.get("/.well-known/openapi-demo.json")
-        assert r.status_code == 200
+    def test_status_200(self, openapi_demo_doc):
+        status_code, _, _ = openapi_demo_doc
+        assert status_code == 200
 
-    def test_servers_length_is_1(self, client):
-        data = client.get("/.well-known/openapi-demo.json").json()
+    def test_servers_length_is_1(self, openapi_demo_doc):
+        _, _, data = openapi_demo_doc
         assert len(data["servers"]) == 1, (
             f"servers must have exactly 1 entry, got {len(data['servers'])}"
         )
 
-    def test_servers_url_locked(self, client):
-        data = client.get("/.well-known/openapi-demo.json").json()
+    def test_servers_url_locked(self, openapi_demo_doc):
+        _, _, data = openapi_demo_doc
         assert data["servers"][0]["url"] == DEMO_BASE_URL, (
             f"servers[0].url must be '{DEMO_BASE_URL}', got '{data['servers'][0]['url']}'"
         )
 
-    def test_paths_exact_allowlist(self, client):
-        data = client.get("/.well-known/openapi-demo.json").json()
+    def test_paths_exact_allowlist(self, openapi_demo_doc):
+        _, _, data = openapi_demo_doc
         actual = set(data["paths"].keys())
         assert actual == ALLOWED_PATHS, (
             f"Path drift detected. "
@@ -219,7 +186,7 @@ class TestRC14FailClosed:
             json={"inputs": {"question": "test"}},
         )
         assert r.status_code == 503
-        data = r.json()
+        data = assert_problem_json(r, 503)
         # Must mention what is missing (operator guidance) but no secret values
         assert "RAPIDAPI_PROXY_SECRET" in data["detail"]
 
@@ -232,38 +199,30 @@ class TestRC14Auth:
     Env vars are set (Fail-Closed satisfied), but headers are intentionally wrong.
     """
 
-    def test_missing_proxy_secret_header_returns_401(self, client, demo_env):
-        """X-RapidAPI-Proxy-Secret header absent → 401."""
-        r = client.post(
-            "/v1/demo/runs",
-            json={"inputs": {"question": "test"}},
-            headers={"Authorization": f"Bearer {RC14_BEARER_TOKEN}"},
-        )
-        assert r.status_code == 401
-        assert_problem_json(r, 401)
-
-    def test_wrong_proxy_secret_returns_401(self, client, demo_env):
-        """X-RapidAPI-Proxy-Secret header has wrong value → 401."""
-        r = client.post(
-            "/v1/demo/runs",
-            json={"inputs": {"question": "test"}},
-            headers={
+    @pytest.mark.parametrize(
+        "headers",
+        [
+            # X-RapidAPI-Proxy-Secret header absent
+            {"Authorization": f"Bearer {RC14_BEARER_TOKEN}"},
+            # X-RapidAPI-Proxy-Secret header has wrong value
+            {
                 "X-RapidAPI-Proxy-Secret": "this-is-wrong",
                 "Authorization": f"Bearer {RC14_BEARER_TOKEN}",
             },
-        )
-        assert r.status_code == 401
-        assert_problem_json(r, 401)
-
-    def test_wrong_bearer_returns_401(self, client, demo_env):
-        """Bearer token has wrong value → 401."""
-        r = client.post(
-            "/v1/demo/runs",
-            json={"inputs": {"question": "test"}},
-            headers={
+            # Bearer token has wrong value
+            {
                 "X-RapidAPI-Proxy-Secret": RC14_PROXY_SECRET,
                 "Authorization": "Bearer wrong-token-value",
             },
+        ],
+        ids=["missing_proxy_secret_header", "wrong_proxy_secret", "wrong_bearer"],
+    )
+    def test_bad_auth_returns_401(self, client, demo_env, headers):
+        """Missing/wrong proxy secret or wrong Bearer → 401 problem+json."""
+        r = client.post(
+            "/v1/demo/runs",
+            json={"inputs": {"question": "test"}},
+            headers=headers,
         )
         assert r.status_code == 401
         assert_problem_json(r, 401)
@@ -12,6 +12,7 @@ Rationale:
 
 Fast/File-read only — no I/O, no network, no sleep.
 """
+import functools
 import pathlib
 import re
 
@@ -26,16 +27,23 @@ PATCH_FILES = {
     "dpp-reaper": PILOT_OVERLAY / "patch-reaper-deployment-pilot.yaml",
 }
 
+_IMAGE_LINE_RE = re.compile(r"^\s+image:\s+")  # 들여쓰기가 있는 image: 라인
+_TAG_SUFFIX_RE = re.compile(r":[a-zA-Z0-9][a-zA-Z0-9._-]*$")  # 이미지 끝의 :<tag>
+
 # ─── 헬퍼 ────────────────────────────────────────────────────────────────────
 
-def _image_lines(path: pathlib.Path) -> list[str]:
-    """파일에서 'image:' 가 포함된 라인(들)을 반환 (주석 제외)."""
+@functools.lru_cache(maxsize=None)
+def _image_lines(path: pathlib.Path) -> tuple[str, ...]:
+    """파일에서 'image:' 가 포함된 라인(들)을 반환 (주석 제외).
+
+    서비스별 파일은 한 번만 읽는다 (5개 테스트가 결과를 공유, 캐시라서 tuple).
+    """
     lines = path.read_text(encoding="utf-8").splitlines()
-    return [
+    return tuple(
         line
         for line in lines
-        if re.match(r"^\s+image:\s+", line)  # 들여쓰기가 있는 image: 라인
-    ]
+        if _IMAGE_LINE_RE.match(line)
+    )
 
 
 # ─── 파라미터화 테스트 ────────────────────────────────────────────────────────
@@ -89,7 +97,7 @@ class TestRC15DigestPin:
                 continue  # digest pin OK
             # tag-only 패턴 탐지: colon 뒤 영숫자+점이 있는 경우
             repo_part = line.split("image:")[-1].strip()
-            tag_match = re.search(r":[a-zA-Z0-9][a-zA-Z0-9._-]*$", repo_part)
+            tag_match = _TAG_SUFFIX_RE.search(repo_part)
             if tag_match:
                 pytest.fail(
                     f"{service}: mutable tag 사용 감지 (digest pin 없음).\n"
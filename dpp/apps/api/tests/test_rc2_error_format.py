@@ -13,14 +13,66 @@ Status codes tested: 401, 403, 402, 409, 422, 429
 import re
 import pytest
 from fastapi import FastAPI, HTTPException, Header
+from fastapi.exceptions import RequestValidationError as FastAPIRequestValidationError
 from fastapi.testclient import TestClient
-from dpp_api.main import app
+from pydantic import BaseModel, Field
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from dpp_api.main import http_exception_handler, validation_exception_handler
 
-@pytest.fixture
-def client():
-    """Test client for FastAPI app."""
-    return TestClient(app)
+# client: session-scoped TestClient for the FastAPI app (conftest.py)
+
+# Opaque instance: urn:decisionproof:trace:... or urn:decisionproof:run:...
+_INSTANCE_RE = re.compile(r"^urn:decisionproof:(trace|run):[A-Za-z0-9._:-]{8,}$")
+
+
+# Test-only mini app with the production exception handlers, built once.
+# Each route raises the error whose Problem Details rendering is under test.
+_error_app = FastAPI()
+_error_app.add_exception_handler(StarletteHTTPException, http_exception_handler)
+_error_app.add_exception_handler(FastAPIRequestValidationError, validation_exception_handler)
+
+
+class _ValidationRequest(BaseModel):
+    required_field: str = Field(..., min_length=1)
+    number_field: int = Field(..., gt=0)
+
+
+@_error_app.get("/forbidden")
+async def forbidden_endpoint():
+    raise HTTPException(status_code=403, detail="Forbidden resource")
+
+
+@_error_app.get("/payment_required")
+async def payment_required_endpoint():
+    raise HTTPException(status_code=402, detail="Maximum cost exceeded")
+
+
+@_error_app.get("/conflict")
+async def conflict_endpoint():
+    raise HTTPException(status_code=409, detail="Idempotency key conflict")
+
+
+@_error_app.post("/test_validation")
+async def validation_endpoint(request: _ValidationRequest):
+    return {"ok": True}
+
+
+@_error_app.get("/rate_limited")
+async def rate_limited_endpoint():
+    raise HTTPException(status_code=429, detail="Rate limit exceeded")
+
+
+@_error_app.get("/rate_limit_retry")
+async def rate_limit_retry_endpoint():
+    raise HTTPException(status_code=429, detail="Too many requests")
+
+
+@pytest.fixture(scope="module")
+def error_client():
+    """TestClient for the shared error-format mini app."""
+    with TestClient(_error_app) as c:
+        yield c
 
 
 def assert_problem_details(resp, expected_status: int):
@@ -51,7 +103,7 @@ def assert_problem_details(resp, expected_status: int):
 
     # 4. Instance format (opaque trace ID)
     instance = data["instance"]
-    assert re.match(r"^urn:decisionproof:(trace|run):[A-Za-z0-9._:-]{8,}$", instance), \
+    assert _INSTANCE_RE.match(instance), \
         f"Invalid instance format: {instance}"
 
     # 5. No path leaks (/) or numeric-only
@@ -80,121 +132,54 @@ class TestRC2ErrorFormat:
         assert response.status_code == 401
         assert_problem_details(response, 401)
 
-    def test_403_forbidden(self, client):
+    def test_403_forbidden(self, error_client):
         """
         403: Authenticated but not authorized.
-        Use test-only mini app to verify handler behavior.
+        Uses the shared test-only mini app to verify handler behavior.
         """
-        # Create test app with same exception handler
-        from dpp_api.main import http_exception_handler
-        from starlette.exceptions import HTTPException as StarletteHTTPException
-
-        test_app = FastAPI()
-        test_app.add_exception_handler(StarletteHTTPException, http_exception_handler)
-
-        @test_app.get("/forbidden")
-        async def forbidden_endpoint():
-            raise HTTPException(status_code=403, detail="Forbidden resource")
-
-        test_client = TestClient(test_app)
-        response = test_client.get("/forbidden")
+        response = error_client.get("/forbidden")
 
         assert response.status_code == 403
         assert_problem_details(response, 403)
 
-    def test_402_payment_required(self, client):
+    def test_402_payment_required(self, error_client):
         """
         402: Insufficient funds or max_cost exceeds plan limit.
-        Use test-only mini app to verify handler behavior.
+        Uses the shared test-only mini app to verify handler behavior.
         """
-        # Create test app with same exception handler
-        from dpp_api.main import http_exception_handler
-        from starlette.exceptions import HTTPException as StarletteHTTPException
-
-        test_app = FastAPI()
-        test_app.add_exception_handler(StarletteHTTPException, http_exception_handler)
-
-        @test_app.get("/payment_required")
-        async def payment_required_endpoint():
-            raise HTTPException(status_code=402, detail="Maximum cost exceeded")
-
-        test_client = TestClient(test_app)
-        response = test_client.get("/payment_required")
+        response = error_client.get("/payment_required")
 
         assert response.status_code == 402
         assert_problem_details(response, 402)
 
-    def test_409_conflict(self, client):
+    def test_409_conflict(self, error_client):
         """
         409: Idempotency conflict or resource conflict.
-        Use test-only mini app to verify handler behavior.
+        Uses the shared test-only mini app to verify handler behavior.
         """
-        # Create test app with same exception handler
-        from dpp_api.main import http_exception_handler
-        from starlette.exceptions import HTTPException as StarletteHTTPException
-
-        test_app = FastAPI()
-        test_app.add_exception_handler(StarletteHTTPException, http_exception_handler)
-
-        @test_app.get("/conflict")
-        async def conflict_endpoint():
-            raise HTTPException(status_code=409, detail="Idempotency key conflict")
-
-        test_client = TestClient(test_app)
-        response = test_client.get("/conflict")
+        response = error_client.get("/conflict")
 
         assert response.status_code == 409
         assert_problem_details(response, 409)
 
-    def test_422_validation_error(self, client):
+    def test_422_validation_error(self, error_client):
         """
         422: Request validation error.
         FastAPI default 422 must be wrapped in Problem Details.
-        Use test-only mini app to verify handler behavior.
+        Uses the shared test-only mini app to verify handler behavior.
         """
-        # Create test app with same exception handler
-        from dpp_api.main import validation_exception_handler
-        from fastapi.exceptions import RequestValidationError as FastAPIRequestValidationError
-        from pydantic import BaseModel, Field
-
-        test_app = FastAPI()
-        test_app.add_exception_handler(FastAPIRequestValidationError, validation_exception_handler)
-
-        class TestRequest(BaseModel):
-            required_field: str = Field(..., min_length=1)
-            number_field: int = Field(..., gt=0)
-
-        @test_app.post("/test_validation")
-        async def test_endpoint(request: TestRequest):
-            return {"ok": True}
-
-        test_client = TestClient(test_app)
-
-        # Send invalid request (missing required fields)
-        response = test_client.post("/test_validation", json={"invalid_field": "test"})
+        response = error_client.post("/test_validation", json={"invalid_field": "test"})
 
         assert response.status_code == 422
         assert_problem_details(response, 422)
 
-    def test_429_rate_limit_exceeded(self, client):
+    def test_429_rate_limit_exceeded(self, error_client):
         """
         429: Rate limit exceeded.
         Must include Retry-After header.
-        Use test-only mini app to verify handler behavior.
+        Uses the shared test-only mini app to verify handler behavior.
         """
-        # Create test app with same exception handler
-        from dpp_api.main import http_exception_handler
-        from starlette.exceptions import HTTPException as StarletteHTTPException
-
-        test_app = FastAPI()
-        test_app.add_exception_handler(StarletteHTTPException, http_exception_handler)
-
-        @test_app.get("/rate_limited")
-        async def rate_limited_endpoint():
-            raise HTTPException(status_code=429, detail="Rate limit exceeded")
-
-        test_client = TestClient(test_app)
-        response = test_client.get("/rate_limited")
+        response = error_client.get("/rate_limited")
 
         assert response.status_code == 429
         assert_problem_details(response, 429)
@@ -205,24 +190,12 @@ class TestRC2ErrorFormat:
         assert retry_after.isdigit(), f"Retry-After must be numeric, got: {retry_after}"
         assert int(retry_after) > 0, f"Retry-After must be positive, got: {retry_after}"
 
-    def test_429_retry_after_header(self, client):
+    def test_429_retry_after_header(self, error_client):
         """
         429 must include Retry-After header with positive integer.
         Verify Retry-After header format and value.
         """
-        # Create test app with same exception handler
-        from dpp_api.main import http_exception_handler
-        from starlette.exceptions import HTTPException as StarletteHTTPException
-
-        test_app = FastAPI()
-        test_app.add_exception_handler(StarletteHTTPException, http_exception_handler)
-
-        @test_app.get("/rate_limit_retry")
-        async def rate_limit_retry_endpoint():
-            raise HTTPException(status_code=429, detail="Too many requests")
-
-        test_client = TestClient(test_app)
-        response = test_client.get("/rate_limit_retry")
+        response = error_client.get("/rate_limit_retry")
 
         # Verify Retry-After header exists and is valid
         assert "Retry-After" in response.headers, "429 must include Retry-After header"
@@ -237,32 +210,29 @@ class TestRC2ErrorFormat:
         assert retry_seconds == 60, f"Expected Retry-After: 60, got: {retry_seconds}"
 
 
+@pytest.fixture(scope="class")
+def unauth_post_response(client):
+    """One unauthenticated POST /v1/runs (401), shared by the class."""
+    return client.post("/v1/runs", json={
+        "workspace_id": "ws_test",
+        "run_id": "run_test_instance",
+        "plan_id": "plan_test",
+        "input": {"test": "data"}
+    }, headers={"Idempotency-Key": "test_key_instance"})
+
+
 class TestRC2InstanceFormat:
     """Test instance field format compliance."""
 
-    def test_instance_no_path_leak(self, client):
+    def test_instance_no_path_leak(self, unauth_post_response):
         """Instance must not contain '/' (path leak)."""
-        response = client.post("/v1/runs", json={
-            "workspace_id": "ws_test",
-            "run_id": "run_test_leak",
-            "plan_id": "plan_test",
-            "input": {"test": "data"}
-        }, headers={"Idempotency-Key": "test_key_leak"})
-
-        assert response.status_code == 401
-        data = response.json()
+        assert unauth_post_response.status_code == 401
+        data = unauth_post_response.json()
         assert "/" not in data["instance"], "Instance contains path leak"
 
-    def test_instance_no_numeric_only(self, client):
+    def test_instance_no_numeric_only(self, unauth_post_response):
         """Instance ID part must not be numeric-only (DB PK leak)."""
-        response = client.post("/v1/runs", json={
-            "workspace_id": "ws_test",
-            "run_id": "run_test_numeric",
-            "plan_id": "plan_test",
-            "input": {"test": "data"}
-        }, headers={"Idempotency-Key": "test_key_numeric"})
-
-        assert response.status_code == 401
-        data = response.json()
+        assert unauth_post_response.status_code == 401
+        data = unauth_post_response.json()
         instance_id = data["instance"].split(":")[-1]
         assert not instance_id.isdigit(), "Instance is numeric-only (DB PK leak)"
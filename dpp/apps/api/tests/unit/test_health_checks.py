@@ -0,0 +1,282 @@
+"""Tests for /health and /readyz dependency checks.
+
+Test Coverage:
+1. Dependency checks run concurrently
+2. A failing check is reported as a fixed down verdict without affecting the others
+3. Verdicts are cached per check for CHECK_TTL_S
+4. The S3 health client is built once and reused
+5. A hung dependency is cut off at CHECK_TIMEOUT_S
+6. GET /health is answered by the ASGI interceptor with the route's body
+7. S3/SQS verdicts come from the background snapshot and go stale
+   (and are dropped when the refresher stops)
+8. The healthy /readyz body is the prebuilt constant
+9. Concurrent callers share one in-flight check (per event loop)
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from dpp_api.middleware import HealthCheckInterceptor
+from dpp_api.routers import health
+
+
+@pytest.fixture(autouse=True)
+def billing_skipped():
+    """Billing preflight is out of scope here."""
+    with patch.object(health, "get_billing_preflight_status", return_value={"status": "skipped"}):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_check_cache():
+    """Each test sees fresh verdicts."""
+    health._check_cache.clear()
+    health._snapshot.clear()
+    yield
+    health._check_cache.clear()
+    health._snapshot.clear()
+
+
+def _slow_ping() -> None:
+    time.sleep(0.2)
+
+
+async def _slow_aping() -> None:
+    await asyncio.sleep(0.2)
+
+
+async def _ok_aping() -> None:
+    return None
+
+
+async def _readyz():
+    response = await health.readiness_check()
+    return response, json.loads(response.body)
+
+
+async def test_readyz_runs_checks_concurrently():
+    with (
+        patch.object(health, "_ping_database", _slow_ping),
+        patch.object(health, "_ping_redis", _slow_aping),
+        patch.object(health, "_ping_s3", _slow_ping),
+        patch.object(health, "_ping_sqs", _slow_ping),
+    ):
+        start = time.monotonic()
+        response, result = await _readyz()
+        elapsed = time.monotonic() - start
+
+    assert result["status"] == "ready"
+    assert elapsed < 0.6  # max(t_i), not sum(t_i) = 0.8
+
+
+async def test_readyz_reports_failed_check_as_down():
+    async def broken() -> None:
+        raise ConnectionError("redis unreachable")
+
+    with (
+        patch.object(health, "_ping_database", lambda: None),
+        patch.object(health, "_ping_redis", broken),
+        patch.object(health, "_ping_s3", lambda: None),
+        patch.object(health, "_ping_sqs", lambda: None),
+    ):
+        response, result = await _readyz()
+
+    assert response.status_code == 503
+    assert result["status"] == "not_ready"
+    # Fixed verdict; the exception text stays in the log
+    assert result["services"]["redis"] == health.DOWN_CONNECTION
+    assert result["services"]["database"] == "up"
+    assert result["services"]["sqs"] == "up"
+
+
+async def test_readyz_reuses_cached_verdicts_within_ttl():
+    calls = []
+
+    def counting_ping() -> None:
+        calls.append(1)
+
+    with (
+        patch.object(health, "_ping_database", counting_ping),
+        patch.object(health, "_ping_redis", _ok_aping),
+        patch.object(health, "_ping_s3", lambda: None),
+        patch.object(health, "_ping_sqs", lambda: None),
+    ):
+        await health.readiness_check()
+        await health.readiness_check()
+        assert len(calls) == 1
+
+        # Expired verdict is refreshed
+        stamp, verdict = health._check_cache["database"]
+        health._check_cache["database"] = (stamp - health.CHECK_TTL_S["database"], verdict)
+        await health.readiness_check()
+        assert len(calls) == 2
+
+
+def test_s3_ping_reuses_boto3_client(monkeypatch):
+    monkeypatch.setenv("S3_RESULT_BUCKET", "dpp-results-test")
+    health._s3_health_target.cache_clear()
+    try:
+        with patch.object(health.boto3, "client") as client_factory:
+            health._ping_s3()
+            # Resolved once: later env changes need cache_clear()
+            monkeypatch.setenv("S3_RESULT_BUCKET", "other-bucket")
+            health._ping_s3()
+
+        client_factory.assert_called_once()
+        assert client_factory.return_value.head_bucket.call_count == 2
+        client_factory.return_value.head_bucket.assert_called_with(Bucket="dpp-results-test")
+    finally:
+        health._s3_health_target.cache_clear()
+
+
+async def test_hung_check_reports_timeout():
+    with (
+        patch.object(health, "CHECK_TIMEOUT_S", 0.05),
+        patch.object(health, "_ping_database", _slow_ping),
+    ):
+        start = time.monotonic()
+        assert await health.check_database() == "down: timeout"
+        assert time.monotonic() - start < 0.2
+
+
+def test_interceptor_matches_health_route():
+    reached = []
+
+    def build() -> FastAPI:
+        inner = FastAPI()
+        inner.include_router(health.router)
+
+        @inner.middleware("http")
+        async def record(request, call_next):
+            reached.append(request.url.path)
+            return await call_next(request)
+
+        return inner
+
+    plain = TestClient(build()).get("/health")
+    reached.clear()
+
+    wrapped = build()
+    wrapped.add_middleware(HealthCheckInterceptor)
+    client = TestClient(wrapped)
+    intercepted = client.get("/health")
+
+    assert intercepted.status_code == 200
+    assert intercepted.json() == plain.json()
+    assert intercepted.headers["content-type"] == "application/json"
+    assert reached == []
+
+    # Other methods still reach FastAPI routing
+    assert client.post("/health").status_code == 405
+    assert reached == ["/health"]
+
+
+async def test_readyz_reads_background_snapshot():
+    def unexpected() -> None:
+        raise AssertionError("S3/SQS must not be called inline once snapshotted")
+
+    with (
+        patch.object(health, "_ping_database", lambda: None),
+        patch.object(health, "_ping_redis", _ok_aping),
+        patch.object(health, "_ping_s3", lambda: None),
+        patch.object(health, "_ping_sqs", lambda: None),
+    ):
+        await health._refresh_snapshot()
+
+    with (
+        patch.object(health, "_ping_database", lambda: None),
+        patch.object(health, "_ping_redis", _ok_aping),
+        patch.object(health, "_ping_s3", unexpected),
+        patch.object(health, "_ping_sqs", unexpected),
+    ):
+        response, result = await _readyz()
+        assert result["status"] == "ready"
+
+        # A snapshot the refresher stopped updating reads as down
+        stamp, verdict = health._snapshot["s3"]
+        health._snapshot["s3"] = (stamp - health.STALE_AFTER_S - 1, verdict)
+        response, result = await _readyz()
+
+    assert response.status_code == 503
+    assert result["services"]["s3"] == "down: stale"
+    assert result["services"]["sqs"] == "up"
+
+
+async def test_stop_refresher_awaits_task_and_clears_snapshot():
+    with (
+        patch.object(health, "_ping_s3", lambda: None),
+        patch.object(health, "_ping_sqs", lambda: None),
+    ):
+        await health._start_refresher()
+        task = health._refresher_task
+        while "s3" not in health._snapshot:
+            await asyncio.sleep(0.01)
+
+        await health._stop_refresher()
+
+    assert task.done()
+    assert health._refresher_task is None
+    assert health._snapshot == {}
+
+
+async def test_readyz_healthy_body_is_prebuilt():
+    with (
+        patch.object(health, "_ping_database", lambda: None),
+        patch.object(health, "_ping_redis", _ok_aping),
+        patch.object(health, "_ping_s3", lambda: None),
+        patch.object(health, "_ping_sqs", lambda: None),
+    ):
+        response, result = await _readyz()
+
+    assert response.status_code == 200
+    assert response.body is health._READY_BODIES["skipped"]
+    assert result["services"] == {
+        "api": "up",
+        "database": "up",
+        "redis": "up",
+        "s3": "up",
+        "sqs": "up",
+        "billing_secrets": "skipped",
+    }
+
+
+async def test_concurrent_callers_share_one_check():
+    calls = []
+
+    async def slow_check() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "up"
+
+    results = await asyncio.gather(
+        health._cached("database", slow_check),
+        health._cached("database", slow_check),
+        health._single_flight("database", slow_check),
+    )
+
+    assert results == ["up", "up", "up"]
+    assert len(calls) == 1
+    assert health._inflight == {}
+
+
+def test_single_flight_ignores_task_from_another_loop():
+    async def ok_check() -> str:
+        return "up"
+
+    # A run stranded on a loop that has since closed
+    old_loop = asyncio.new_event_loop()
+    stranded = old_loop.create_future()
+    health._inflight["database"] = (old_loop, stranded)
+    old_loop.close()
+
+    try:
+        assert asyncio.run(health._single_flight("database", ok_check)) == "up"
+        assert "database" not in health._inflight
+    finally:
+        health._inflight.pop("database", None)
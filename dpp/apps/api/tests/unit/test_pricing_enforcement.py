@@ -7,11 +7,13 @@ Tests:
 3. Hard overage cap with grace overage: min(1%, 100 DC)
 """
 
+import time
+
 import pytest
 from datetime import datetime, timezone
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
-from dpp_api.pricing.enforcement import EnforcementEngine
+from dpp_api.pricing.enforcement import AsyncEnforcementEngine, EnforcementEngine
 from dpp_api.pricing.models import PricingSSoTModel, TierModel
 
 
@@ -120,9 +122,11 @@ def mock_redis():
     redis_mock = Mock()
     redis_mock.incr = Mock(return_value=1)
     redis_mock.expire = Mock(return_value=True)
-    redis_mock.decr = Mock(return_value=0)
+    redis_mock.hincrby = Mock(return_value=0)
     redis_mock.ttl = Mock(return_value=30)
     redis_mock.get = Mock(return_value="0")
+    redis_mock.script_load = Mock(return_value="rpm_sha")
+    redis_mock.evalsha = Mock(return_value=[1, 1])
     return redis_mock
 
 
@@ -135,21 +139,27 @@ class TestRPMEnforcement:
         tier = mock_ssot_with_tiers.tiers[0]
 
         # Mock: current count is 100 (below 600 limit)
-        mock_redis.incr.return_value = 100
+        mock_redis.evalsha.return_value = [1, 100]
 
         result = engine.check_rpm_limit("ws_123", tier)
 
         # None = allowed
         assert result is None
-        mock_redis.incr.assert_called_once()
+        mock_redis.evalsha.assert_called_once()
+        args = mock_redis.evalsha.call_args.args
+        assert args[0] == "rpm_sha"
+        assert args[2] == "rpm:ws_123"
+        assert args[3] == 600
+        assert args[4] == int(time.time()) // 60
+        assert args[5] == 60
 
     def test_rpm_exceeds_limit_blocks_request(self, mock_ssot_with_tiers, mock_redis):
         """Request exceeding RPM limit should be blocked (returns ProblemDetails)."""
         engine = EnforcementEngine(mock_ssot_with_tiers, mock_redis)
         tier = mock_ssot_with_tiers.tiers[0]
 
-        # Mock: current count is 601 (exceeds 600 limit)
-        mock_redis.incr.return_value = 601
+        # Mock: count hit 601 (exceeds 600 limit), script rolled back to 600
+        mock_redis.evalsha.return_value = [0, 600]
 
         result = engine.check_rpm_limit("ws_123", tier)
 
@@ -160,9 +170,27 @@ class TestRPMEnforcement:
         assert len(result.violated_policies) == 1
         assert result.violated_policies[0].policy == "rpm"
         assert result.violated_policies[0].limit == 600
+        assert result.violated_policies[0].current == 600
+
+        # Rollback happens inside the script (single round trip, no TTL read)
+        mock_redis.evalsha.assert_called_once()
+        mock_redis.hincrby.assert_not_called()
+        mock_redis.ttl.assert_not_called()
+
+    def test_rpm_falls_back_to_eval_on_noscript(self, mock_ssot_with_tiers, mock_redis):
+        """Script cache flush (NOSCRIPT) should fall back to EVAL with the script body."""
+        from redis.exceptions import NoScriptError
+
+        engine = EnforcementEngine(mock_ssot_with_tiers, mock_redis)
+        tier = mock_ssot_with_tiers.tiers[0]
+
+        mock_redis.evalsha.side_effect = NoScriptError("NOSCRIPT")
+        mock_redis.eval = Mock(return_value=[1, 5])
 
-        # Should rollback (decr)
-        mock_redis.decr.assert_called_once()
+        result = engine.check_rpm_limit("ws_123", tier)
+
+        assert result is None
+        mock_redis.eval.assert_called_once()
 
     def test_rpm_zero_means_unlimited(self, mock_ssot_with_tiers, mock_redis):
         """RPM = 0 should mean unlimited (no enforcement, returns None)."""
@@ -176,8 +204,8 @@ class TestRPMEnforcement:
 
         # None = unlimited
         assert result is None
-        # INCR should NOT be called for unlimited
-        mock_redis.incr.assert_not_called()
+        # Script should NOT be called for unlimited
+        mock_redis.evalsha.assert_not_called()
 
 
 class TestMonthlyQuotaEnforcement:
@@ -328,3 +356,219 @@ class TestGraceOverageEnforcement:
 
         # None = within grace
         assert result is None
+
+
+class TestCheckAll:
+    """Test fused RPM + monthly quota + hard cap check (single pipeline)."""
+
+    @staticmethod
+    def _pipeline(mock_redis, results):
+        pipe = Mock()
+        pipe.execute = Mock(return_value=results)
+        mock_redis.pipeline = Mock(return_value=pipe)
+        return pipe
+
+    def test_check_all_allows_in_one_round_trip(self, mock_ssot_with_tiers, mock_redis):
+        """Allowed request should issue one pipeline execute and nothing else."""
+        engine = EnforcementEngine(mock_ssot_with_tiers, mock_redis)
+        tier = mock_ssot_with_tiers.tiers[0]
+        pipe = self._pipeline(mock_redis, [[1, 10], "1500"])
+
+        result = engine.check_all(
+            "ws_123", tier, dc_amount=100, occurred_at=datetime.now(timezone.utc)
+        )
+
+        assert result is None
+        mock_redis.pipeline.assert_called_once_with(transaction=False)
+        pipe.evalsha.assert_called_once()
+        pipe.get.assert_called_once()
+        pipe.execute.assert_called_once()
+        mock_redis.get.assert_not_called()
+        mock_redis.hincrby.assert_not_called()
+
+    def test_check_all_rpm_violation_first(self, mock_ssot_with_tiers, mock_redis):
+        """RPM violation is reported before quota checks (rollback done in script)."""
+        engine = EnforcementEngine(mock_ssot_with_tiers, mock_redis)
+        tier = mock_ssot_with_tiers.tiers[0]
+        self._pipeline(mock_redis, [[0, 600], "5000"])
+
+        result = engine.check_all(
+            "ws_123", tier, dc_amount=100, occurred_at=datetime.now(timezone.utc)
+        )
+
+        assert result is not None
+        assert result.violated_policies[0].policy == "rpm"
+        mock_redis.hincrby.assert_not_called()
+
+    def test_check_all_quota_violation_rolls_back_rpm(self, mock_ssot_with_tiers, mock_redis):
+        """Quota violation after RPM INCR should roll back the window field."""
+        engine = EnforcementEngine(mock_ssot_with_tiers, mock_redis)
+        tier = mock_ssot_with_tiers.tiers[0]
+        self._pipeline(mock_redis, [[1, 10], "1950"])
+
+        result = engine.check_all(
+            "ws_123", tier, dc_amount=100, occurred_at=datetime.now(timezone.utc)
+        )
+
+        assert result is not None
+        assert result.violated_policies[0].policy == "monthly_dc"
+        mock_redis.hincrby.assert_called_once()
+        key, field, amount = mock_redis.hincrby.call_args.args
+        assert key == "rpm:ws_123"
+        assert amount == -1
+
+    def test_check_all_rpm_only_with_unlimited_quotas(self, mock_ssot_with_tiers, mock_redis):
+        """RPM enforced, monthly and overage unlimited: no usage GET is read."""
+        engine = EnforcementEngine(mock_ssot_with_tiers, mock_redis)
+        tier = mock_ssot_with_tiers.tiers[0]
+        tier.limits["monthly_quota_dc"] = 0
+        tier.limits["hard_overage_dc_cap"] = 0
+        pipe = self._pipeline(mock_redis, [[1, 10]])
+
+        result = engine.check_all(
+            "ws_123", tier, dc_amount=100, occurred_at=datetime.now(timezone.utc)
+        )
+
+        assert result is None
+        pipe.evalsha.assert_called_once()
+        pipe.get.assert_not_called()
+        mock_redis.hincrby.assert_not_called()
+
+
+class TestTierRuntimeCache:
+    """Test per-tier derived values are resolved once per engine."""
+
+    def test_tier_runtime_resolved_once(self, mock_ssot_with_tiers, mock_redis):
+        """Repeated checks should not re-evaluate zero-unlimited semantics."""
+        engine = EnforcementEngine(mock_ssot_with_tiers, mock_redis)
+        tier = mock_ssot_with_tiers.tiers[0]
+        calls = []
+        original = mock_ssot_with_tiers.is_zero_unlimited
+
+        def counting(a, b):
+            calls.append((a, b))
+            return original(a, b)
+
+        object.__setattr__(mock_ssot_with_tiers, "is_zero_unlimited", counting)
+
+        for _ in range(3):
+            engine.check_rpm_limit("ws_123", tier)
+            engine.check_monthly_dc_quota(
+                "ws_123", tier, dc_amount=1, occurred_at=datetime.now(timezone.utc)
+            )
+
+        # rpm + monthly + hard cap flags, once
+        assert len(calls) == 3
+
+        engine.clear_tier_cache()
+        engine.check_rpm_limit("ws_123", tier)
+        assert len(calls) == 6
+
+    def test_grace_precomputed_into_effective_cap(self, mock_ssot_with_tiers, mock_redis):
+        """Hard cap checks use the cached effective cap, not per-request grace math."""
+        engine = EnforcementEngine(mock_ssot_with_tiers, mock_redis)
+        tier = mock_ssot_with_tiers.tiers[0]
+
+        rt = engine._get_rt(tier)
+        assert (rt.total_cap, rt.grace_dc, rt.effective_cap) == (3000, 10, 3010)
+
+        engine._calculate_grace_overage = Mock(side_effect=AssertionError("recomputed"))
+        mock_redis.get.return_value = "3000"
+
+        for dc_amount, allowed in ((10, True), (11, False)):
+            result = engine.check_hard_overage_cap(
+                "ws_123", tier, dc_amount=dc_amount, occurred_at=datetime.now(timezone.utc)
+            )
+            assert (result is None) is allowed
+
+
+@pytest.fixture
+def mock_async_redis():
+    """Mock redis.asyncio client for testing."""
+    redis_mock = Mock()
+    redis_mock.script_load = AsyncMock(return_value="rpm_sha")
+    redis_mock.evalsha = AsyncMock(return_value=[1, 1])
+    redis_mock.get = AsyncMock(return_value="0")
+    redis_mock.hincrby = AsyncMock(return_value=0)
+    return redis_mock
+
+
+class TestAsyncEnforcement:
+    """Test AsyncEnforcementEngine (redis.asyncio)."""
+
+    async def test_script_loaded_lazily_once(self, mock_ssot_with_tiers, mock_async_redis):
+        """RPM.lua is loaded on first check, not in the constructor."""
+        engine = AsyncEnforcementEngine(mock_ssot_with_tiers, mock_async_redis)
+        tier = mock_ssot_with_tiers.tiers[0]
+
+        mock_async_redis.script_load.assert_not_called()
+
+        assert await engine.check_rpm_limit("ws_123", tier) is None
+        assert await engine.check_rpm_limit("ws_123", tier) is None
+
+        mock_async_redis.script_load.assert_awaited_once()
+        assert mock_async_redis.evalsha.await_count == 2
+
+    async def test_rpm_violation(self, mock_ssot_with_tiers, mock_async_redis):
+        """Rejected EVALSHA result yields an rpm Problem Details."""
+        engine = AsyncEnforcementEngine(mock_ssot_with_tiers, mock_async_redis)
+        tier = mock_ssot_with_tiers.tiers[0]
+        mock_async_redis.evalsha.return_value = [0, 600]
+
+        result = await engine.check_rpm_limit("ws_123", tier)
+
+        assert result is not None
+        assert result.violated_policies[0].policy == "rpm"
+
+    async def test_monthly_quota_exceeded(self, mock_ssot_with_tiers, mock_async_redis):
+        """Usage read via awaited GET is checked against the monthly quota."""
+        engine = AsyncEnforcementEngine(mock_ssot_with_tiers, mock_async_redis)
+        tier = mock_ssot_with_tiers.tiers[0]
+        mock_async_redis.get.return_value = "1950"
+
+        result = await engine.check_monthly_dc_quota(
+            "ws_123", tier, dc_amount=100, occurred_at=datetime.now(timezone.utc)
+        )
+
+        assert result is not None
+        assert result.violated_policies[0].policy == "monthly_dc"
+
+    async def test_check_all_quota_violation_rolls_back_rpm(
+        self, mock_ssot_with_tiers, mock_async_redis
+    ):
+        """Fused check awaits one pipeline and rolls back RPM on quota rejection."""
+        engine = AsyncEnforcementEngine(mock_ssot_with_tiers, mock_async_redis)
+        tier = mock_ssot_with_tiers.tiers[0]
+        pipe = Mock()
+        pipe.execute = AsyncMock(return_value=[[1, 10], "1950"])
+        mock_async_redis.pipeline = Mock(return_value=pipe)
+
+        result = await engine.check_all(
+            "ws_123", tier, dc_amount=100, occurred_at=datetime.now(timezone.utc)
+        )
+
+        assert result is not None
+        assert result.violated_policies[0].policy == "monthly_dc"
+        pipe.execute.assert_awaited_once()
+        mock_async_redis.hincrby.assert_awaited_once()
+
+    async def test_check_all_rpm_only_with_unlimited_quotas(
+        self, mock_ssot_with_tiers, mock_async_redis
+    ):
+        """RPM enforced, monthly and overage unlimited: no usage GET is read."""
+        engine = AsyncEnforcementEngine(mock_ssot_with_tiers, mock_async_redis)
+        tier = mock_ssot_with_tiers.tiers[0]
+        tier.limits["monthly_quota_dc"] = 0
+        tier.limits["hard_overage_dc_cap"] = 0
+        pipe = Mock()
+        pipe.execute = AsyncMock(return_value=[[1, 10]])
+        mock_async_redis.pipeline = Mock(return_value=pipe)
+
+        result = await engine.check_all(
+            "ws_123", tier, dc_amount=100, occurred_at=datetime.now(timezone.utc)
+        )
+
+        assert result is None
+        pipe.evalsha.assert_called_once()
+        pipe.get.assert_not_called()
+        mock_async_redis.hincrby.assert_not_awaited()
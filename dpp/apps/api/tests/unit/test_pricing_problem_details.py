@@ -8,10 +8,10 @@ Tests:
 """
 
 import pytest
-from fastapi import status
-from fastapi.responses import JSONResponse
+from fastapi import Response, status
 
 from dpp_api.pricing.problem_details import (
+    PROBLEM_DETAILS_EXAMPLE,
     ProblemDetails,
     ViolatedPolicy,
     create_problem_details_response
@@ -63,6 +63,13 @@ class TestProblemDetailsStructure:
         assert json_dict["title"] == "Quota exceeded"
         assert json_dict["status"] == 429
 
+    def test_openapi_example_matches_model(self):
+        """Module-level OpenAPI example must round-trip through the model."""
+        problem = ProblemDetails.model_validate(PROBLEM_DETAILS_EXAMPLE)
+
+        assert problem.model_dump(by_alias=True, exclude_none=True) == PROBLEM_DETAILS_EXAMPLE
+        assert "example" not in ProblemDetails.model_json_schema()
+
 
 class TestViolatedPoliciesExtension:
     """Test violated-policies extension for quota enforcement."""
@@ -137,7 +144,7 @@ class Test429QuotaExceeded:
             violated_policies=violated_policies
         )
 
-        assert isinstance(response, JSONResponse)
+        assert isinstance(response, Response)
         assert response.status_code == 429
         assert response.headers["content-type"] == "application/problem+json"
 
@@ -235,3 +242,35 @@ class Test429QuotaExceeded:
         # Must use "violated-policies" not "violated_policies"
         assert "violated-policies" in body
         assert "violated_policies" not in body
+
+
+class TestResponseBodyParity:
+    """Response body must match the ProblemDetails model serialization."""
+
+    def test_body_matches_model_dump(self):
+        """Directly-built body equals model_dump(by_alias, exclude_none)."""
+        import json
+
+        violated_policies = [
+            ViolatedPolicy(policy="rpm", limit=600, current=601, window_seconds=60),
+            ViolatedPolicy(policy="monthly_dc", limit=2000, current=2050),
+        ]
+        kwargs = dict(
+            type="https://iana.org/assignments/http-problem-types#quota-exceeded",
+            title="Quota exceeded",
+            status=429,
+            detail="Limit exceeded",
+        )
+
+        response = create_problem_details_response(
+            type_uri=kwargs["type"],
+            title=kwargs["title"],
+            status=kwargs["status"],
+            detail=kwargs["detail"],
+            violated_policies=violated_policies,
+        )
+        expected = ProblemDetails(
+            **kwargs, violated_policies=violated_policies
+        ).model_dump(by_alias=True, exclude_none=True)
+
+        assert json.loads(response.body.decode()) == expected
@@ -0,0 +1,68 @@
+"""
+Unit tests for Pricing RateLimit Headers (MTS-2).
+
+Tests:
+1. RPM headers read the current window count in a single Redis call
+2. Fresh window (no field yet) reports the full quota
+3. Unlimited tiers emit no headers
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from dpp_api.pricing.ratelimit_headers import RateLimitHeadersGenerator
+from dpp_api.pricing.ssot_loader import load_pricing_ssot
+
+
+@pytest.fixture
+def ssot():
+    """Pricing SSoT from the fixture file."""
+    return load_pricing_ssot()
+
+
+@pytest.fixture
+def mock_redis():
+    """Mock Redis client for testing."""
+    redis_mock = Mock()
+    redis_mock.hget = Mock(return_value=None)
+    return redis_mock
+
+
+class TestRPMHeaders:
+    """Test RPM RateLimit headers."""
+
+    def test_rpm_headers_single_round_trip(self, ssot, mock_redis):
+        """Count comes from one HGET; reset time is computed, not read via TTL."""
+        generator = RateLimitHeadersGenerator(mock_redis, ssot)
+        tier = ssot.get_tier("STARTER")
+        mock_redis.hget.return_value = "100"
+
+        with patch("dpp_api.pricing.ratelimit_headers.time.time", return_value=6017.5):
+            headers = generator.generate_rpm_headers("ws_123", tier, include_retry_after=True)
+
+        mock_redis.hget.assert_called_once_with("rpm:ws_123", 100)
+        mock_redis.get.assert_not_called()
+        mock_redis.ttl.assert_not_called()
+        assert headers["RateLimit-Policy"] == '"rpm";q=600;w=60'
+        assert headers["RateLimit"] == '"rpm";r=500;t=43'
+        assert headers["Retry-After"] == "43"
+
+    def test_rpm_headers_fresh_window_full_quota(self, ssot, mock_redis):
+        """Missing window field (first request after rollover) means nothing used."""
+        generator = RateLimitHeadersGenerator(mock_redis, ssot)
+        tier = ssot.get_tier("STARTER")
+
+        with patch("dpp_api.pricing.ratelimit_headers.time.time", return_value=6000.0):
+            headers = generator.generate_rpm_headers("ws_123", tier)
+
+        assert headers["RateLimit"] == '"rpm";r=600;t=60'
+        assert "Retry-After" not in headers
+
+    def test_rpm_headers_unlimited_tier(self, ssot, mock_redis):
+        """RPM = 0 (unlimited) should emit no headers and skip Redis."""
+        generator = RateLimitHeadersGenerator(mock_redis, ssot)
+        tier = ssot.get_tier("ENTERPRISE")
+
+        assert generator.generate_rpm_headers("ws_123", tier) == {}
+        mock_redis.hget.assert_not_called()